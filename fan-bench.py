@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Fan politikalarını çevrimdışı termal modelde karşılaştırır (lib/thermsim.py).
+#
+#   python3 fan-bench.py                       (sentetik izler: idle, sustained, bursts, random)
+#   python3 fan-bench.py --trace samples.csv   (PI5_SAMPLE_LOG kaydından gerçek yük)
+#   python3 fan-bench.py --ambient 35 --mass 40 --curve fan.json
+
+import argparse, json
+
+from lib.thermsim import TRACES, Managed, benchmark, default_controllers, trace_from_log
+
+def main():
+    ap = argparse.ArgumentParser(description="Fan controller benchmark on a simulated thermal plant")
+    ap.add_argument("--trace", action="append", help="samplelog CSV/JSON-lines (tekrarlanabilir)")
+    ap.add_argument("--ambient", type=float, default=25.0)
+    ap.add_argument("--mass", type=float, default=15.0, help="ısıl kütle (J/K)")
+    ap.add_argument("--noise", type=float, default=0.0, help="sensör gürültüsü σ (°C)")
+    ap.add_argument("--curve", action="append", help="ek fan yapılandırması (PI5_FAN_CONF JSON)")
+    ap.add_argument("--json", action="store_true", help="tablo yerine JSON")
+    a = ap.parse_args()
+
+    traces = {p: trace_from_log(p) for p in a.trace} if a.trace else {k: f() for k, f in TRACES.items()}
+    traces = {k: v for k, v in traces.items() if len(v) > 1}
+
+    def controllers():
+        cs = default_controllers()
+        for path in a.curve or ():
+            with open(path) as f: cs.append(Managed(json.load(f), name=path))
+        return cs
+
+    res = benchmark(controllers, traces, plant_kw={"ambient": a.ambient, "mass": a.mass}, noise=a.noise)
+    if a.json:
+        print(json.dumps(res, indent=1)); return
+    for tname, rows in res.items():
+        print(f"\n== {tname}")
+        print(f"{'controller':<22}{'peak°C':>8}{'>thr s':>8}{'duty%':>8}{'writes':>8}")
+        for r in rows:
+            print(f"{r['controller']:<22}{r['peak']:>8.1f}{r['above']:>8.0f}{r['duty_avg']:>8.1f}{r['writes']:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,207 @@
 #!/usr/bin/env python3
-import time
-import glob
-
-# Fan kontrol dosyasını bul
-hwmon_path = glob.glob("/sys/devices/platform/cooling_fan/hwmon/hwmon*/pwm1")[0]
-
-def set_fan_speed(value: int):
-    """0-255 arası hız değeri yazar (0=kapalı, 128=yarı hız, 255=full hız)"""
-    with open(hwmon_path, "w") as f:
-        f.write(str(value))
-
-def get_temp() -> float:
-    """CPU sıcaklığını °C cinsinden döndürür"""
-    with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
-        return int(f.read()) / 1000.0
-
-while True:
-    temp = get_temp()
-
-    if temp < 33:
-        set_fan_speed(0)      # 40°C altı: kapalı
-    elif temp < 36:
-        set_fan_speed(128)    # 40–60°C arası: yarı hız
-    else:
-        set_fan_speed(255)    # 60°C üstü: tam hız
-
-    print(f"Sıcaklık: {temp:.1f}°C")
-    time.sleep(5)  # Her 5 saniyede bir tekrar kontrol et
+# -*- coding: utf-8 -*-
+# Fan kontrol servisi: eğri ya da PID (lib/fanctl.py), eğim sınırı, minimum dönme,
+# yalnızca değer değiştiğinde sysfs yazımı (fd açık tutulur).
+# Fan bulunamazsa çökmek yerine uyarır ve periyodik olarak yeniden arar.
+# Fanın tek sahibidir: pano AUTO/ON/OFF/± komutlarını Unix soketinden gönderir (lib/fanipc.py).
+#
+# Takometre varsa başlangıçta PWM→RPM eğrisini öğrenir (PI5_FAN_LEARN=0 ile atlanır). Süpürme
+# soket açıldıktan sonra kontrol döngüsünde adım adım yürür; sıcaklık PI5_FAN_LEARN_ABORT'u
+# (varsayılan 70°C) aşarsa iptal edilir ve normal kontrole dönülür. Sonra
+# yüksek PWM'de düşük devir "stall" uyarısı verir ve fanı güvenli orana (FAILSAFE) çeker.
+#
+#   python3 fan-control.py            (PI5_FAN_CONF=/etc/pi5-sysmon/fan.json ile ayar,
+#                                      PI5_FAN_SOCK soket yolu)
+
+import os, time, signal, threading, logging
+
+from lib.shmbus import BusReader
+from lib.fanio import FanIO
+from lib.fanctl import FanController, Predictive, RpmSweep, StallDetector
+from lib.fanipc import FanServer, FanOwnerBusy
+from lib.alerts import AlertEngine, unix_webhook
+
+logging.basicConfig(level=logging.INFO)
+
+INTERVAL = float(os.getenv("PI5_FAN_INTERVAL", "1.0"))
+REDISCOVER_S = 30.0
+HIST_TICK = 0.5          # Metrics geçmiş adımı (AdaptiveSchedule base)
+FAILSAFE = float(os.getenv("PI5_FAN_FAILSAFE", "100"))
+LEARN_ABORT = float(os.getenv("PI5_FAN_LEARN_ABORT", "70"))
+
+class TempSource:
+    """sysmon-bus varsa oradan, yoksa thermal_zone0 (fd açık, pread)."""
+    def __init__(self):
+        self.bus = None
+        self.fd = None
+
+    def read(self):
+        if self.bus is None:
+            self.bus = BusReader.attach()
+        if self.bus is not None and self.bus.age() < 10.0 and self.bus.snap.temp:
+            return self.bus.snap.temp
+        try:
+            if self.fd is None:
+                self.fd = os.open("/sys/class/thermal/thermal_zone0/temp", os.O_RDONLY)
+            return int(os.pread(self.fd, 32, 0)) / 1000.0
+        except Exception:
+            return None
+
+    def history(self):
+        """(htmp, hcpu) örnekleyici geçmişi; bus yoksa/bayatsa None."""
+        if self.bus is None or self.bus.age() >= 10.0: return None
+        snap = self.bus.snap
+        return snap.htmp, snap.hcpu
+
+class Owner:
+    """Mod + manuel oran; kontrol adımı ve soket istekleri aynı thread'den gelir."""
+    def __init__(self, fan, ctl, alerts=None):
+        self.fan, self.ctl = fan, ctl
+        self.alerts = alerts
+        self.stall = None          # StallDetector (takometre varsa)
+        self.sweep = None          # süren RpmSweep
+        self.fault = "ok"
+        self.rpm = 0
+        self.mode = "auto"
+        self.manual = 0.0
+        self.last_on = 60.0        # toggle ile açılınca dönülecek oran
+        self.temp = None
+        self.ver = 0
+        self._state = None         # son durum (ver hariç); ver yalnızca değişince artar
+
+    def handle(self, req):
+        op = req.get("op")
+        if op == "mode" and req.get("mode") in ("auto", "manual"):
+            if req["mode"] == "auto" and self.mode != "auto":
+                self.ctl.policy.reset()
+            if req["mode"] == "manual" and self.mode != "manual":
+                self.manual = self.ctl.out
+            self.mode = req["mode"]
+        elif op == "duty":
+            self.mode = "manual"
+            self.manual = max(0.0, min(100.0, float(req["pct"])))
+        elif op == "toggle":
+            if self.mode == "auto": self.manual = self.ctl.out
+            self.mode = "manual"
+            if self.manual > 0:
+                self.last_on = self.manual; self.manual = 0.0
+            else:
+                self.manual = max(self.last_on, 30.0)
+        else:
+            return
+        logging.info("fan-control: istek %s → mode=%s manual=%.0f", op, self.mode, self.manual)
+        self.apply(time.monotonic())
+
+    def learn(self):
+        """Takometre varsa PWM→RPM eğrisini öğrenmeye başla (apply içinde adım adım);
+        kapalı döngü ve durma tespiti bunu kullanır."""
+        if not self.fan.fan_input:
+            return
+        if os.getenv("PI5_FAN_LEARN", "1") == "0":
+            self._learned(None)
+            return
+        logging.info("fan-control: PWM→RPM eğrisi öğreniliyor...")
+        self.sweep = RpmSweep(self.fan, abort_temp=LEARN_ABORT)
+
+    def _learned(self, m):
+        self.sweep = None
+        self.ctl.rpm_map = m if m is not None and m.ok else None
+        self.stall = StallDetector(self.ctl.rpm_map)
+        self.ctl.out = self.fan.percent    # eğim sınırı süpürmenin bıraktığı orandan başlasın
+
+    def _check_tach(self, now):
+        if self.stall is None: return
+        self.rpm = self.fan.read_rpm()
+        st = self.stall.update(self.fan.percent, self.rpm, now)
+        if st == self.fault: return
+        logging.warning("fan-control: fan durumu %s → %s (%%%.0f, %d RPM)", self.fault, st, self.fan.percent, self.rpm)
+        self.fault = st
+        if self.alerts is not None:
+            self.alerts.external("fan_stall", st == "stall", f"FAN STALL {self.rpm} RPM")
+            self.alerts.external("fan_degraded", st == "degraded", f"FAN WEAK {self.rpm} RPM")
+
+    def apply(self, now):
+        if not self.fan.available: return
+        if self.sweep is not None:
+            if not self.sweep.step(self.temp, now):
+                return                      # süpürme sürüyor: fan onun elinde
+            if self.sweep.aborted:
+                logging.warning("fan-control: eğri öğrenme iptal (%s°C ≥ %.0f ya da okunamadı)", self.temp, LEARN_ABORT)
+            else:
+                logging.info("fan-control: eğri %s", [(int(d), int(r)) for d, r in self.sweep.map.points])
+            self._learned(self.sweep.map)
+        self._check_tach(now)
+        if self.fault == "stall":
+            # güvenli mod: fan gerçekten durduysa bile en yüksek şansı ver
+            self.ctl.out = self.ctl.target = FAILSAFE
+            self.fan.set_percent(FAILSAFE)
+        elif self.mode == "auto":
+            if self.temp is not None: self.ctl.step(self.temp, now, self.rpm if self.stall else None)
+        else:
+            self.ctl.out = self.manual; self.ctl.target = self.manual
+            self.fan.set_percent(self.manual)
+
+    def state(self):
+        rt = self.ctl.rpm_target
+        st = {"mode": self.mode, "duty": round(self.fan.percent, 1), "target": round(self.ctl.target, 1),
+              "manual": self.manual, "temp": self.temp, "rpm": self.rpm,
+              "rpm_target": None if rt is None else round(rt), "fault": self.fault,
+              "writes": self.fan.writes, "learning": self.sweep is not None}
+        if st != self._state:
+            self._state = st
+            self.ver += 1
+        return dict(st, ver=self.ver)
+
+def main():
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    temps = TempSource()
+    fan = FanIO()
+    ctl = FanController.from_env(fan)
+    # yalnızca takometre uyarıları (sıcaklık kurallarını pano / sysmon-bus değerlendirir)
+    owner = Owner(fan, ctl, AlertEngine(rules=[], actions={"webhook": unix_webhook()}))
+    try:
+        server = FanServer(owner.handle, owner.state)
+    except FanOwnerBusy as e:
+        logging.error("fan-control: %s", e)    # iki sahip pwm1'e yazmasın
+        return 1
+    except OSError as e:
+        logging.warning("fan-control: soket açılamadı (%s), yalnızca otomatik kontrol", e)
+        server = None
+    if fan.available: owner.learn()        # soket açıkken: pano yerel kontrole düşmez
+    last_disc = time.monotonic()
+    last_out = None
+    if not fan.available:
+        logging.warning("fan-control: pwm1/cooling_device bulunamadı, %ds'de bir yeniden aranacak", REDISCOVER_S)
+
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            if not fan.available and now - last_disc >= REDISCOVER_S:
+                fan = FanIO(); ctl.fan = owner.fan = fan; last_disc = now
+                if fan.available:
+                    logging.info("fan-control: fan bulundu (%s)", fan.pwm_path or fan.cool_cur)
+                    owner.learn()
+            owner.temp = temps.read()
+            if isinstance(ctl.policy, Predictive):
+                h = temps.history()
+                if h is not None: ctl.policy.feed(*h, tick=HIST_TICK)
+            owner.apply(now)
+            if fan.available and ctl.out != last_out:
+                logging.info("fan-control: %s°C → %%%.0f (hedef %%%.0f, yazım %d)",
+                             owner.temp, ctl.out, ctl.target, fan.writes)
+                last_out = ctl.out
+            if server is not None:
+                deadline = now + INTERVAL
+                while not stop.is_set() and time.monotonic() < deadline:
+                    server.poll(max(0.0, deadline - time.monotonic()))
+            else:
+                stop.wait(INTERVAL)
+    finally:
+        if server is not None: server.close()
+        fan.close()
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,14 @@ import time
 from lib import config
 from lib.Touch_1inch69 import Touch_1inch69
 
+def rgb565(Image):
+    """PIL RGB → (h, w, 2) uint8 RGB565 dizisi (ShowImage ile aynı dönüşüm)."""
+    img = config.np.asarray(Image)
+    pix = config.np.empty(img.shape[:2] + (2,), dtype = config.np.uint8)
+    pix[...,0] = (img[...,0] & 0xF8) | (img[...,1] >> 5)
+    pix[...,1] = ((img[...,1] << 3) & 0xE0) | (img[...,2] >> 3)
+    return pix
+
 class LCD_1inch69(config.RaspberryPi):
     width = 240
     height = 280 
@@ -220,6 +228,31 @@ class LCD_1inch69(config.RaspberryPi):
             self.spi_writebyte(pix[i: i+4096])
         
 
+    def ShowImage_Rect(self, Image, box):
+        """Dikey tam kareden yalnızca box=(x0, y0, x1, y1) penceresini gönder (x1/y1 hariç).
+        ShowImage ile yön (0x36) bir kez ayarlanmış olmalı."""
+        self.ShowRGB565(rgb565(Image.crop(box)), box)
+
+    def rgb565(self, Image):
+        return rgb565(Image)
+
+    def ShowRGB565(self, pix, box=None):
+        """Hazır (height, width, 2) RGB565 dikey tam kare (geçiş kareleri, çizim süreci; dönüşüm yok).
+        box=(x0, y0, x1, y1) verilirse yalnızca o pencere gönderilir; pix tam kare ya da yalnızca pencere."""
+        if self.SPI is None:
+            return
+        x0, y0, x1, y1 = box or (0, 0, self.width, self.height)
+        if pix.shape[:2] != (y1 - y0, x1 - x0):
+            pix = pix[y0:y1, x0:x1]
+        self.SetWindows(x0, y0, x1, y1)
+        self.digital_write(self.GPIO_DC_PIN,True)
+        buf = self.np.ascontiguousarray(pix).tobytes()
+        if hasattr(self.SPI, "writebytes2"):
+            self.SPI.writebytes2(buf)       # tampon kabul eder, 4096 sınırı yok
+        else:
+            for i in range(0, len(buf), 4096):
+                self.spi_writebyte(list(buf[i: i+4096]))
+
     def clear(self):
         """Clear contents of image buffer"""
         _buffer = [0xff] * (self.width*self.height*2)
@@ -0,0 +1,95 @@
+# lib/adaptive.py
+# Uyarlanır örnekleme: değer sabitse aralık üstel büyür (base → max),
+# tolerans aşılınca hemen base'e döner; sayfası ekranda değilse ayrıca yavaşlar.
+# Geçmiş (history) yine nominal çözünürlükte doldurulur: atlanan tick'ler
+# son değerle (sample-and-hold) tamamlanır.
+
+import time
+
+class Source:
+    """
+    Tek örnekleme kaynağı.
+      tol    : izlenen her sinyal için mutlak tolerans (tuple)
+      pages  : kaynağın gösterildiği sayfalar (None → her zaman "görünür",
+               ör. fan kontrolünün de kullandığı sıcaklık)
+      hidden : görünmezken aralık çarpanı
+    """
+    __slots__ = ("name", "base", "max", "tol", "pages", "hidden",
+                 "interval", "next_due", "last", "samples")
+
+    def __init__(self, name, base=0.5, max_interval=4.0, tol=(1.0,), pages=None, hidden=4.0):
+        self.name = name
+        self.base = base; self.max = max_interval
+        self.tol = tol; self.pages = pages; self.hidden = hidden
+        self.interval = base
+        self.next_due = 0.0
+        self.last = None
+        self.samples = 0
+
+    def visible(self, page):
+        return self.pages is None or page in self.pages
+
+    def due(self, now):
+        return now >= self.next_due
+
+    def done(self, values, now, page=None):
+        """Örnek alındı; sıradaki zamanı hesapla."""
+        self.samples += 1
+        moved = self.last is None or any(abs(v - l) > t for v, l, t in zip(values, self.last, self.tol))
+        if moved:
+            self.interval = self.base          # hareket → hızlı örneklemeye dön
+            self.last = tuple(values)          # referans yalnızca harekette kayar (yavaş sürüklenme de yakalanır)
+        else:
+            self.interval = min(self.max, self.interval * 2.0)
+        eff = self.interval if self.visible(page) else self.interval * self.hidden
+        self.next_due = now + eff
+
+    def kick(self):
+        """Dışarıdan zorla (ör. sayfa açıldı) → bir sonraki turda örnekle."""
+        self.interval = self.base
+        self.next_due = 0.0
+
+class AdaptiveSchedule:
+    def __init__(self, base=0.5):
+        self.base = base
+        self.sources = {}
+        self.wakeups = 0
+        self._hist_t = None
+
+    def add(self, name, **kw):
+        kw.setdefault("base", self.base)
+        self.sources[name] = Source(name, **kw)
+        return self.sources[name]
+
+    def due(self, name, now):
+        return self.sources[name].due(now)
+
+    def done(self, name, values, now, page=None):
+        self.sources[name].done(values, now, page)
+
+    def kick(self, pages=None):
+        for s in self.sources.values():
+            if pages is None or s.pages is None or (set(pages) & set(s.pages)):
+                s.kick()
+
+    def next_wake(self, now):
+        """Bir sonraki uyanmaya kalan süre (sn)."""
+        if not self.sources: return self.base
+        return max(0.0, min(s.next_due for s in self.sources.values()) - now)
+
+    def history_ticks(self, now):
+        """Son çağrıdan beri geçen nominal tick sayısı (geçmişe kaç kez eklenecek)."""
+        self.wakeups += 1
+        if self._hist_t is None:
+            self._hist_t = now
+            return 1
+        n = int((now - self._hist_t) / self.base + 1e-6)
+        self._hist_t += n * self.base
+        return n
+
+def sleep_until_due(sched, stop=None, cap=None):
+    """next_wake kadar uyu; stop (threading.Event) set edilirse erken uyan."""
+    t = sched.next_wake(time.monotonic())
+    if cap is not None: t = min(t, cap)
+    if stop is not None: stop.wait(t)
+    else: time.sleep(t)
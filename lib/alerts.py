@@ -0,0 +1,230 @@
+# lib/alerts.py
+# Artımlı uyarı kuralları: her yeni snapshot'ta bir kez değerlendirilir.
+# Kural türleri: eşik, değişim hızı (birim/sn), "N saniye sürdü" ve histerezis.
+# Her kural bir kez derlenip küçük bir değerlendiriciye dönüşür; durum geçişinde
+# (tetiklendi / temizlendi) ucuz tepkiler çalışır: arka ışık flaşı, banner,
+# RGB LED rengi, yerel Unix soketine JSON bildirim.
+#
+# Kural örneği:
+#   {"name": "temp_high", "field": "temp", "op": ">=", "value": 75, "clear": 70,
+#    "for": 3, "actions": ["banner", "backlight", "rgb:255,0,0"]}
+#   {"name": "temp_rise", "field": "temp", "kind": "rate", "op": ">", "value": 0.5, "for": 5}
+# PI5_ALERT_RULES=/etc/pi5-sysmon/alerts.json ile değiştirilebilir.
+
+import os, json, time, socket, threading, logging, operator
+
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+       "==": operator.eq, "!=": operator.ne}
+
+DEFAULT_RULES = [
+    {"name": "temp_high", "field": "temp", "op": ">=", "value": 75, "clear": 70, "for": 3,
+     "text": "HOT {value:.1f}°C", "actions": ["banner", "backlight", "rgb:255,0,0", "webhook"]},
+    {"name": "temp_rise", "field": "temp", "kind": "rate", "op": ">", "value": 0.5, "for": 5,
+     "text": "TEMP RISING {value:+.1f}°C/s", "actions": ["banner"]},
+    {"name": "throttled", "field": "throttle_flags", "kind": "any",
+     "text": "THROTTLED", "actions": ["banner", "webhook"]},
+    {"name": "cpu_busy", "field": "cpu", "op": ">=", "value": 95, "clear": 80, "for": 30,
+     "text": "CPU {value:.0f}% 30s", "actions": ["banner"]},
+]
+
+class Rule:
+    """Derlenmiş kural. step(snap, now) → +1 tetiklendi, -1 temizlendi, 0 değişiklik yok."""
+    __slots__ = ("name", "text", "actions", "_value", "_on", "_off", "for_s", "clear_for",
+                 "active", "since", "value", "fired_at")
+
+    def __init__(self, spec):
+        self.name = spec["name"]
+        self.text = spec.get("text", self.name.upper())
+        self.actions = tuple(spec.get("actions", ("banner",)))
+        self.for_s = float(spec.get("for", 0))
+        self.clear_for = float(spec.get("clear_for", 0))
+        self.active = False
+        self.since = None
+        self.value = None
+        self.fired_at = 0.0
+        self._value, self._on, self._off = self._compile(spec)
+
+    @staticmethod
+    def _compile(spec):
+        field = spec["field"]
+        kind = spec.get("kind", "threshold")
+        get = operator.attrgetter(field)
+
+        if kind == "any":        # dizi/bayrak alanı: boş değilse aktif
+            value = lambda snap, now: len(get(snap) or ())
+            return value, (lambda v: v > 0), (lambda v: v == 0)
+
+        op = OPS[spec.get("op", ">=")]
+        thr = float(spec["value"])
+        clear = spec.get("clear")
+        on = lambda v: op(v, thr)
+        if clear is None:
+            off = lambda v: not op(v, thr)
+        elif op in (operator.gt, operator.ge):
+            c = float(clear); off = lambda v: v < c      # histerezis: aşağıda temizle
+        else:
+            c = float(clear); off = lambda v: v > c
+
+        if kind == "rate":       # birim/sn; önceki (değer, zaman) ile artımlı
+            prev = [None, None]
+            def value(snap, now):
+                v = get(snap)
+                if v is None: return None
+                pv, pt = prev
+                prev[0], prev[1] = v, now
+                if pv is None or now <= pt: return None
+                return (v - pv) / (now - pt)
+            return value, on, off
+
+        value = lambda snap, now: get(snap)
+        return value, on, off
+
+    def step(self, snap, now):
+        try:
+            v = self._value(snap, now)
+        except Exception:
+            return 0
+        if v is None:
+            return 0
+        self.value = v
+        want = self._off if self.active else self._on
+        if want(v):
+            if self.since is None: self.since = now
+            if now - self.since >= (self.clear_for if self.active else self.for_s):
+                self.active = not self.active
+                self.since = None
+                if self.active: self.fired_at = now
+                return 1 if self.active else -1
+        else:
+            self.since = None
+        return 0
+
+    def message(self):
+        try: return self.text.format(value=self.value)
+        except Exception: return self.text
+
+class ExternalAlert:
+    """Başka bir bileşenin tespit ettiği koşul (ör. fan durması); AlertEngine.external ile sürülür."""
+    __slots__ = ("name", "text", "actions", "active", "value", "fired_at")
+
+    def __init__(self, name, text, actions):
+        self.name, self.text, self.actions = name, text, tuple(actions)
+        self.active = False
+        self.value = None
+        self.fired_at = 0.0
+
+    def step(self, snap, now):
+        return 0
+
+    def message(self):
+        return self.text
+
+class AlertEngine:
+    """
+    on_snapshot(snap) sampler tarafında çağrılır; version değişmediyse hiçbir şey yapmaz.
+    Çizici yalnızca .banner metnini okur (koşul değerlendirmez).
+    """
+    def __init__(self, rules=None, actions=None):
+        self.rules = [Rule(r) for r in (DEFAULT_RULES if rules is None else rules)]
+        self.actions = dict(actions or {})
+        self.actions.setdefault("banner", self._banner_action)
+        self.banner = None
+        self._last_ver = None
+        self.events = 0
+
+    @classmethod
+    def from_env(cls, actions=None):
+        path = os.getenv("PI5_ALERT_RULES")
+        rules = None
+        if path:
+            try:
+                with open(path) as f: rules = json.load(f)
+            except Exception as e:
+                logging.warning("alert kuralları okunamadı (%s): %s", path, e)
+        return cls(rules, actions)
+
+    def add_action(self, name, fn):
+        self.actions[name] = fn
+
+    def _banner_action(self, rule, fired, snap):
+        self._update_banner()
+
+    def _update_banner(self):
+        act = [r for r in self.rules if r.active]
+        self.banner = max(act, key=lambda r: r.fired_at).message() if act else None
+
+    def on_snapshot(self, snap, now=None):
+        ver = getattr(snap, "version", None)
+        if ver is not None and ver == self._last_ver:
+            return
+        self._last_ver = ver
+        now = time.monotonic() if now is None else now
+        for r in self.rules:
+            ev = r.step(snap, now)
+            if ev: self._fire(r, ev > 0, snap)
+        if any(r.active for r in self.rules) or self.banner:
+            self._update_banner()
+
+    def _fire(self, r, fired, snap):
+        self.events += 1
+        logging.info("alert %s: %s", "FIRED" if fired else "cleared", r.message())
+        for a in r.actions:
+            name, _, arg = a.partition(":")
+            fn = self.actions.get(name)
+            if fn is None: continue
+            try:
+                fn(r, fired, snap, arg) if arg else fn(r, fired, snap)
+            except Exception as e:
+                logging.debug("alert action %s: %s", a, e)
+
+    def external(self, name, active, text=None, actions=("banner", "webhook"), snap=None):
+        """Kural dışı koşulu (ör. takometre ile fan durması) aynı tepki yoluna sok."""
+        r = next((x for x in self.rules if x.name == name), None)
+        if r is None:
+            r = ExternalAlert(name, text or name.upper(), actions)
+            self.rules.append(r)
+        if text: r.text = text
+        if bool(active) == r.active: return
+        r.active = bool(active)
+        if r.active: r.fired_at = time.monotonic()
+        self._fire(r, r.active, snap)
+        self._update_banner()
+
+    def active(self):
+        return [r.name for r in self.rules if r.active]
+
+# ---------- hazır tepkiler ----------
+def backlight_flash(disp, times=3, on=100, off=10, period=0.15, restore=90):
+    """Arka ışığı kısa süre yakıp söndürür (ayrı thread, örnekleyiciyi bekletmez)."""
+    def act(rule, fired, snap):
+        if not fired: return
+        def run():
+            try:
+                for _ in range(times):
+                    disp.bl_DutyCycle(off); time.sleep(period)
+                    disp.bl_DutyCycle(on);  time.sleep(period)
+                disp.bl_DutyCycle(restore)
+            except Exception:
+                pass
+        threading.Thread(target=run, daemon=True).start()
+    return act
+
+def rgb_color(rgb):
+    """rgb:R,G,B → tetiklenince bu renk, temizlenince kapalı."""
+    def act(rule, fired, snap, arg="255,0,0"):
+        if not getattr(rgb, "available", False): return
+        r, g, b = (int(x) for x in arg.split(","))
+        rgb.set_color(r, g, b) if fired else rgb.set_color(0, 0, 0)
+    return act
+
+def unix_webhook(path=None):
+    """Yerel Unix datagram soketine tek satır JSON; dinleyen yoksa sessizce geçer."""
+    path = path or os.getenv("PI5_ALERT_SOCK", "/run/pi5-sysmon/alerts.sock")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    def act(rule, fired, snap):
+        msg = {"alert": rule.name, "state": "fired" if fired else "cleared",
+               "value": rule.value, "text": rule.message(), "ts": time.time()}
+        try: sock.sendto(json.dumps(msg).encode(), path)
+        except OSError: pass
+    return act
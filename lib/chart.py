@@ -0,0 +1,136 @@
+# lib/chart.py
+# Seri çizimi: seri NumPy ile tek seferde ölçeklenir ve tek d.line(polyline) çağrısıyla çizilir
+# (nokta başına Python döngüsü/çizim çağrısı yok; 500 nokta ≈ 10 nokta maliyeti).
+#
+#   sparkline(d, x, y, w, h, snap.hcpu, color)     # min-max ölçekli, kutuya yayılmış
+#
+# ScrollChart (artımlı mod): örnekler sabit adımla (step px) sağa hizalı. Yeni örnek gelince
+# mürekkep maskesi step*k sütun sola kaydırılır, yalnızca en yeni k parça çizilir; ölçek (min/max)
+# değişirse ya da seri beklenen gibi ilerlemediyse tam çizime döner. Artımlı maske tam çizimle
+# piksel piksel aynıdır (ScrollChart.check; PI5_CHART_CHECK=1 her artımlı adımda karşılaştırır,
+# fark varsa uyarı yazıp tam çizimi kullanır). Çizim d.bitmap(origin, ink, fill)
+# ile (maske iskeletteki çerçeveyi kaydırmaz).
+#
+#   ch = ScrollChart((x, y, w, h), step=2)
+#   rev = ch.update(snap.htmp)                      # değişmediyse rev aynı
+#   d.bitmap(ch.origin, ch.ink, fill=color)
+
+import os, logging
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+CHECK = os.getenv("PI5_CHART_CHECK", "0") not in ("", "0")
+
+def _finite(series):
+    v = np.asarray(series, dtype=float)
+    return v[np.isfinite(v)]
+
+def points(series, x, y, w, h):
+    """Min-max ölçekli, kutuya yayılmış (N, 2) int noktalar; 2'den az geçerli örnek → None."""
+    v = _finite(series)
+    n = len(v)
+    if n < 2:
+        return None
+    mn, mx = v.min(), v.max()
+    px = x + (np.arange(n) * (w - 1) / (n - 1)).astype(int)
+    py = y + h - 1 - ((v - mn) / max(1e-6, mx - mn) * (h - 2)).astype(int)
+    return np.column_stack((px, py))
+
+def polyline(d, pts, color, width=3):
+    d.line(pts.ravel().tolist(), fill=color, width=width)
+
+def sparkline(d, x, y, w, h, series, color, width=3):
+    pts = points(series, x, y, w, h)
+    if pts is None:
+        d.line((x, y + h // 2, x + w, y + h // 2), fill=color, width=width)
+    else:
+        polyline(d, pts, color, width)
+
+class ScrollChart:
+    def __init__(self, xywh, step=2, width=3, lo=None, hi=None):
+        x, y, w, h = xywh
+        self.xywh, self.step, self.width = xywh, step, width
+        self.lo, self.hi = lo, hi                  # sabit ölçek (None → görünür min/max)
+        self.pad = width // 2 + 1
+        self.origin = (x - self.pad, y - self.pad)
+        self.cap = (w - 1) // step + 1             # görünür örnek sayısı
+        self.ink = Image.new("L", (w + 2 * self.pad, h + 2 * self.pad), 0)
+        self.prev = self.range = None
+        self.rev = 0
+        self.full = self.incremental = self.mismatch = 0
+
+    def _pts(self, v):
+        x, y, w, h = self.xywh
+        mn, mx = self.range
+        n = len(v)
+        px = x + w - 1 - (n - 1 - np.arange(n)) * self.step
+        py = y + h - 1 - ((v - mn) / max(1e-6, mx - mn) * (h - 2)).astype(int)
+        return np.column_stack((px, py)) - self.origin
+
+    def _advance(self, v):
+        """Önceki seriye göre yeni örnek sayısı (0: aynı); uyuşmazsa None."""
+        p = self.prev
+        if p is None: return None
+        for k in range(min(len(v) - 1, 8)):
+            n = len(v) - k
+            if 2 <= n <= len(p) and np.array_equal(v[:n], p[len(p) - n:]):
+                return k
+        return None
+
+    def update(self, series):
+        """Mürekkep maskesini seriye getir; değiştiyse rev artar."""
+        v = _finite(series)[-self.cap:]
+        if len(v) < 2:
+            if self.prev is None and self.rev: return self.rev
+            x, y, w, h = self.xywh
+            ox, oy = self.origin
+            self.ink.paste(0, (0, 0) + self.ink.size)
+            ImageDraw.Draw(self.ink).line((x - ox, y + h // 2 - oy, x + w - ox, y + h // 2 - oy),
+                                          fill=255, width=self.width)
+            self.prev = self.range = None
+            self.rev += 1
+            return self.rev
+        rng = (v.min() if self.lo is None else self.lo, v.max() if self.hi is None else self.hi)
+        k = self._advance(v) if rng == self.range else None
+        if k == 0:
+            return self.rev
+        self.range = rng
+        pts = self._pts(v)
+        d = ImageDraw.Draw(self.ink)
+        if k is None:
+            self.ink.paste(0, (0, 0) + self.ink.size)
+            polyline(d, pts, 255, self.width)
+            self.full += 1
+        else:
+            # mevcut pikselleri sola kaydır, yalnızca yeni parçaları çiz
+            s = k * self.step
+            W, H = self.ink.size
+            self.ink.paste(self.ink.crop((s, 0, W, H)), (0, 0))
+            self.ink.paste(0, (W - s, 0, W, H))
+            # düşen parçanın kalıntısı ilk noktanın kalınlığı kadar sağına taşar: temizle,
+            # o sütunlara uzanan ilk parçaları yeniden çiz
+            clr = int(pts[0][0]) + self.width // 2 + 1
+            self.ink.paste(0, (0, 0, clr, H))
+            j = int(np.searchsorted(pts[:, 0], clr + self.width)) + 1
+            polyline(d, pts[:max(2, j)], 255, self.width)
+            polyline(d, pts[-(k + 1):], 255, self.width)
+            self.incremental += 1
+            if CHECK:
+                ref = self._reference(v)
+                if ref.tobytes() != self.ink.tobytes():
+                    self.mismatch += 1
+                    logging.warning("ScrollChart: artımlı maske tam çizimden farklı (k=%d)", k)
+                    self.ink.paste(ref)
+        self.prev = v
+        self.rev += 1
+        return self.rev
+
+    def _reference(self, series):
+        ref = ScrollChart(self.xywh, self.step, self.width, self.lo, self.hi)
+        ref.update(series)
+        return ref.ink
+
+    def check(self, series):
+        """Artımlı maske == aynı serinin tam çizimi mi."""
+        return self._reference(series).tobytes() == self.ink.tobytes()
@@ -0,0 +1,208 @@
+# lib/exporter.py
+# Hafif Prometheus/OpenMetrics uç noktası (yalnızca stdlib).
+# - tek thread, selectors ile bloklamayan accept/recv/send: yanıt bağlantının çıkış tamponuna
+#   konur, EVENT_WRITE ile boşaltılır (yavaş istemci diğer scrape'leri bekletmez);
+#   CONN_TIMEOUT sn'de bitmeyen bağlantı kapatılır
+# - /metrics gövdesi snapshot.version başına bir kez üretilir ve önbellekte tutulur;
+#   scrape ek örnekleme tetiklemez, yalnızca son yayınlanan snapshot okunur.
+# Etkinleştirme: PI5_METRICS_PORT=9101 (PI5_METRICS_ADDR, varsayılan 127.0.0.1; ağa açmak için
+# açıkça PI5_METRICS_ADDR=0.0.0.0)
+
+import os, time, socket, selectors, threading, logging
+
+PREFIX = "pi5_"
+CONN_TIMEOUT = 5.0
+
+def _esc(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class _Doc:
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name, help_, samples, typ="gauge"):
+        """samples: [(labels_dict, value), ...] ya da tek değer"""
+        if not isinstance(samples, list):
+            samples = [({}, samples)]
+        samples = [(l, v) for l, v in samples if v is not None]
+        if not samples: return
+        n = PREFIX + name
+        self.lines.append(f"# HELP {n} {help_}")
+        self.lines.append(f"# TYPE {n} {typ}")
+        for labels, v in samples:
+            lab = ",".join(f'{k}="{_esc(x)}"' for k, x in labels.items())
+            self.lines.append(f"{n}{{{lab}}} {float(v):.6g}" if lab else f"{n} {float(v):.6g}")
+
+    def text(self):
+        return "\n".join(self.lines) + "\n# EOF\n"
+
+def render_metrics(s):
+    """Snapshot → OpenMetrics metni. Olmayan alanlar atlanır (uygulamalar arası ortak)."""
+    g = lambda k: getattr(s, k, None)
+    doc = _Doc()
+    doc.metric("snapshot_version", "Sampler snapshot version", g("version"))
+    doc.metric("cpu_percent", "CPU utilisation (%)", g("cpu"))
+    if g("cores"):
+        doc.metric("cpu_core_percent", "Per-core CPU utilisation (%)",
+                   [({"core": i}, v) for i, v in enumerate(g("cores"))])
+    doc.metric("memory_percent", "Memory used (%)", g("ram"))
+    mem = g("mem") or {}
+    if mem:
+        doc.metric("memory_bytes", "/proc/meminfo fields (bytes)",
+                   [({"field": k}, v) for k, v in mem.items()])
+    doc.metric("disk_root_percent", "Root filesystem used (%)", g("disk") if g("disk") is not None else g("disk_root"))
+    doc.metric("temperature_celsius", "SoC temperature", g("temp"))
+    doc.metric("fan_rpm", "Fan tachometer (RPM)", g("fan_rpm"))
+    doc.metric("fan_pwm_percent", "Fan PWM duty (%)", g("fan_pct"))
+    if g("up") is not None:
+        doc.metric("net_kbytes_per_second", "Network throughput, all interfaces (KB/s)",
+                   [({"dir": "tx"}, g("up")), ({"dir": "rx"}, g("dn"))])
+    nics = g("nic_rates") or {}
+    if nics:
+        doc.metric("net_iface_kbytes_per_second", "Per-interface throughput (KB/s)",
+                   [({"iface": n, "dir": d}, v) for n, (rx, tx) in nics.items()
+                    for d, v in (("rx", rx), ("tx", tx))])
+    if g("disk_rd") is not None:
+        doc.metric("disk_io_kbytes_per_second", "Block device throughput (KB/s)",
+                   [({"dir": "read"}, g("disk_rd")), ({"dir": "write"}, g("disk_wr"))])
+    doc.metric("interrupts_per_second", "Interrupt rate", g("intr_s"))
+    doc.metric("context_switches_per_second", "Context switch rate", g("ctxt_s"))
+    psi = g("psi") or {}
+    for which in ("some", "full"):
+        doc.metric(f"pressure_{which}_avg10_percent", f"PSI {which} avg10 (%)",
+                   [({"resource": k}, v[which][0]) for k, v in psi.items() if which in v])
+    if g("freqs"):
+        doc.metric("cpu_freq_mhz", "cpufreq current frequency (MHz)",
+                   [({"policy": p}, cur) for p, cur, lo, hi in g("freqs")])
+    if g("throttled") is not None:
+        doc.metric("throttled_raw", "Firmware get_throttled bitmask", g("throttled"))
+        doc.metric("throttled", "Firmware throttle flags active now",
+                   [({"flag": f}, 1.0 if f in (g("throttle_flags") or ()) else 0.0)
+                    for f in ("UV", "CAP", "THR", "SOFT")])
+    ov = g("ov") or {}
+    if ov:
+        doc.metric("monitor_cpu_percent", "Monitor's own CPU use (% of one core)", ov.get("total"))
+        doc.metric("monitor_step_cpu_percent", "Monitor CPU use per step (% of one core)",
+                   [({"step": k}, v) for k, v in (ov.get("cpu") or {}).items()])
+        doc.metric("monitor_syscalls_per_minute", "Monitor read/write syscalls per minute", ov.get("syscalls_min"))
+        doc.metric("monitor_forks_per_minute", "Monitor subprocess forks per minute", ov.get("forks_min"))
+        doc.metric("monitor_rss_bytes", "Monitor resident set size", ov.get("rss"))
+    return doc.text()
+
+class MetricsExporter:
+    """
+    snap_fn: son snapshot'ı döndüren çağrılabilir (ör. lambda: metrics.snap)
+    start() daemon thread açar; stop() kapatır.
+    """
+    CTYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+    def __init__(self, snap_fn, port=9101, addr="127.0.0.1"):
+        self.snap_fn = snap_fn
+        self.port = int(port); self.addr = addr
+        self._ver = None
+        self._body = b""
+        self._stop = False
+        self.scrapes = 0
+
+    @classmethod
+    def from_env(cls, snap_fn):
+        port = os.getenv("PI5_METRICS_PORT")
+        if not port: return None
+        return cls(snap_fn, port=port, addr=os.getenv("PI5_METRICS_ADDR", "127.0.0.1"))
+
+    def body(self):
+        snap = self.snap_fn()
+        ver = getattr(snap, "version", None)
+        if ver is None or ver != self._ver:
+            self._body = render_metrics(snap).encode()
+            self._ver = ver
+        return self._body
+
+    def _respond(self, req):
+        """İstek baytları → yanıt baytları."""
+        line = req.split(b"\r\n", 1)[0].split()
+        path = line[1].split(b"?", 1)[0] if len(line) > 1 else b"/"
+        if path in (b"/metrics", b"/"):
+            status, ctype, body = b"200 OK", self.CTYPE.encode(), self.body()
+            self.scrapes += 1
+        else:
+            status, ctype, body = b"404 Not Found", b"text/plain", b"not found\n"
+        head = (b"HTTP/1.1 " + status + b"\r\nContent-Type: " + ctype +
+                b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n")
+        return head + (body if not line or line[0] != b"HEAD" else b"")
+
+    def serve(self):
+        sel = selectors.DefaultSelector()
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        srv.bind((self.addr, self.port)); srv.listen(8); srv.setblocking(False)
+        sel.register(srv, selectors.EVENT_READ, None)
+        bufs, outs, born = {}, {}, {}      # istek tamponu, bekleyen yanıt, kabul anı
+
+        def close(conn):
+            sel.unregister(conn)
+            bufs.pop(conn, None); outs.pop(conn, None); born.pop(conn, None)
+            try: conn.close()
+            except Exception: pass
+
+        try:
+            while not self._stop:
+                for key, mask in sel.select(timeout=1.0):
+                    if key.data is None:
+                        try:
+                            conn, _ = srv.accept()
+                        except OSError:
+                            continue
+                        conn.setblocking(False)
+                        bufs[conn] = b""; born[conn] = time.monotonic()
+                        sel.register(conn, selectors.EVENT_READ, "c")
+                        continue
+                    conn = key.fileobj
+                    if conn not in born:
+                        continue
+                    if mask & selectors.EVENT_WRITE:
+                        out = outs[conn]
+                        try:
+                            del out[:conn.send(out)]
+                        except (BlockingIOError, InterruptedError):
+                            pass
+                        except OSError:
+                            out.clear()
+                        if not out: close(conn)
+                        continue
+                    try:
+                        chunk = conn.recv(4096)
+                    except (BlockingIOError, InterruptedError):
+                        continue
+                    except OSError:
+                        chunk = b""
+                    if not chunk:
+                        close(conn); continue
+                    bufs[conn] += chunk
+                    if b"\r\n\r\n" in bufs[conn] or len(bufs[conn]) > 16384:
+                        try:
+                            outs[conn] = bytearray(self._respond(bufs.pop(conn)))
+                        except Exception as e:
+                            logging.debug("exporter: %s", e)
+                            close(conn); continue
+                        sel.modify(conn, selectors.EVENT_WRITE, "c")
+                now = time.monotonic()
+                for conn in [c for c, t in born.items() if now - t > CONN_TIMEOUT]:
+                    close(conn)
+        finally:
+            for c in list(born): c.close()
+            sel.close(); srv.close()
+
+    def start(self):
+        t = threading.Thread(target=self._run, daemon=True, name="metrics-exporter")
+        t.start()
+        return t
+
+    def _run(self):
+        try:
+            self.serve()
+        except Exception as e:
+            logging.warning("metrics exporter kapandı: %s", e)
+
+    def stop(self):
+        self._stop = True
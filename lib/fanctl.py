@@ -0,0 +1,354 @@
+# lib/fanctl.py
+# Fan kontrol politikaları: parça parça doğrusal eğri ya da PID.
+# FanController ortak çıkış katmanıdır: eğim (slew) sınırı, minimum dönme görev oranı,
+# duruştan kalkışta kısa tam-güç tekmesi ve yalnızca değişimde yazma (FanIO).
+#
+# Yapılandırma (JSON, PI5_FAN_CONF):
+#   {"mode": "curve", "points": [[45, 0], [50, 30], [60, 60], [70, 100]], "hyst": 2}
+#   {"mode": "pid", "setpoint": 55, "kp": 8, "ki": 0.4, "kd": 0}
+#   ortak: "slew": 20 (%/sn), "min_spin": 25, "kick": 60, "kick_s": 1.0, "step": 5
+#   "predict": {"horizon": 30, "max_lead": 10} → tahminli rampa (Predictive, eğri/PID'yi sarar)
+#   "rpm": true → kapalı döngü: politika çıktısı azami devrin yüzdesi sayılır, görev oranı
+#                 öğrenilmiş PWM→RPM eğrisinden (ileri besleme) + takometre hatası integrali
+#
+# Takometre: RpmSweep başlangıçta fanı adım adım süpürüp PWM→RPM eğrisini (RpmMap) öğrenir —
+# kontrol döngüsünün içinde, sıcaklık abort_temp'i aşarsa iptal edilerek; StallDetector
+# yüksek PWM'de düşük devri (durmuş / yıpranmış fan) yakalar.
+
+import os, json, time, bisect, logging
+from collections import deque
+
+from lib.metrics import clamp
+
+class Curve:
+    """
+    points: [(°C, %), ...] artan sıcaklıkla. Arada doğrusal, dışında uç değer.
+    hyst: inişte eğriyi bu kadar °C sağa kaydırır (eşik üstünde titremeyi keser).
+    """
+    def __init__(self, points, hyst=2.0):
+        pts = sorted((float(t), float(p)) for t, p in points)
+        self.t = [t for t, _ in pts]
+        self.p = [p for _, p in pts]
+        self.hyst = float(hyst)
+        self._out = None
+
+    def _at(self, temp):
+        t, p = self.t, self.p
+        if temp <= t[0]: return p[0]
+        if temp >= t[-1]: return p[-1]
+        i = bisect.bisect_right(t, temp)
+        f = (temp - t[i-1]) / (t[i] - t[i-1])
+        return p[i-1] + f * (p[i] - p[i-1])
+
+    def __call__(self, temp, dt):
+        up = self._at(temp)
+        if self._out is None or up >= self._out:
+            self._out = up
+        else:
+            # iniş: ancak sıcaklık hyst kadar düşünce eğriyi izle
+            self._out = max(up, min(self._out, self._at(temp + self.hyst)))
+        return self._out
+
+    def reset(self):
+        self._out = None
+
+class PID:
+    """
+    Sıcaklığı setpoint'te tutan PID. Çıkış [out_min, out_max];
+    anti-windup: çıkış doyumdayken integral doyumu derinleştirecek yönde büyümez.
+    """
+    def __init__(self, setpoint=55.0, kp=8.0, ki=0.4, kd=0.0, out_min=0.0, out_max=100.0):
+        self.setpoint = float(setpoint)
+        self.kp, self.ki, self.kd = float(kp), float(ki), float(kd)
+        self.out_min, self.out_max = float(out_min), float(out_max)
+        self.i = 0.0
+        self._prev = None
+
+    def __call__(self, temp, dt):
+        err = temp - self.setpoint           # sıcak → pozitif → daha çok fan
+        d = 0.0
+        if self._prev is not None and dt > 0:
+            d = (temp - self._prev) / dt      # ölçüm türevi (setpoint sıçramasında tekme yok)
+        self._prev = temp
+        u = self.kp * err + self.i + self.kd * d
+        sat_hi, sat_lo = u >= self.out_max, u <= self.out_min
+        if not ((sat_hi and err > 0) or (sat_lo and err < 0)):
+            self.i = clamp(self.i + self.ki * err * dt, self.out_min, self.out_max)
+        return clamp(u, self.out_min, self.out_max)
+
+    def reset(self):
+        self.i = 0.0
+        self._prev = None
+
+def _slope(ys, dx):
+    """Eşit aralıklı örneklerin en küçük kareler eğimi (birim/sn)."""
+    n = len(ys)
+    if n < 3: return 0.0
+    mx = (n - 1) / 2.0
+    my = sum(ys) / n
+    num = sum((i - mx) * (y - my) for i, y in enumerate(ys))
+    den = sum((i - mx) ** 2 for i in range(n))
+    return num / den / dx
+
+class Predictive:
+    """
+    Tahminli rampa: alttaki politika ölçülen yerine öngörülen sıcaklıkla çağrılır.
+      lead = sıcaklık eğimi * horizon + cpu_gain * (son yük - önceki yük), [0, max_lead] °C
+    - eğim htmp'nin son `window` sn'sine doğru uydurulur (sample-and-hold basamaklarını yumuşatır)
+    - yük teyidi (hcpu varsa): son yük cpu_gate altında ve lead < 1°C ise ön-dönüş yok;
+      yük sıçraması (son çeyrek - ilk çeyrek) lead'e eklenir
+    - lead yükselişte hemen, inişte fall_s zaman sabitiyle azalır → fan avlanmaz
+    feed(htmp, hcpu, tick) örnekleyicinin geçmişini verir (sysmon-bus); verilmezse
+    çağrılardaki sıcaklıklardan kendi kısa geçmişini tutar.
+    """
+    def __init__(self, base, horizon=30.0, window=15.0, max_lead=10.0, cpu_gate=40.0,
+                 cpu_gain=0.05, fall_s=10.0, tick=0.5):
+        self.base = base
+        self.horizon = float(horizon); self.window = float(window)
+        self.max_lead = float(max_lead); self.cpu_gate = float(cpu_gate)
+        self.cpu_gain = float(cpu_gain); self.fall_s = float(fall_s)
+        self.tick = float(tick)
+        self.lead = 0.0
+        self._htmp = self._hcpu = None
+        self._own = deque(maxlen=int(window / tick) + 1)
+        self._own_t = 0.0
+
+    def feed(self, htmp, hcpu=None, tick=None):
+        self._htmp, self._hcpu = htmp, hcpu
+        if tick: self.tick = float(tick)
+
+    def estimate(self):
+        n = max(3, int(self.window / self.tick))
+        htmp = self._htmp if self._htmp is not None else self._own
+        ys = [v for v in list(htmp)[-n:] if v == v]          # NaN (bus dolgusu) atla
+        lead = max(0.0, _slope(ys, self.tick)) * self.horizon
+        hcpu = [v for v in list(self._hcpu or ())[-n:] if v == v]
+        if len(hcpu) >= 4:
+            k = max(2, len(hcpu) // 4)
+            recent = sum(hcpu[-k:]) / k
+            older = sum(hcpu[:k]) / k
+            if recent < self.cpu_gate and lead < 1.0:
+                return 0.0                                   # yük yok, küçük kayma: ön-dönüş yok
+            lead += self.cpu_gain * max(0.0, recent - older)
+        return min(self.max_lead, lead)
+
+    def __call__(self, temp, dt):
+        if self._htmp is None and dt > 0:
+            self._own_t += dt
+            while self._own_t >= self.tick:
+                self._own.append(temp); self._own_t -= self.tick
+        est = self.estimate()
+        if est >= self.lead or self.fall_s <= 0:
+            self.lead = est
+        else:
+            self.lead += (est - self.lead) * min(1.0, dt / self.fall_s)
+        return self.base(temp + self.lead, dt)
+
+    def reset(self):
+        self.base.reset()
+        self.lead = 0.0
+        self._own.clear()
+
+class RpmMap:
+    """Öğrenilmiş PWM→RPM eğrisi: [(duty %, rpm), ...]."""
+    def __init__(self, points=()):
+        self.points = sorted((float(d), float(r)) for d, r in points)
+
+    @property
+    def max_rpm(self):
+        return max((r for _, r in self.points), default=0.0)
+
+    @property
+    def ok(self):
+        return len(self.points) >= 2 and self.max_rpm > 0
+
+    def spin_duty(self):
+        """Fanın dönmeye başladığı en düşük ölçülmüş oran."""
+        return next((d for d, r in self.points if r > 0), 100.0)
+
+    def rpm_at(self, duty):
+        pts = self.points
+        if duty <= pts[0][0]: return pts[0][1]
+        for (d0, r0), (d1, r1) in zip(pts, pts[1:]):
+            if duty <= d1:
+                return r0 + (r1 - r0) * (duty - d0) / (d1 - d0) if d1 > d0 else r1
+        return pts[-1][1]
+
+    def duty_for(self, rpm):
+        """rpm'e ulaşan en düşük oran (eğri tekdüze olmasa da ilk kesişim)."""
+        if rpm <= 0: return 0.0
+        pts = self.points
+        for (d0, r0), (d1, r1) in zip(pts, pts[1:]):
+            if r1 >= rpm:
+                if r1 <= r0: return d1
+                return max(d0, d0 + (d1 - d0) * (rpm - r0) / (r1 - r0))
+        return 100.0
+
+class RpmSweep:
+    """
+    Bloklamayan öğrenme: step(temp, now) her kontrol adımında çağrılır; fanı sırayla duties
+    oranlarına getirir, settle sn sonra devri okur. Bitince .map (RpmMap), .done True.
+    Sıcaklık abort_temp'e ulaşırsa (ya da okunamazsa) iptal: .aborted True, .map boş.
+    """
+    def __init__(self, fan, duties=(0, 20, 30, 40, 60, 80, 100), settle=2.5, abort_temp=70.0):
+        self.fan, self.duties = fan, tuple(duties)
+        self.settle, self.abort_temp = float(settle), float(abort_temp)
+        self.points = []
+        self.map = RpmMap()
+        self.done = self.aborted = False
+        self._i = 0; self._since = None
+
+    def step(self, temp, now):
+        if self.done:
+            return True
+        if temp is None or temp >= self.abort_temp:
+            self.done = self.aborted = True
+            return True
+        if self._since is None:
+            self.fan.set_percent(self.duties[self._i]); self._since = now
+        elif now - self._since >= self.settle:
+            self.points.append((self.duties[self._i], self.fan.read_rpm()))
+            self._i += 1; self._since = None
+            if self._i >= len(self.duties):
+                self.map = RpmMap(self.points)
+                self.done = True
+            else:
+                return self.step(temp, now)
+        return self.done
+
+class StallDetector:
+    """
+    update(duty, rpm, now) → "ok" | "degraded" | "stall"
+    - stall: duty >= min_duty iken rpm < floor_rpm (ya da beklenenin %15'i)
+    - degraded: rpm < ratio * beklenen (RpmMap varsa)
+    Durum değişimi hold saniye sürmeli (kalkış/iniş geçişleri yanlış alarm vermesin).
+    Oran değişince, değişimden sonra alınmış (rpm_at > değişim anı) ilk rpm gelene kadar sayaç başlamaz.
+    """
+    def __init__(self, rpm_map=None, min_duty=30.0, ratio=0.5, floor_rpm=300.0, hold=10.0):
+        self.map = rpm_map if rpm_map is not None and rpm_map.ok else None
+        self.min_duty = min_duty; self.ratio = ratio
+        self.floor_rpm = floor_rpm; self.hold = hold
+        self.state = "ok"
+        self._cand = None; self._since = 0.0
+        self._duty = None; self._duty_at = 0.0
+
+    def _classify(self, duty, rpm):
+        if duty < self.min_duty: return self.state if self.state != "degraded" else "ok"
+        exp = self.map.rpm_at(duty) if self.map else None
+        if rpm < self.floor_rpm or (exp and rpm < 0.15 * exp): return "stall"
+        if exp and rpm < self.ratio * exp: return "degraded"
+        return "ok"
+
+    def update(self, duty, rpm, now, rpm_at=None):
+        if duty != self._duty:
+            self._duty, self._duty_at, self._cand = duty, now, None
+        if (now if rpm_at is None else rpm_at) <= self._duty_at:
+            return self.state       # rpm eski orana ait
+        c = self._classify(duty, rpm)
+        if c == self.state:
+            self._cand = None
+        elif c != self._cand:
+            self._cand, self._since = c, now
+        elif now - self._since >= self.hold:
+            self.state, self._cand = c, None
+        return self.state
+
+DEFAULT_CONF = {"mode": "curve", "points": [[45, 0], [50, 30], [60, 60], [70, 100]], "hyst": 2.0,
+                "slew": 20.0, "min_spin": 25.0, "kick": 60.0, "kick_s": 1.0, "step": 5.0,
+                "rpm": False, "rpm_ki": 0.01}
+
+class FanController:
+    """
+    policy(temp, dt) → hedef % ; step(temp, now) bunu çıkış kurallarından geçirip FanIO'ya yazar.
+    - slew: saniyede en fazla bu kadar % değişim
+    - min_spin: 0 < hedef < min_spin ise min_spin (fan bu oranın altında dönmez)
+    - kick/kick_s: duruştan kalkarken kısa süre kick % (motoru kaldırmak için)
+    - step: çıkış bu adıma yuvarlanır; küçük oynamalar sysfs yazımına dönüşmez
+    """
+    def __init__(self, policy, fan=None, slew=20.0, min_spin=25.0, kick=60.0, kick_s=1.0, step=5.0):
+        self.policy = policy
+        self.fan = fan
+        self.slew = float(slew)
+        self.min_spin = float(min_spin)
+        self.kick = float(kick); self.kick_s = float(kick_s)
+        self.step_pct = float(step)
+        self.out = 0.0
+        self.target = 0.0
+        self.closed_loop = False
+        self.rpm_map = None         # kapalı döngü için (RpmMap); yoksa açık döngü PWM
+        self.rpm_ki = 0.01          # %/(rpm·sn)
+        self.rpm_target = None
+        self._trim = 0.0
+        self._kick_until = 0.0
+        self._last = None
+
+    @classmethod
+    def from_conf(cls, conf=None, fan=None):
+        c = dict(DEFAULT_CONF); c.update(conf or {})
+        if c["mode"] == "pid":
+            policy = PID(c.get("setpoint", 55.0), c.get("kp", 8.0), c.get("ki", 0.4), c.get("kd", 0.0))
+        else:
+            policy = Curve(c["points"], c.get("hyst", 2.0))
+        if c.get("predict"):
+            policy = Predictive(policy, **(c["predict"] if isinstance(c["predict"], dict) else {}))
+        ctl = cls(policy, fan, c["slew"], c["min_spin"], c["kick"], c["kick_s"], c["step"])
+        ctl.closed_loop = bool(c["rpm"]); ctl.rpm_ki = float(c["rpm_ki"])
+        return ctl
+
+    def _to_duty(self, pct, rpm, dt):
+        """Kapalı döngü: pct → hedef devir → ileri besleme oranı + sınırlı integral düzeltme."""
+        m = self.rpm_map
+        if not (self.closed_loop and m is not None and m.ok):
+            self.rpm_target = None
+            return pct
+        target = m.max_rpm * pct / 100.0
+        self.rpm_target = target
+        if target <= 0:
+            self._trim = 0.0
+            return 0.0
+        if rpm is not None and dt > 0 and self.out > 0:
+            self._trim = clamp(self._trim + self.rpm_ki * (target - rpm) * dt, -25.0, 25.0)
+        return clamp(round(m.duty_for(target) + self._trim), 0, 100)
+
+    @classmethod
+    def from_env(cls, fan=None):
+        path = os.getenv("PI5_FAN_CONF")
+        conf = None
+        if path:
+            try:
+                with open(path) as f: conf = json.load(f)
+            except Exception as e:
+                logging.warning("fan yapılandırması okunamadı (%s): %s", path, e)
+        return cls.from_conf(conf, fan)
+
+    def compute(self, temp, now, rpm=None):
+        dt = 0.0 if self._last is None else max(0.0, now - self._last)
+        self._last = now
+        tgt = clamp(self.policy(temp, dt), 0, 100)
+        if self.step_pct > 0:
+            tgt = round(tgt / self.step_pct) * self.step_pct
+        tgt = self._to_duty(tgt, rpm, dt)
+        if 0 < tgt < self.min_spin:
+            tgt = self.min_spin
+        self.target = tgt
+
+        out = self.out
+        if tgt > 0 and out == 0 and self.kick > 0:
+            self._kick_until = now + self.kick_s
+        if now < self._kick_until and tgt > 0:
+            out = max(tgt, self.kick)
+        elif self.slew > 0 and dt > 0:
+            lim = self.slew * dt
+            out = out + clamp(tgt - out, -lim, lim)
+            if 0 < out < self.min_spin:
+                out = self.min_spin if tgt > 0 else 0.0
+        else:
+            out = tgt
+        self.out = out
+        return out
+
+    def step(self, temp, now=None, rpm=None):
+        out = self.compute(temp, time.monotonic() if now is None else now, rpm)
+        if self.fan is not None:
+            self.fan.set_percent(out)
+        return out
@@ -0,0 +1,115 @@
+# lib/fanio.py
+# hwmon pwm1 / fan*_input ya da thermal cooling_device üzerinden fan okuma/yazma.
+# Yazma: sysfs fd açık tutulur, yalnızca ham değer değiştiğinde yazılır.
+
+import os
+from lib.metrics import clamp
+
+class FanIO:
+    def __init__(self):
+        self.pwm_path = None
+        self.pwm_enable = None
+        self.fan_input = None   # RPM
+        self.cool_cur = None
+        self.cool_max = None
+        self.percent = 0.0
+        self.state = 0
+        self.writes = 0
+        self._fd = None         # pwm1 ya da cur_state, yazma için açık
+        self._raw = None        # son yazılan ham değer
+        self._cool_max = None
+        self._discover()
+
+    @property
+    def available(self):
+        return bool(self.pwm_path or (self.cool_cur and self.cool_max))
+
+    def _ls(self, root):
+        try: return [os.path.join(root, x) for x in os.listdir(root)]
+        except Exception: return []
+
+    def _discover(self):
+        # Pi 5: /sys/class/hwmon/hwmonN/pwm1 (cooling_fan); bazı sürücülerde hwmonN/device/ altında
+        for hw in sorted(self._ls("/sys/class/hwmon")):
+            for node in (hw, os.path.join(hw, "device")):
+                for f in sorted(self._ls(node)):
+                    base = os.path.basename(f)
+                    if self.fan_input is None and base.startswith("fan") and base.endswith("_input"):
+                        self.fan_input = f
+                p = os.path.join(node, "pwm1")
+                if self.pwm_path is None and os.path.exists(p):
+                    self.pwm_path = p
+                    e = os.path.join(node, "pwm1_enable")
+                    if os.path.exists(e): self.pwm_enable = e
+        if self.pwm_path:
+            return
+        # pwm1 yoksa: thermal cooling_device (yalnızca aç/kapa)
+        for cd in self._ls("/sys/class/thermal"):
+            if not os.path.basename(cd).startswith("cooling_device"):
+                continue
+            cur = os.path.join(cd, "cur_state"); mx = os.path.join(cd, "max_state")
+            if os.path.exists(cur) and os.path.exists(mx):
+                self.cool_cur, self.cool_max = cur, mx
+
+    def read_rpm(self):
+        try:
+            if self.fan_input:
+                v = int(open(self.fan_input).read().strip() or "0")
+                return max(0, v)
+        except Exception:
+            pass
+        return 0
+
+    def read_percent(self):
+        # gerçek çıkış (başka bir süreç de yazmış olabilir)
+        try:
+            if self.pwm_path:
+                return clamp(int(open(self.pwm_path).read().strip() or "0")*100.0/255.0, 0, 100)
+            if self.cool_cur and self.cool_max:
+                cur = int(open(self.cool_cur).read().strip() or "0")
+                mx = int(open(self.cool_max).read().strip() or "0")
+                return clamp(100.0*cur/mx, 0, 100) if mx else 0.0
+        except Exception:
+            pass
+        return self.percent
+
+    def _write_raw(self, path, val):
+        if val == self._raw:
+            return True
+        if self._fd is None:
+            if self.pwm_path and self.pwm_enable:
+                with open(self.pwm_enable, "w") as f: f.write("1\n")   # elle kontrol, bir kez
+            self._fd = os.open(path, os.O_WRONLY)
+        os.pwrite(self._fd, b"%d\n" % val, 0)
+        self._raw = val
+        self.writes += 1
+        return True
+
+    def set_percent(self, pct):
+        pct = float(clamp(pct, 0, 100))
+        ok = False
+        try:
+            if self.pwm_path:
+                ok = self._write_raw(self.pwm_path, int(255 * pct/100.0))
+            elif self.cool_cur and self.cool_max:
+                if self._cool_max is None:
+                    self._cool_max = int(open(self.cool_max).read().strip() or "0")
+                ok = self._write_raw(self.cool_cur, self._cool_max if pct > 0 else 0)
+        except Exception:
+            self.close()
+            ok = False
+        if ok:
+            self.percent = pct
+            self.state = 1 if pct > 0 else 0
+        return ok
+
+    def close(self):
+        if self._fd is not None:
+            try: os.close(self._fd)
+            except OSError: pass
+        self._fd = None
+        self._raw = None
+
+    def toggle(self):
+        return self.set_percent(0 if self.state else 100)
+
@@ -0,0 +1,215 @@
+# lib/fanipc.py
+# Fanın tek sahibi fan-control.py; diğerleri (pano, betikler) Unix soketinden konuşur.
+# Böylece pwm1'e tek süreç yazar, UI da önbellekteki değil gerçek fan durumunu gösterir.
+#
+# Protokol: satır başına bir JSON (SOCK_STREAM, PI5_FAN_SOCK, varsayılan /run/pi5-sysmon/fan.sock)
+#   {"op": "get"}                          → durum
+#   {"op": "mode", "mode": "auto"|"manual"} → durum
+#   {"op": "duty", "pct": 40}              → manuel moda geçer, durum
+#   {"op": "toggle"}                       → manuel 0 ↔ son manuel oran, durum
+#   {"op": "subscribe"}                    → durum, sonra her değişimde yeni durum satırı
+# Durum: {"mode", "duty", "target", "manual", "temp", "rpm", "writes", "ver"}
+
+import os, json, socket, selectors, threading, logging
+
+SOCK_PATH = os.getenv("PI5_FAN_SOCK", "/run/pi5-sysmon/fan.sock")
+OUT_MAX = 256 << 10          # okumayan istemcinin bekleyen çıkışı bunu aşarsa bağlantı kesilir
+
+class FanOwnerBusy(RuntimeError):
+    """Soketi dinleyen yaşayan bir fan-control.py var."""
+
+def _live(path):
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.settimeout(0.5); s.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        s.close()
+
+class FanServer:
+    """
+    Sahip tarafı. Kendi thread'i yok: sahibin döngüsü poll(timeout) çağırır,
+    böylece istekler ve kontrol adımı aynı thread'de işlenir (kilit gerekmez).
+    Yazımlar bloklamaz: sığmayan kısım bağlantının çıkış tamponunda bekler, EVENT_WRITE ile boşaltılır.
+    handler(req) → None; state_fn() → dict. Yol yaşayan bir sahibe bağlanıyorsa FanOwnerBusy
+    (ikinci sahip soketi devralıp pwm1'e ortak yazmasın); yalnızca bayat soket dosyası silinir.
+    """
+    def __init__(self, handler, state_fn, path=SOCK_PATH):
+        self.handler = handler
+        self.state_fn = state_fn
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if _live(path):
+            raise FanOwnerBusy(f"{path}: başka bir fan-control.py çalışıyor")
+        try: os.unlink(path)
+        except FileNotFoundError: pass
+        self.srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.srv.bind(path); self.srv.listen(8); self.srv.setblocking(False)
+        self._ino = os.stat(path).st_ino
+        self.sel = selectors.DefaultSelector()
+        self.sel.register(self.srv, selectors.EVENT_READ, None)
+        self.bufs = {}
+        self.outs = {}              # bağlantı → gönderilmeyi bekleyen baytlar
+        self.subs = set()
+        self._last = None
+
+    def _send(self, conn, line):
+        out = self.outs.get(conn)
+        if out is None:
+            return False
+        out += line
+        if len(out) > OUT_MAX:
+            logging.debug("fanipc: istemci okumuyor, bağlantı kesiliyor")
+            self._drop(conn)
+            return False
+        return self._flush(conn)
+
+    def _flush(self, conn):
+        out = self.outs[conn]
+        try:
+            n = conn.send(out) if out else 0
+        except (BlockingIOError, InterruptedError):
+            n = 0
+        except OSError:
+            self._drop(conn)
+            return False
+        del out[:n]
+        ev = selectors.EVENT_READ | (selectors.EVENT_WRITE if out else 0)
+        if self.sel.get_key(conn).events != ev:
+            self.sel.modify(conn, ev, "c")
+        return True
+
+    def _drop(self, conn):
+        self.subs.discard(conn)
+        self.outs.pop(conn, None)
+        if self.bufs.pop(conn, None) is not None:
+            try: self.sel.unregister(conn)
+            except Exception: pass
+        try: conn.close()
+        except Exception: pass
+
+    def _line(self):
+        return (json.dumps(self.state_fn(), separators=(",", ":")) + "\n").encode()
+
+    def poll(self, timeout):
+        for key, mask in self.sel.select(timeout=timeout):
+            if key.data is None:
+                try: conn, _ = self.srv.accept()
+                except OSError: continue
+                conn.setblocking(False)
+                self.bufs[conn] = b""
+                self.outs[conn] = bytearray()
+                self.sel.register(conn, selectors.EVENT_READ, "c")
+                continue
+            conn = key.fileobj
+            if conn not in self.bufs:
+                continue                          # bu turda düşürüldü
+            if mask & selectors.EVENT_WRITE and not self._flush(conn):
+                continue
+            if not mask & selectors.EVENT_READ:
+                continue
+            try: chunk = conn.recv(4096)
+            except OSError: chunk = b""
+            if not chunk or len(self.bufs.get(conn, b"")) > 65536:
+                self._drop(conn); continue
+            self.bufs[conn] += chunk
+            while b"\n" in self.bufs.get(conn, b""):
+                raw, self.bufs[conn] = self.bufs[conn].split(b"\n", 1)
+                try:
+                    req = json.loads(raw)
+                    if req.get("op") == "subscribe": self.subs.add(conn)
+                    elif req.get("op") != "get": self.handler(req)
+                except Exception as e:
+                    logging.debug("fanipc: geçersiz istek %r: %s", raw[:80], e)
+                if not self._send(conn, self._line()): break
+        self.publish()
+
+    def publish(self):
+        """Durum değiştiyse abonelere gönder."""
+        line = self._line()
+        st = json.loads(line); st.pop("temp", None); st.pop("ver", None); st.pop("rpm", None)
+        if st == self._last: return
+        self._last = st
+        for c in list(self.subs):
+            self._send(c, line)
+
+    def close(self):
+        for c in list(self.bufs): self._drop(c)
+        self.sel.close(); self.srv.close()
+        try:
+            if os.stat(self.path).st_ino == self._ino:     # başkasının soketini silme
+                os.unlink(self.path)
+        except OSError: pass
+
+class FanClient:
+    """
+    İstemci tarafı. connect() sahibi bulamazsa None döner (çağıran yerel FanIO'ya düşer).
+    .state son bilinen durumdur; komutlar bekletmez, yanıt abonelik akışından gelir.
+    """
+    def __init__(self, sock, on_change=None):
+        self.sock = sock
+        self.state = {}
+        self.alive = True
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        threading.Thread(target=self._reader, daemon=True, name="fanipc").start()
+        self._cmd({"op": "subscribe"})
+        self._ready.wait(1.0)
+
+    @classmethod
+    def connect(cls, path=SOCK_PATH, on_change=None):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            s.settimeout(1.0); s.connect(path); s.settimeout(None)
+        except OSError:
+            s.close()
+            return None
+        return cls(s, on_change)
+
+    def _cmd(self, req):
+        try:
+            with self._lock:
+                self.sock.sendall((json.dumps(req) + "\n").encode())
+            return True
+        except OSError:
+            self.alive = False
+            return False
+
+    def _reader(self):
+        buf = b""
+        while self.alive:
+            try: chunk = self.sock.recv(4096)
+            except OSError: chunk = b""
+            if not chunk:
+                self.alive = False; break
+            buf += chunk
+            while b"\n" in buf:
+                line, buf = buf.split(b"\n", 1)
+                try: self.state = json.loads(line)
+                except Exception: continue
+                self._ready.set()
+                if self.on_change:
+                    try: self.on_change(self.state)
+                    except Exception: pass
+        try: self.sock.close()
+        except Exception: pass
+
+    # ---- komutlar ----
+    def set_mode(self, mode): return self._cmd({"op": "mode", "mode": mode})
+    def set_duty(self, pct):  return self._cmd({"op": "duty", "pct": float(pct)})
+    def toggle(self):         return self._cmd({"op": "toggle"})
+
+    @property
+    def auto(self): return self.state.get("mode") == "auto"
+    @property
+    def duty(self): return float(self.state.get("duty") or 0.0)
+    @property
+    def manual(self): return float(self.state.get("manual") or 0.0)
+
+    def close(self):
+        self.alive = False
+        try: self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError: pass
@@ -0,0 +1,59 @@
+# lib/fonts.py
+# Ortak, tembel font önbelleği: uygulamalar açılışta 6–12 boyutu yol yoklayarak yüklüyordu.
+# font(sz) hemen bir vekil döndürür; ilk kullanımda (getbbox, draw.text ...) dosya bir kez
+# bulunur, font kilit altında yüklenir ve vekil her özniteliği (metotlar dahil) gerçek fonttan
+# okur. Aynı (yollar, boyut) için tek nesne: textcache anahtarları ve süreçler arası kopya tutarlı.
+#
+#   F12, F16 = (font(s) for s in (12, 16))      # dosya okunmaz
+#   d.text((0, 0), "x", font=F12)                # burada yüklenir
+
+import os, threading
+from PIL import ImageFont
+
+PATHS = ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+         "/usr/share/fonts/truetype/dejavu/DejaVuSansCondensed.ttf",
+         "/usr/share/fonts/truetype/freefont/FreeSans.ttf")
+
+_found = {}     # yollar → ilk açılabilen dosya (None: hiçbiri)
+_cache = {}     # (yollar, boyut) → LazyFont
+loaded = 0      # gerçekten yüklenen font sayısı (açılış raporu)
+_lock = threading.Lock()
+
+def _load(paths, sz):
+    global loaded
+    loaded += 1
+    p = _found.get(paths, False)
+    if p is False:
+        p = _found[paths] = next((q for q in paths if os.path.exists(q)), None)
+    if p is not None:
+        try: return ImageFont.truetype(p, sz)
+        except Exception: pass
+    return ImageFont.load_default()
+
+class LazyFont(ImageFont.FreeTypeFont):
+    """FreeTypeFont alt sınıfı (PIL'in isinstance denetimleri yüklemeden geçer); öznitelikler gerçek fonta gider."""
+    def __init__(self, paths, sz):
+        object.__setattr__(self, "_lazy", (paths, sz))
+        object.__setattr__(self, "_real", None)
+
+    def _font(self):
+        real = object.__getattribute__(self, "_real")
+        if real is None:
+            with _lock:                             # iki thread aynı anda ilk çizimde: tek yükleme
+                real = object.__getattribute__(self, "_real")
+                if real is None:
+                    real = _load(*object.__getattribute__(self, "_lazy"))
+                    object.__setattr__(self, "_real", real)
+        return real
+
+    def __getattribute__(self, k):
+        return getattr(LazyFont._font(self), k)
+
+    def __setattr__(self, k, v):
+        setattr(LazyFont._font(self), k, v)
+
+def font(sz, paths=PATHS):
+    f = _cache.get((paths, sz))
+    if f is None:
+        f = _cache[(paths, sz)] = LazyFont(tuple(paths), sz)
+    return f
@@ -0,0 +1,174 @@
+# lib/framebudget.py
+# Kare bütçesi: her karenin aşama süreleri (duvar saati) sabit boyutlu halkaya yazılır —
+# girdi okuma ("inputs"), sayfa çizimi ("render:<sayfa>"), RGB565 dönüşümü ("convert"),
+# SPI aktarımı ("spi"), karenin toplamı ("frame"). Halka NumPy dizisi: kare başına ayırma yok.
+# Başka thread'deki işler (örnekleyicinin m.update'i / bus okuması: "sample") record() ile
+# bildirilir; sonraki karenin satırına aradaki en uzun süre yazılır.
+# Kayan FPS (son window sn) ve yüzdelikler (p50/p95/p99, max) stats()'ta hesaplanır.
+# OV (lib/overhead.py) CPU süresini ölçer; bu modül gecikmeyi — _render_page ya da aktarım
+# yavaşlarsa bindirmede/sokette hemen görünür.
+#
+#   FB.begin()
+#   with FB.stage("render:system"): ...
+#   FB.end()                                   # ya da FB.cancel() (kare çizilmediyse)
+#   FB.record("sample", dt)                    # örnekleyici thread'inden, sn
+#   box = draw_overlay(img, FB.stats(), C)     # gizli bindirme (uzun bas)
+#   FrameSocket.from_env(FB.stats).start()     # PI5_FRAME_SOCK: bağlanana tek JSON satırı
+#
+# stats(): {"frames", "fps", "budget_ms", "over", "stages": {ad: {"last", "p50", "p95", "p99", "max", "n"}}}
+# (süreler ms; "over": penceredeki bütçeyi aşan kare oranı)
+
+import os, json, time, socket, threading, logging
+from contextlib import contextmanager
+
+import numpy as np
+
+MAX_STAGES = 24
+
+class FrameBudget:
+    def __init__(self, size=256, window=5.0, budget_ms=None):
+        self.size, self.window = size, window
+        self.budget_ms = float(os.getenv("PI5_FRAME_BUDGET_MS", "33")) if budget_ms is None else budget_ms
+        self.ring = np.full((size, MAX_STAGES), np.nan, dtype=np.float32)   # ms; yoksa NaN
+        self.ts = np.zeros(size)
+        self.cols = {"frame": 0}       # aşama → sütun
+        self.i = self.n = self.frames = 0
+        self._t0 = None
+        self._cur = {}
+        self._ext = {}                 # record() ile gelen, henüz satıra yazılmamış süreler
+        self._lock = threading.Lock()
+
+    def begin(self):
+        self._t0 = time.perf_counter()
+        self._cur.clear()
+
+    def cancel(self):
+        self._t0 = None
+
+    @contextmanager
+    def stage(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._cur[name] = self._cur.get(name, 0.0) + (time.perf_counter() - t)
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._ext[name] = max(self._ext.get(name, 0.0), seconds)
+
+    def _col(self, name):
+        c = self.cols.get(name)
+        if c is None and len(self.cols) < MAX_STAGES:
+            c = self.cols[name] = len(self.cols)
+        return c
+
+    def end(self):
+        if self._t0 is None:
+            return
+        now = time.perf_counter()
+        row = self.ring[self.i]
+        row[:] = np.nan
+        row[0] = (now - self._t0) * 1000.0
+        with self._lock:
+            ext, self._ext = self._ext, {}
+        for name, s in list(self._cur.items()) + list(ext.items()):
+            c = self._col(name)
+            if c is not None: row[c] = s * 1000.0
+        self.ts[self.i] = now
+        self.i = (self.i + 1) % self.size
+        self.n = min(self.n + 1, self.size)
+        self.frames += 1
+        self._t0 = None
+
+    def stats(self):
+        n = self.n
+        out = {"frames": self.frames, "fps": 0.0, "budget_ms": self.budget_ms, "over": 0.0, "stages": {}}
+        if not n:
+            return out
+        idx = (self.i - 1 - np.arange(n)) % self.size       # yeniden eskiye
+        ring, ts = self.ring[idx], self.ts[idx]
+        k = int((ts >= ts[0] - self.window).sum())
+        if k >= 2 and ts[0] > ts[k - 1]:
+            out["fps"] = round((k - 1) / (ts[0] - ts[k - 1]), 2)
+        out["over"] = round(float((ring[:k, 0] > self.budget_ms).mean()), 3)
+        for name, c in list(self.cols.items()):
+            v = ring[:, c]
+            v = v[np.isfinite(v)]
+            if not len(v): continue
+            p50, p95, p99 = np.percentile(v, (50, 95, 99))
+            out["stages"][name] = {"last": round(float(v[0]), 2), "p50": round(float(p50), 2),
+                                   "p95": round(float(p95), 2), "p99": round(float(p99), 2),
+                                   "max": round(float(v.max()), 2), "n": int(len(v))}
+        return out
+
+FB = FrameBudget()
+
+def draw_overlay(img, st, C, rows=4):
+    """Sol alt köşeye opak kutu: FPS, kare p50/p95 ve p95'i en büyük aşamalar.
+    Çizilen kutuyu döndürür (kısmi gönderimde hasara eklenir)."""
+    from PIL import ImageDraw
+    from lib.fonts import font
+    f = font(12)
+    W, H = img.size
+    fr = st["stages"].get("frame")
+    lines = [f"{st['fps']:.1f} fps  >{st['budget_ms']:.0f}ms {st['over'] * 100:.0f}%"]
+    if fr:
+        lines.append(f"frame {fr['p50']:.1f}/{fr['p95']:.1f} max {fr['max']:.0f}")
+    top = sorted(((k, v) for k, v in st["stages"].items() if k != "frame"), key=lambda kv: -kv[1]["p95"])
+    lines += [f"{k.replace('render:', '')[:14]} {v['p50']:.1f}/{v['p95']:.1f}" for k, v in top[:rows]]
+    box = (0, H - 8 - 14 * len(lines), min(W, 172), H)
+    d = ImageDraw.Draw(img)
+    d.rectangle((box[0], box[1], box[2] - 1, box[3] - 1), fill=C["BG"], outline=C["GRID"])
+    y = box[1] + 4
+    for s in lines:
+        d.text((6, y), s, font=f, fill=C["FG"])
+        y += 14
+    return box
+
+class FrameSocket:
+    """Yerel Unix soketi: her bağlantıya stats_fn() JSON satırı yazıp kapatır (nc -U yol)."""
+    def __init__(self, stats_fn, path):
+        self.stats_fn = stats_fn
+        self.path = path
+        self.reads = 0
+        self._stop = False
+        self.srv = None
+
+    @classmethod
+    def from_env(cls, stats_fn):
+        path = os.getenv("PI5_FRAME_SOCK")
+        if not path: return None
+        return cls(stats_fn, path)
+
+    def start(self):
+        d = os.path.dirname(self.path)
+        if d: os.makedirs(d, exist_ok=True)
+        try: os.unlink(self.path)
+        except FileNotFoundError: pass
+        self.srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.srv.bind(self.path); self.srv.listen(4)
+        t = threading.Thread(target=self._run, daemon=True, name="frame-budget")
+        t.start()
+        return t
+
+    def _run(self):
+        while not self._stop:
+            try:
+                conn, _ = self.srv.accept()
+            except OSError:
+                break
+            with conn:
+                try:
+                    conn.settimeout(1.0)
+                    conn.sendall((json.dumps(self.stats_fn(), separators=(",", ":")) + "\n").encode())
+                    self.reads += 1
+                except Exception as e:
+                    logging.debug("frame socket: %s", e)
+
+    def stop(self):
+        self._stop = True
+        try: self.srv.close()
+        except Exception: pass
+        try: os.unlink(self.path)
+        except Exception: pass
@@ -0,0 +1,92 @@
+# lib/layers.py
+# Statik katman önbelleği: sayfa iskeleti (arka plan, ızgara, başlıklar, kart yüzeyleri,
+# halka izleri, sabit etiketler) tema ve boyut başına bir kez çizilir; her karede bunun
+# kopyası üzerine yalnızca değişen kısım çizilir.
+#
+#   img = LAYERS.frame("thermal", C, (W, H), chrome_fn)         # chrome_fn(d, C, W, H)
+#   img = LAYERS.compose("system", C, (W, h), lambda s, d: draw(s, d, ...), layout=(nnics,))
+# compose: tek çizim fonksiyonu statik kısmı s'ye, dinamik kısmı d'ye çizer. İskelet önbellekte
+# yoksa fonksiyon bir kez (s=gerçek, d=NULL) çalışıp iskeleti kurar; her karede (s=NULL, d=gerçek).
+# Böylece yerleşim kodu tek yerde kalır.
+# layout: iskeleti etkileyen değerler (kart sayısı, buton durumu...) anahtara girer.
+#
+# Kare atlama: sayfa hangi snapshot alanlarına ve hangi saat adımına bağlı olduğunu bildirir;
+# inputs() anahtarı değişmediyse döngü çizimi ve ekran aktarımını tümden atlar.
+#   @depends("temp", "fan_pct", clock=60)     # başlık saati dakikada bir
+#   def page_thermal(...): ...
+
+import time
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+
+from lib.textcache import CachedDraw
+
+def _noop(*a, **k):
+    return None
+
+class _NullDraw:
+    """Çizmeyen ImageDraw: ölçüm çağrıları (textlength/textbbox) gerçek, kalanı no-op."""
+    def __init__(self):
+        self._m = ImageDraw.Draw(Image.new("L", (1, 1)))
+
+    def textlength(self, *a, **k): return self._m.textlength(*a, **k)
+    def textbbox(self, *a, **k): return self._m.textbbox(*a, **k)
+
+    def __getattr__(self, name):
+        return _noop
+
+NULL = _NullDraw()
+
+class LayerCache:
+    def __init__(self, max_items=24):
+        self.max_items = max_items
+        self.layers = OrderedDict()
+        self.builds = 0
+
+    def get(self, key, C, size, chrome, layout=()):
+        k = (key, id(C), tuple(size), tuple(layout))
+        img = self.layers.get(k)
+        if img is not None:
+            self.layers.move_to_end(k)
+            return img
+        img = Image.new("RGB", tuple(size), C["BG"])
+        if chrome is not None:
+            chrome(CachedDraw(img), C, size[0], size[1])
+        self.layers[k] = img
+        self.builds += 1
+        while len(self.layers) > self.max_items:
+            self.layers.popitem(last=False)
+        return img
+
+    def frame(self, key, C, size, chrome, layout=()):
+        """Statik katmanın yazılabilir kopyası (dinamik kısım bunun üzerine çizilir)."""
+        return self.get(key, C, size, chrome, layout).copy()
+
+    def compose(self, key, C, size, draw, layout=()):
+        """draw(s, d): s statik iskelete, d bu kareye çizer."""
+        base = self.get(key, C, size, lambda s, C, W, H: draw(s, NULL), layout)
+        img = base.copy()
+        draw(NULL, CachedDraw(img))
+        return img
+
+    def clear(self):
+        self.layers.clear()
+
+LAYERS = LayerCache()
+
+def depends(*fields, clock=None):
+    """Sayfa bildirimi: çizim yalnızca bu snapshot alanlarına ve clock (sn) adımına bağlı."""
+    def mark(fn):
+        fn.deps, fn.clock = fields, clock
+        return fn
+    return mark
+
+def inputs(fn, snap, now=None):
+    """Sayfanın girdi anahtarı; bildirimi olmayan sayfa her snapshot version'ında değişir."""
+    deps = getattr(fn, "deps", None)
+    if deps is None:
+        return (snap.version,)
+    key = tuple(getattr(snap, f, None) for f in deps)
+    if fn.clock:
+        key += (int((time.time() if now is None else now) // fn.clock),)
+    return key
@@ -0,0 +1,227 @@
+# lib/metrics.py
+# Ortak örnekleyici: /proc tek geçiş + hız motoru + PSI/cpufreq/kısılma + fan,
+# uyarlanır zamanlama ve donmuş snapshot yayını. test.py ve sysmon-bus.py kullanır.
+
+import os, time, math
+from collections import deque
+
+from lib.startup import lazy_import
+from lib.procfs import ProcSampler
+from lib.rates import RateEngine
+from lib.pressure import PressureSource
+from lib.overhead import OV
+from lib.adaptive import AdaptiveSchedule
+from lib.snapshot import snapshot_class
+
+psutil = lazy_import("psutil")   # yalnızca /proc okunamazsa ve disk_usage için; açılışta yüklenmez
+
+def clamp(v, lo, hi):
+    try:
+        v = float(v)
+        if not math.isfinite(v): v = 0.0
+    except Exception:
+        v = 0.0
+    return max(lo, min(hi, v))
+
+# Çizicinin gördüğü alanlar (Metrics.snap)
+Snapshot = snapshot_class("Snapshot", (
+    "cpu", "ram", "disk", "temp", "mem_total", "mem_used", "disk_total", "disk_used",
+    "up", "dn", "fan_rpm", "fan_pct", "cores", "mem", "nic_rates", "disk_rd", "disk_wr", "intr_s", "ctxt_s",
+    "psi", "freqs", "freq_mhz", "throttled", "throttle_flags", "throttle_ever", "ov",
+    "hcpu", "hram", "htmp", "hup", "hdn", "hfreq", "hpsi", "ts",
+))
+
+class Metrics:
+    """
+    Örnekleyici. update(page) vadesi gelen kaynakları okur, geçmişi doldurur,
+    donmuş Snapshot'ı self.snap olarak yayınlar.
+      fan   : FanIO (RPM/PWM okuması için, opsiyonel)
+      pages : {kaynak: (sayfa, ...)} görünürlük eşlemesi; None → hepsi hep görünür
+    """
+    def __init__(self, hist_len=90, fan=None, pages=None):
+        self.hist_len = hist_len
+        self.fan = fan
+        self.fan_rpm = 0; self.fan_pct = 0.0
+        self.ts = 0.0                   # son örneklemenin duvar saati (samplelog satırları)
+        self.cpu=self.ram=self.disk=self.temp=0.0
+        self.mem_total=0; self.mem_used=0
+        self.disk_total=0; self.disk_used=0
+        self.up=self.dn=0.0
+        self.hcpu=deque(maxlen=hist_len)
+        self.hram=deque(maxlen=hist_len)
+        self.htmp=deque(maxlen=hist_len)
+        self.hup=deque(maxlen=hist_len)
+        self.hdn=deque(maxlen=hist_len)
+        # /proc tek geçiş okuyucu (per-core CPU, bellek dökümü, NIC/disk sayaçları)
+        self.proc = ProcSampler()
+        self.cores = []
+        self.mem = self.proc.mem
+        self.nics = self.proc.net
+        self.disks = self.proc.disk
+        self.rates = RateEngine(windows=(2.0, 10.0))
+        self.nic_rates = {}
+        self.disk_rd = self.disk_wr = 0.0
+        self.intr_s = self.ctxt_s = 0.0
+        # kısılma / PSI / cpufreq
+        self.pressure = PressureSource()
+        self.psi = {}
+        self.freqs = []
+        self.freq_mhz = 0
+        self.throttled = None
+        self.throttle_flags = []; self.throttle_ever = []
+        self.hfreq = deque(maxlen=hist_len)
+        self.hpsi = deque(maxlen=hist_len)
+        # monitörün kendi maliyeti (OV.report())
+        self.ov = {}
+        # uyarlanır örnekleme: sabit sinyal → aralık 0.5s'den üstel büyür,
+        # sayfa ekranda değilse ayrıca yavaşlar (sayfa no: App.cur)
+        pages = pages or {}
+        self.sched = AdaptiveSchedule(base=0.5)
+        self.sched.add("core", tol=(2.0, 0.5, 8.0, 8.0), max_interval=4.0, pages=pages.get("core"))
+        self.sched.add("disk", tol=(0.2,), max_interval=30.0, pages=pages.get("disk"))
+        self.sched.add("temp", tol=(0.5,), max_interval=5.0, pages=pages.get("temp"))
+        self.sched.add("pressure", tol=(50.0, 2.0, 0.5), max_interval=8.0, pages=pages.get("pressure"))
+        self.sched.add("fan", tol=(50.0, 2.0), max_interval=8.0, pages=pages.get("fan"))
+        self.snap = Snapshot.build(self, 0)
+        self.last_net = None
+        self._last_net_ns = 0
+        if self.proc.ok:
+            self.rates.feed_proc(self.proc.sample())
+        elif psutil:
+            self.last_net = psutil.net_io_counters()
+            self._last_net_ns = time.monotonic_ns()
+
+    def _temp(self):
+        try:
+            out = OV.sh("vcgencmd","measure_temp").decode()
+            return float(out.split("=")[1].split("'")[0])
+        except Exception:
+            try:
+                return int(open("/sys/class/thermal/thermal_zone0/temp").read())/1000.0
+            except Exception:
+                return 0.0
+
+    def _mem_totals(self):
+        if self.proc.ok and self.mem["MemTotal"]:
+            self.mem_total = int(self.mem["MemTotal"])
+            self.mem_used  = int(self.proc.mem_used())
+            self.ram       = clamp(self.proc.mem_percent(), 0, 100)
+        elif psutil:
+            vm = psutil.virtual_memory()
+            self.mem_total = int(vm.total)
+            self.mem_used  = int(vm.total - vm.available)
+            self.ram       = clamp(vm.percent, 0, 100)
+        else:
+            try:
+                meminfo = {}
+                with open("/proc/meminfo") as f:
+                    for line in f:
+                        k,v,*_ = line.split()
+                        meminfo[k.rstrip(":")] = int(v)*1024
+                total = meminfo.get("MemTotal",0)
+                free  = meminfo.get("MemAvailable",0)
+                used  = max(0,total-free)
+                self.mem_total = total; self.mem_used = used
+                self.ram = 100.0*used/max(1,total)
+            except Exception:
+                pass
+
+    def _disk_totals(self):
+        try:
+            if psutil:
+                u = psutil.disk_usage("/")
+                self.disk       = clamp(u.percent, 0, 100)
+                self.disk_total = int(u.total); self.disk_used = int(u.used)
+            else:
+                st = os.statvfs("/")
+                total = st.f_blocks*st.f_frsize
+                free  = st.f_bavail*st.f_frsize
+                used  = total-free
+                self.disk_total = int(total); self.disk_used = int(used)
+                self.disk = 100.0*used/max(1,total)
+        except Exception:
+            pass
+
+    def _proc_update(self):
+        # tek geçiş: stat + meminfo + net/dev + diskstats
+        p = self.proc.sample()
+        self.cpu = clamp(p.cpu, 0, 100)
+        self.cores = p.cores
+        # hızlar monotonic zaman damgasıyla → gerçek KB/s (tick jitter'ından bağımsız)
+        r = self.rates
+        r.feed_proc(p)
+        self.up = r.sum("net:", ":tx", skip=("lo",)) / 1024.0
+        self.dn = r.sum("net:", ":rx", skip=("lo",)) / 1024.0
+        self.nic_rates = {n: (r.get(f"net:{n}:rx")/1024.0, r.get(f"net:{n}:tx")/1024.0)
+                          for n in p.net if n != "lo"}
+        self.disk_rd = r.sum("disk:", ":rd") / 1024.0
+        self.disk_wr = r.sum("disk:", ":wr") / 1024.0
+        self.intr_s = r.get("intr"); self.ctxt_s = r.get("ctxt")
+
+    def _pressure_update(self):
+        try:
+            ps = self.pressure.sample()
+            self.psi = ps.psi
+            self.freqs = ps.freqs
+            self.freq_mhz = ps.freq_mhz()
+            self.throttled = ps.throttled
+            self.throttle_flags = ps.flags; self.throttle_ever = ps.flags_ever
+        except Exception:
+            pass
+
+    def _core_update(self):
+        # cpu + bellek + ağ: /proc tek geçiş (yoksa psutil yedeği)
+        if self.proc.ok:
+            self._proc_update()
+        elif psutil:
+            try: self.cpu = clamp(psutil.cpu_percent(interval=None), 0, 100)
+            except Exception: pass
+        else:
+            try: self.cpu = clamp(os.getloadavg()[0]*25.0, 0, 100)
+            except Exception: pass
+        self._mem_totals()
+        if psutil and not self.proc.ok:
+            try:
+                now = psutil.net_io_counters(); ts = time.monotonic_ns()
+                dt = max(1e-3, (ts - self._last_net_ns)/1e9)
+                if self.last_net:
+                    self.up = max(0.0, (now.bytes_sent - self.last_net.bytes_sent)/1024.0/dt)
+                    self.dn = max(0.0, (now.bytes_recv - self.last_net.bytes_recv)/1024.0/dt)
+                self.last_net = now; self._last_net_ns = ts
+            except Exception:
+                pass
+
+    def update(self, page=None):
+        """Vadesi gelen kaynakları örnekle, geçmişi nominal 0.5s çözünürlükte doldur."""
+        now = time.monotonic(); S = self.sched
+        # her kaynak kendi CPU süresiyle ölçülür (OV, thread_time_ns)
+        if S.due("core", now):
+            with OV.measure("proc"): self._core_update()
+            S.done("core", (self.cpu, self.ram, self.up, self.dn), now, page)
+        if S.due("disk", now):
+            with OV.measure("disk"): self._disk_totals()
+            S.done("disk", (self.disk,), now, page)
+        if S.due("temp", now):
+            with OV.measure("temp"): self.temp = clamp(self._temp(), 0, 120)
+            S.done("temp", (self.temp,), now, page)
+        if self.fan is not None and S.due("fan", now):
+            with OV.measure("fan"):
+                self.fan_rpm = self.fan.read_rpm(); self.fan_pct = self.fan.read_percent()
+            S.done("fan", (self.fan_rpm, self.fan_pct), now, page)
+        if S.due("pressure", now):
+            with OV.measure("pressure"): self._pressure_update()
+            S.done("pressure", (self.freq_mhz, self.pressure.psi_avg10("cpu"), float(self.throttled or 0)), now, page)
+        self.ts = time.time()
+        self.ov = OV.sample()
+        # atlanan tick'ler son değerle doldurulur (sample-and-hold)
+        psi = self.pressure.psi_avg10("cpu")
+        for _ in range(min(S.history_ticks(now), self.hist_len)):
+            self.hcpu.append(self.cpu); self.hram.append(self.ram); self.htmp.append(self.temp)
+            self.hup.append(self.up);   self.hdn.append(self.dn)
+            self.hfreq.append(self.freq_mhz); self.hpsi.append(psi)
+        self.publish()
+
+    def publish(self):
+        # tek referans ataması → çizici ya eskiyi ya yeniyi görür, yarım güncelleme değil
+        self.snap = Snapshot.build(self, self.snap.version + 1)
+
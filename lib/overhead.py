@@ -0,0 +1,97 @@
+# lib/overhead.py
+# Monitörün kendi maliyeti: kaynak/sayfa başına CPU süresi (thread_time_ns),
+# read/write syscall ve fork sayıları (dakika başına), RSS büyümesi.
+
+import os, time, threading, subprocess
+from contextlib import contextmanager
+from lib.rates import RateEngine
+
+def _self_io():
+    # /proc/self/io: syscr/syscw = read/write syscall sayıları
+    out = {}
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                k, _, v = line.partition(":")
+                out[k] = int(v)
+    except Exception:
+        pass
+    return out.get("syscr", 0), out.get("syscw", 0)
+
+_PAGE = os.sysconf("SC_PAGE_SIZE")   # Pi 5 çekirdekleri 16 KiB sayfa kullanır
+
+def _self_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except Exception:
+        return 0
+
+class Overhead:
+    """
+    Kullanım:
+        with OV.measure("temp"): ...       # o thread'in CPU süresi eklenir (iç içe ölçümlerin
+                                           # süresi dıştakinden düşülür: her ad yalnızca kendi payı)
+        OV.sh("vcgencmd", "measure_temp")  # fork sayılır
+        OV.sample()                        # metrics tick'inde bir kez
+        OV.report() -> {"cpu": {ad: %core}, "total": %core, "syscalls_min": (yalnızca read/write) ..,
+                        "forks_min": .., "rss": bayt, "rss_growth": bayt, "rss_per_h": bayt}
+    """
+    def __init__(self, window=10.0):
+        self.cpu_ns = {}
+        self.forks = 0
+        self.rates = RateEngine(windows=(window,))
+        self.t0 = time.monotonic()
+        self.rss0 = _self_rss()
+        self.rss = self.rss0
+        self._report = {}
+        self._local = threading.local()
+
+    @contextmanager
+    def measure(self, name):
+        stack = getattr(self._local, "stack", None)
+        if stack is None: stack = self._local.stack = []
+        stack.append(0)                 # iç ölçümlerin toplamı
+        t0 = time.thread_time_ns()
+        try:
+            yield
+        finally:
+            dt = time.thread_time_ns() - t0
+            inner = stack.pop()
+            if stack: stack[-1] += dt
+            self.cpu_ns[name] = self.cpu_ns.get(name, 0) + (dt - inner)
+
+    def sh(self, *cmd, **kw):
+        """subprocess.check_output + fork sayacı"""
+        self.forks += 1
+        kw.setdefault("stderr", subprocess.DEVNULL)
+        return subprocess.check_output(list(cmd), **kw)
+
+    def sample(self):
+        ts = time.monotonic_ns()
+        r = self.rates
+        r.feed("total", time.process_time_ns(), ts)
+        for name, ns in list(self.cpu_ns.items()):
+            r.feed("cpu:" + name, ns, ts)
+        rd, wr = _self_io()
+        r.feed("syscalls", rd + wr, ts)
+        r.feed("forks", self.forks, ts)
+        self.rss = _self_rss()
+        elapsed = max(1.0, time.monotonic() - self.t0)
+        growth = self.rss - self.rss0
+        # ns/sn → bir çekirdeğin yüzdesi
+        self._report = {
+            "cpu": {k[4:]: v.get() / 1e7 for k, v in r.rates.items() if k.startswith("cpu:")},
+            "total": r.get("total") / 1e7,
+            "syscalls_min": r.get("syscalls") * 60.0,
+            "forks_min": r.get("forks") * 60.0,
+            "rss": self.rss,
+            "rss_growth": growth,
+            "rss_per_h": growth / elapsed * 3600.0,
+        }
+        return self._report
+
+    def report(self):
+        return self._report
+
+OV = Overhead()
@@ -0,0 +1,87 @@
+# lib/prefetch.py
+# Komşu sayfa ön çizimi: kaydırma tanınınca hedef sayfa hazır olsun (ilk kare gecikmesi yok).
+# Düşük öncelik: ayrı thread yerine döngünün boşta kalan (atlanan) karelerinde step() çağrılır,
+# her çağrıda en fazla bir sayfa çizilir. Çizim durumu (LAYERS, TEXT, widget ağaçları) tek
+# thread'de kalır, kilit gerekmez.
+# Tazelik: kare, sayfanın girdi anahtarıyla (tema + @depends alanları, lib/layers.inputs) saklanır;
+# get() anahtar hâlâ aynıysa döndürür. Snapshot çizim sırasında değişirse sonuç atılır (iptal);
+# çizim kalıcı durum ilerletiyorsa (widget ağacı) cancel(sayfa) onu geçersiz kılar.
+# Bellek: toplam kare baytı max_bytes'ı aşarsa en eski kare atılır (PI5_PREFETCH_KB, 0 → kapalı).
+#
+#   pf = Prefetcher(render=lambda p: ..., key=lambda p: ..., cancel=lambda p: ...)
+#   pf.want(neighbours(cur))          # sayfa değişince
+#   if idle: pf.step()                # atlanan karede
+#   frame = pf.get(target)            # kaydırmada: taze kare ya da None
+
+import os
+from collections import OrderedDict
+
+def _nbytes(frame):
+    n = getattr(frame, "nbytes", None)            # numpy (RGB565 kare)
+    if n is None:
+        w, h = frame.size                         # PIL
+        n = w * h * len(frame.getbands())
+    return n
+
+class Prefetcher:
+    def __init__(self, render, key, max_bytes=None, cancel=None):
+        self.render = render                      # fn(sayfa) → kare
+        self.key = key                            # fn(sayfa) → girdi anahtarı
+        self.cancel = cancel                      # fn(sayfa): atılan çizimin yan etkisini geri al
+        self.max_bytes = int(os.getenv("PI5_PREFETCH_KB", "2048")) * 1024 if max_bytes is None else max_bytes
+        self.frames = OrderedDict()               # sayfa → (anahtar, kare, bayt)
+        self.bytes = 0
+        self.wanted = ()
+        self.hits = self.misses = self.cancelled = self.renders = 0
+
+    def want(self, pages):
+        """Taze tutulacak sayfalar (öncelik sırasıyla)."""
+        self.wanted = tuple(pages)
+
+    def get(self, page):
+        e = self.frames.get(page)
+        if e is not None and e[0] == self.key(page):
+            self.hits += 1
+            return e[1]
+        self.misses += 1
+        return None
+
+    def drop(self, page=None):
+        """Sayfanın (None → hepsinin) karesini at."""
+        for p in ([page] if page is not None else list(self.frames)):
+            e = self.frames.pop(p, None)
+            if e is not None: self.bytes -= e[2]
+
+    def step(self):
+        """Bayat ilk sayfayı çiz; bir iş yapıldıysa True."""
+        if self.max_bytes <= 0:
+            return False
+        for p in self.wanted:
+            k = self.key(p)
+            e = self.frames.get(p)
+            if e is not None and e[0] == k:
+                continue
+            frame = self.render(p)
+            self.renders += 1
+            if frame is None or self.key(p) != k:
+                self.cancelled += 1               # girdiler çizim sırasında değişti
+                if self.cancel is not None: self.cancel(p)
+                return True
+            self._put(p, k, frame)
+            return True
+        return False
+
+    def _put(self, page, key, frame):
+        self.drop(page)
+        n = _nbytes(frame)
+        if n > self.max_bytes:
+            return
+        while self.frames and self.bytes + n > self.max_bytes:
+            _, (_, _, m) = self.frames.popitem(last=False)
+            self.bytes -= m
+        self.frames[page] = (key, frame, n)
+        self.bytes += n
+
+    def stats(self):
+        return {"frames": len(self.frames), "bytes": self.bytes, "hits": self.hits,
+                "misses": self.misses, "cancelled": self.cancelled, "renders": self.renders}
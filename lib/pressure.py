@@ -0,0 +1,120 @@
+# lib/pressure.py
+# Kısılma (throttling) ve basınç (PSI) telemetrisi:
+#  - /proc/pressure/{cpu,memory,io}  → some/full avg10/avg60/avg300 (%)
+#  - cpufreq policy*                 → cur/min/max (MHz)
+#  - firmware get_throttled          → under-voltage / freq cap / throttle bayrakları
+# vcgencmd çağrılmaz; bayraklar raspberrypi-firmware sürücüsünün sysfs dosyasından okunur.
+
+import os, glob
+
+PSI_KINDS = ("cpu", "memory", "io")
+
+# get_throttled bitleri (düşük yarı: şu an, yüksek yarı: açılıştan beri oldu)
+THROTTLE_BITS = (
+    (0,  "UV",   "under-voltage"),
+    (1,  "CAP",  "arm freq capped"),
+    (2,  "THR",  "throttled"),
+    (3,  "SOFT", "soft temp limit"),
+)
+THROTTLE_PATHS = (
+    "/sys/devices/platform/soc/soc:firmware/get_throttled",
+    "/sys/devices/platform/soc@107c000000/soc@107c000000:firmware/get_throttled",
+)
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except Exception:
+        return None
+
+def _read_int(path, base=10):
+    s = _read(path)
+    try: return int(s.strip(), base) if s is not None else None
+    except Exception: return None
+
+def read_psi(kind):
+    """{'some': (avg10, avg60, avg300), 'full': (...)} ya da None"""
+    s = _read(f"/proc/pressure/{kind}")
+    if not s: return None
+    out = {}
+    for line in s.splitlines():
+        parts = line.split()
+        if not parts: continue
+        vals = dict(p.split("=", 1) for p in parts[1:])
+        try:
+            out[parts[0]] = (float(vals["avg10"]), float(vals["avg60"]), float(vals["avg300"]))
+        except Exception:
+            pass
+    return out
+
+def _find_throttled():
+    for p in THROTTLE_PATHS:
+        if os.path.exists(p): return p
+    # sysfs'te sembolik bağ döngüleri var; özyinelemeli glob yerine sabit derinlik
+    for pat in ("/sys/devices/platform/*firmware*/get_throttled",
+                "/sys/devices/platform/*/*firmware*/get_throttled"):
+        hits = glob.glob(pat)
+        if hits: return hits[0]
+    return None
+
+def _find_uv_alarm():
+    # rpi_volt hwmon: in0_lcrit_alarm = under-voltage (firmware'a alternatif)
+    for hw in glob.glob("/sys/class/hwmon/hwmon*"):
+        if (_read(os.path.join(hw, "name")) or "").strip() == "rpi_volt":
+            p = os.path.join(hw, "in0_lcrit_alarm")
+            if os.path.exists(p): return p
+    return None
+
+class PressureSource:
+    """
+    Metrics'e eklenen örnekleme kaynağı. sample() sonrası:
+      psi      : {'cpu': {'some': (a10,a60,a300), 'full': ...}, 'memory': ..., 'io': ...}
+      freqs    : [(policy, cur_mhz, min_mhz, max_mhz), ...]
+      throttled: ham bit maskesi (None → arayüz yok)
+      flags    : şu an aktif kısa adlar, ör. ['UV', 'THR']
+      flags_ever : açılıştan beri görülenler
+    """
+    def __init__(self):
+        self.policies = sorted(glob.glob("/sys/devices/system/cpu/cpufreq/policy*"),
+                               key=lambda p: int(p.rsplit("policy", 1)[1] or 0))
+        self.throttled_path = _find_throttled()
+        self.uv_path = None if self.throttled_path else _find_uv_alarm()
+        self.psi = {}
+        self.freqs = []
+        self.throttled = None
+        self.flags = []
+        self.flags_ever = []
+
+    def _policy(self, p):
+        def khz(name):
+            v = _read_int(os.path.join(p, name))
+            return (v or 0) // 1000
+        cur = khz("scaling_cur_freq")
+        lo = khz("scaling_min_freq") or khz("cpuinfo_min_freq")
+        hi = khz("scaling_max_freq") or khz("cpuinfo_max_freq")
+        return (os.path.basename(p), cur, lo, hi)
+
+    def sample(self):
+        for k in PSI_KINDS:
+            v = read_psi(k)
+            if v is not None: self.psi[k] = v
+        self.freqs = [self._policy(p) for p in self.policies]
+
+        if self.throttled_path:
+            self.throttled = _read_int(self.throttled_path, 16)
+        elif self.uv_path:
+            uv = _read_int(self.uv_path)
+            self.throttled = None if uv is None else (0x10001 if uv else 0)
+        if self.throttled is not None:
+            t = self.throttled
+            self.flags = [name for bit, name, _ in THROTTLE_BITS if t & (1 << bit)]
+            self.flags_ever = [name for bit, name, _ in THROTTLE_BITS if t & (1 << (bit+16))]
+        return self
+
+    def psi_avg10(self, kind, which="some"):
+        try: return self.psi[kind][which][0]
+        except Exception: return 0.0
+
+    def freq_mhz(self):
+        return self.freqs[0][1] if self.freqs else 0
@@ -0,0 +1,204 @@
+# lib/procfs.py
+# /proc tek geçişte okuyucu: stat • meminfo • net/dev • diskstats
+# psutil'e gerek yok; dosyalar açık tutulur, her tick'te baştan okunur.
+# Okuma kopyasızdır: read() tampona memoryview döner, ayrıştırıcılar satırları tampon
+# üzerinde (find/startswith ofsetleriyle) gezer; yalnızca gereken satır/alan kopyalanır.
+
+import os, time
+from array import array
+
+MEM_KEYS = ("MemTotal", "MemFree", "MemAvailable", "Buffers", "Cached",
+            "Shmem", "SReclaimable", "Dirty", "SwapTotal", "SwapFree")
+
+# disk alanları: okuma, okunan sektör, yazma, yazılan sektör, io süresi (ms)
+DISK_FIELDS = ("reads", "rsect", "writes", "wsect", "io_ms")
+# net alanları: rx bayt, rx paket, tx bayt, tx paket
+NET_FIELDS = ("rx_bytes", "rx_packets", "tx_bytes", "tx_packets")
+
+class _ProcFile:
+    """Açık tutulan /proc dosyası + önceden ayrılmış okuma tamponu."""
+    def __init__(self, path, size=8192):
+        self.path = path
+        self.buf = bytearray(size)
+        try: self.f = open(path, "rb", buffering=0)
+        except Exception: self.f = None
+
+    def read(self):
+        """Dosyayı tampona okur; kopyasız memoryview(buf)[:n] döner (bir sonraki read'e kadar geçerli)."""
+        if self.f is None: return b""
+        try:
+            self.f.seek(0)
+            n = self.f.readinto(self.buf)
+            # tampon doldu → büyüt ve baştan oku
+            while n == len(self.buf):
+                self.buf = bytearray(len(self.buf) * 2)
+                self.f.seek(0)
+                n = self.f.readinto(self.buf)
+            return memoryview(self.buf)[:n]
+        except Exception:
+            return b""
+
+    def close(self):
+        try:
+            if self.f: self.f.close()
+        except Exception:
+            pass
+        self.f = None
+
+def _lines(raw):
+    """memoryview → (tampon, baş, son) satır ofsetleri; satırlar kopyalanmaz."""
+    buf, end = raw.obj, raw.nbytes
+    i = 0
+    while i < end:
+        j = buf.find(b"\n", i, end)
+        if j < 0: j = end
+        yield buf, i, j
+        i = j + 1
+
+class ProcSampler:
+    """
+    Tek geçişte /proc okuyucu. sample() çağrısı dört dosyayı birer kez okur:
+      cpu_pct : array('d') [toplam, cpu0, cpu1, ...] (%)
+      mem     : {MemTotal: bayt, ...}  (MEM_KEYS)
+      net     : {iface: array('Q', NET_FIELDS)}
+      disk    : {dev: array('Q', DISK_FIELDS)}  (yalnızca tam diskler)
+      intr, ctxt, forks : /proc/stat toplam sayaçları
+      ts_ns   : okuma anı (time.monotonic_ns)
+    """
+    def __init__(self, root="/proc"):
+        self._stat = _ProcFile(os.path.join(root, "stat"))
+        self._mem  = _ProcFile(os.path.join(root, "meminfo"))
+        self._net  = _ProcFile(os.path.join(root, "net/dev"))
+        self._disk = _ProcFile(os.path.join(root, "diskstats"))
+        self.ok = self._stat.f is not None
+
+        self.ncpu = os.cpu_count() or 1
+        n = self.ncpu + 1
+        self._prev_total = array("Q", [0]*n)
+        self._prev_idle  = array("Q", [0]*n)
+        self.cpu_pct = array("d", [0.0]*n)
+
+        self.mem = dict.fromkeys(MEM_KEYS, 0)
+        self.net = {}
+        self.disk = {}
+        self._whole = {}   # dev adı -> tam disk mi? (bir kez bakılır)
+        self.intr = self.ctxt = self.forks = 0
+        self.ts_ns = 0
+
+    # ---- /proc/stat ----
+    def _parse_stat(self, raw):
+        for buf, i, j in _lines(raw):
+            if buf.startswith(b"cpu", i, j):
+                parts = buf[i:j].split()
+                tag = parts[0]
+                i = 0 if tag == b"cpu" else int(tag[3:]) + 1
+                if i >= len(self.cpu_pct):
+                    self._grow_cpu(i + 1)
+                v = [int(x) for x in parts[1:9]]
+                idle = v[3] + (v[4] if len(v) > 4 else 0)
+                total = sum(v)
+                dt = total - self._prev_total[i]
+                di = idle - self._prev_idle[i]
+                if self._prev_total[i] and dt > 0:
+                    self.cpu_pct[i] = max(0.0, min(100.0, 100.0 * (dt - di) / dt))
+                self._prev_total[i] = total
+                self._prev_idle[i] = idle
+            elif buf.startswith(b"intr ", i, j):
+                # satırın geri kalanı (IRQ başına sayaçlar) uzun; yalnızca toplam alınır
+                k = buf.find(b" ", i + 5, j)
+                self.intr = int(buf[i+5:k if k >= 0 else j])
+            elif buf.startswith(b"ctxt ", i, j):
+                self.ctxt = int(buf[i+5:j])
+            elif buf.startswith(b"processes ", i, j):
+                self.forks = int(buf[i+10:j])
+
+    def _grow_cpu(self, n):
+        extra = n - len(self.cpu_pct)
+        self._prev_total.extend([0]*extra)
+        self._prev_idle.extend([0]*extra)
+        self.cpu_pct.extend([0.0]*extra)
+        self.ncpu = n - 1
+
+    # ---- /proc/meminfo ----
+    def _parse_mem(self, raw):
+        mem = self.mem
+        for buf, i, j in _lines(raw):
+            c = buf.find(b":", i, j)
+            if c < 0: continue
+            k = buf[i:c].decode()
+            if k in mem:
+                mem[k] = int(buf[c+1:j].split()[0]) * 1024
+
+    # ---- /proc/net/dev ----
+    def _parse_net(self, raw):
+        seen = set()
+        for n, (buf, i, j) in enumerate(_lines(raw)):
+            c = buf.find(b":", i, j)
+            if n < 2 or c < 0: continue
+            name = buf[i:c].strip().decode()
+            f = buf[c+1:j].split()
+            buf = self.net.get(name)
+            if buf is None:
+                buf = self.net[name] = array("Q", [0]*len(NET_FIELDS))
+            buf[0] = int(f[0]); buf[1] = int(f[1])
+            buf[2] = int(f[8]); buf[3] = int(f[9])
+            seen.add(name)
+        # kaybolan arayüzleri at
+        for name in [n for n in self.net if n not in seen]:
+            del self.net[name]
+
+    # ---- /proc/diskstats ----
+    def _is_whole(self, name):
+        w = self._whole.get(name)
+        if w is None:
+            w = (os.path.exists("/sys/block/" + name)
+                 and not name.startswith(("loop", "ram", "zram")))
+            self._whole[name] = w
+        return w
+
+    def _parse_disk(self, raw):
+        for buf, i, j in _lines(raw):
+            f = buf[i:j].split()
+            if len(f) < 14: continue
+            name = f[2].decode()
+            if not self._is_whole(name): continue
+            buf = self.disk.get(name)
+            if buf is None:
+                buf = self.disk[name] = array("Q", [0]*len(DISK_FIELDS))
+            buf[0] = int(f[3]); buf[1] = int(f[5])
+            buf[2] = int(f[7]); buf[3] = int(f[9])
+            buf[4] = int(f[12])
+
+    def sample(self):
+        self.ts_ns = time.monotonic_ns()
+        for pf, parse in ((self._stat, self._parse_stat), (self._mem, self._parse_mem),
+                          (self._net, self._parse_net), (self._disk, self._parse_disk)):
+            raw = pf.read()
+            if not raw: continue
+            try: parse(raw)
+            except Exception: pass
+        return self
+
+    # ---- kolaylıklar ----
+    @property
+    def cpu(self): return self.cpu_pct[0]
+
+    @property
+    def cores(self): return list(self.cpu_pct[1:self.ncpu+1])
+
+    def mem_used(self):
+        return max(0, self.mem["MemTotal"] - self.mem["MemAvailable"])
+
+    def mem_percent(self):
+        return 100.0 * self.mem_used() / max(1, self.mem["MemTotal"])
+
+    def net_total(self, skip=("lo",)):
+        rx = tx = 0
+        for name, b in self.net.items():
+            if name in skip: continue
+            rx += b[0]; tx += b[2]
+        return rx, tx
+
+    def close(self):
+        for pf in (self._stat, self._mem, self._net, self._disk):
+            pf.close()
@@ -0,0 +1,114 @@
+# lib/rates.py
+# Sayaç → hız motoru: her okuma time.monotonic_ns() ile damgalanır,
+# taşma (32/64 bit) ve sıfırlanma (arayüz/cihaz yeniden başladı) ayıklanır,
+# hız zaman-ağırlıklı EWMA ile yumuşatılır. Örnekleme aralığı oynasa da
+# birim her zaman "saniye başına"dır.
+
+import math, time
+
+WRAP32 = 1 << 32
+WRAP64 = 1 << 64
+
+class Rate:
+    """
+    Tek sayaç. push(değer, ts_ns) → anlık hız (birim/sn).
+    windows: EWMA zaman sabitleri (sn); get(w) ile okunur, get() ilkini verir.
+    """
+    __slots__ = ("windows", "last", "last_ts", "inst", "ewma", "resets")
+
+    def __init__(self, windows=(2.0,)):
+        self.windows = tuple(float(w) for w in windows)
+        self.last = None
+        self.last_ts = 0
+        self.inst = 0.0
+        self.ewma = [0.0] * len(self.windows)
+        self.resets = 0
+
+    def _delta(self, value, dt):
+        d = value - self.last
+        if d >= 0:
+            return d
+        # geri gitti: 32 bit taşma mı, yoksa sıfırlanma mı? Taşma yalnızca önceki değer üst
+        # sınıra yakınsa ve ima edilen artış bir aralık için makulse (son hızın ≤4 katı);
+        # 2^31 üstünden sıfıra dönen sayaç taşma sanılıp GiB'lık sıçrama üretmesin
+        if self.last < WRAP32:
+            w = value + WRAP32 - self.last
+            near_top = WRAP32 - self.last <= WRAP32 // 16
+            plausible = self.inst <= 0 or w <= 4.0 * self.inst * dt + 65536
+            if near_top and w <= WRAP32 // 16 and plausible:
+                return w
+        elif self.last < WRAP64 and WRAP64 - self.last < WRAP64 // 4:
+            return value + WRAP64 - self.last
+        return None
+
+    def push(self, value, ts_ns=None):
+        if ts_ns is None: ts_ns = time.monotonic_ns()
+        if self.last is None:
+            self.last, self.last_ts = value, ts_ns
+            return 0.0
+        dt = (ts_ns - self.last_ts) / 1e9
+        if dt <= 0:
+            return self.inst
+        d = self._delta(value, dt)
+        self.last, self.last_ts = value, ts_ns
+        if d is None:
+            # sayaç sıfırlandı → yeni taban, hız bu tick için geçersiz
+            self.resets += 1
+            return self.inst
+        self.inst = d / dt
+        for i, w in enumerate(self.windows):
+            a = 1.0 - math.exp(-dt / w) if w > 0 else 1.0
+            self.ewma[i] += a * (self.inst - self.ewma[i])
+        return self.inst
+
+    def get(self, window=None):
+        if window is None or not self.windows:
+            return self.ewma[0] if self.ewma else self.inst
+        try: return self.ewma[self.windows.index(float(window))]
+        except ValueError: return self.inst
+
+class RateEngine:
+    """
+    Adlandırılmış sayaçlar. ProcSampler çıktısını feed_proc() ile besle:
+      net:<if>:rx / net:<if>:tx   (bayt/sn)
+      disk:<dev>:rd / disk:<dev>:wr (bayt/sn; sektör*512)
+      intr, ctxt, forks           (adet/sn)
+    """
+    def __init__(self, windows=(2.0, 10.0)):
+        self.windows = windows
+        self.rates = {}
+
+    def feed(self, name, value, ts_ns=None):
+        r = self.rates.get(name)
+        if r is None:
+            r = self.rates[name] = Rate(self.windows)
+        return r.push(value, ts_ns)
+
+    def get(self, name, window=None):
+        r = self.rates.get(name)
+        return r.get(window) if r else 0.0
+
+    def feed_proc(self, p):
+        ts = p.ts_ns
+        for name, b in p.net.items():
+            self.feed(f"net:{name}:rx", b[0], ts)
+            self.feed(f"net:{name}:tx", b[2], ts)
+        for name, b in p.disk.items():
+            self.feed(f"disk:{name}:rd", b[1]*512, ts)
+            self.feed(f"disk:{name}:wr", b[3]*512, ts)
+        self.feed("intr", p.intr, ts)
+        self.feed("ctxt", p.ctxt, ts)
+        self.feed("forks", p.forks, ts)
+        # kaybolan arayüz/disk kayıtlarını temizle
+        for key in [k for k in self.rates if k.startswith(("net:", "disk:"))]:
+            kind, dev, _ = key.split(":", 2)
+            if dev not in (p.net if kind == "net" else p.disk):
+                del self.rates[key]
+
+    def sum(self, prefix, suffix, skip=(), window=None):
+        total = 0.0
+        for key, r in self.rates.items():
+            if key.startswith(prefix) and key.endswith(suffix):
+                if key.split(":")[1] in skip: continue
+                total += r.get(window)
+        return total
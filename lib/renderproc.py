@@ -0,0 +1,112 @@
+# lib/renderproc.py
+# Opsiyonel çizim süreci (PI5_RENDER_WORKER=1): PIL çizimi ana süreçte GIL'i dokunma okuma ve
+# örnekleyici thread'iyle paylaşıyor. Çizici fork ile ayrı süreçte çalışır (sayfa fonksiyonları,
+# fontlar, LAYERS kopyası hazır gelir); ana süreç iş gönderir (snapshot + sayfa/tema durumu, pickle),
+# çizici kareyi RGB565 olarak paylaşımlı bellekteki iki yuvadan birine yazar, bitişi boruya bildirir.
+# Ana süreç yalnızca dokunma ve SPI aktarımı yapar; bir yuva gönderilirken diğerine sonraki kare çizilir.
+# Uçuşta en fazla bir iş ve yuvalar sırayla: çizici gösterilmekte olan yuvaya yazmaz.
+#
+#   w = RenderWorker.from_env(render, (W, H))   # render(iş) → (PIL img, kutu | None); thread'lerden önce
+#   w.submit(job)                               # meşgulse False
+#   r = w.poll()                                # (pix, kutu) ya da None; yalnızca kutu içi yazılmıştır
+#   pix, box = w.call(job)                      # eşzamanlı (geçiş, ön çizim); pix kopya
+#
+# Çizici ölür ya da hata verirse RenderError; çağıran süreç içi çizime döner.
+
+import os, signal
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from lib.LCD_1inch69 import rgb565
+
+class RenderError(RuntimeError):
+    pass
+
+def _serve(conn, shm, size, render):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)    # Ctrl-C ana sürece; çizici boru kapanınca çıkar
+    W, H = size
+    slots = np.ndarray((2, H, W, 2), dtype=np.uint8, buffer=shm.buf)
+    while True:
+        try:
+            slot, job = conn.recv()
+        except (EOFError, OSError):
+            break
+        try:
+            img, box = render(job)
+            if box:
+                x0, y0, x1, y1 = box
+                slots[slot, y0:y1, x0:x1] = rgb565(img.crop(box))
+            conn.send((slot, box, None))
+        except Exception as e:
+            conn.send((slot, None, repr(e)))
+
+class RenderWorker:
+    def __init__(self, render, size):
+        W, H = size
+        self.size = size
+        self.shm = shared_memory.SharedMemory(create=True, size=2 * H * W * 2)
+        self.slots = np.ndarray((2, H, W, 2), dtype=np.uint8, buffer=self.shm.buf)
+        ctx = mp.get_context("fork")                # render bağlı metot; pickle yok, durum kopyalanır
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_serve, args=(child, self.shm, size, render),
+                                name="pi5-render", daemon=True)
+        self.proc.start()
+        child.close()
+        self.slot = 0
+        self.busy = False
+        self.jobs = self.errors = 0
+
+    @classmethod
+    def from_env(cls, render, size):
+        if os.getenv("PI5_RENDER_WORKER", "0") in ("", "0"): return None
+        return cls(render, size)
+
+    def submit(self, job):
+        if self.busy:
+            return False
+        try:
+            self.conn.send((self.slot, job))
+        except (OSError, ValueError) as e:
+            raise RenderError("çizim sürecine yazılamadı") from e
+        self.busy = True
+        self.jobs += 1
+        return True
+
+    def poll(self, timeout=0):
+        """Biten işin (pix, kutu)'su; bitmediyse None. pix yuvanın görünümüdür, ikinci sonraki
+        submit'e kadar geçerli."""
+        try:
+            if not self.busy or not self.conn.poll(timeout):
+                return None
+            slot, box, err = self.conn.recv()
+        except (EOFError, OSError) as e:
+            raise RenderError("çizim süreci kapandı") from e
+        self.busy = False
+        self.slot ^= 1
+        if err:
+            self.errors += 1
+            raise RenderError(err)
+        return self.slots[slot], box
+
+    def call(self, job, timeout=5.0):
+        """Eşzamanlı iş; uçuştaki iş beklenip sonucu atılır. pix kopya."""
+        if self.busy and self.poll(timeout) is None:
+            raise RenderError("çizim süreci yanıt vermiyor")
+        self.submit(job)
+        r = self.poll(timeout)
+        if r is None:
+            raise RenderError("çizim süreci yanıt vermiyor")
+        return r[0].copy(), r[1]
+
+    def close(self):
+        try: self.conn.close()
+        except Exception: pass
+        self.proc.join(1.0)
+        if self.proc.is_alive(): self.proc.terminate()
+        self.slots = None
+        try:
+            self.shm.close(); self.shm.unlink()
+        except Exception:
+            pass
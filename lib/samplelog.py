@@ -0,0 +1,157 @@
+# lib/samplelog.py
+# Örnek kaydı (olay sonrası analiz için): örnekleyiciden sonra akış aşaması.
+# - push() asla bloklamaz: satır sınırlı bellek kuyruğuna girer, dolarsa düşürülür ve sayılır
+# - yazıcı thread satırları toplu yazar, fsync'i satır başına değil takvimle yapar
+# - boyut/yaş sınırında dosyayı döndürür, eskisini gzip'ler, en fazla `keep` arşiv tutar
+# - şema: kompakt CSV ya da JSON-lines (uzantıdan: .jsonl → JSON-lines)
+# Etkinleştirme: PI5_SAMPLE_LOG=/var/log/pi5-sysmon/samples.csv
+
+import os, io, gzip, json, time, shutil, threading, logging
+from collections import deque
+
+FIELDS = ("ts", "cpu", "ram", "temp", "fan_rpm", "fan_pct", "up", "dn",
+          "disk", "freq_mhz", "throttled")
+
+class SampleLog:
+    def __init__(self, path, fmt=None, flush_every=2.0, fsync_every=30.0,
+                 max_bytes=16 << 20, max_age=24*3600, keep=7, queue_max=4096):
+        self.path = path
+        self.fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        self.flush_every = flush_every
+        self.fsync_every = fsync_every
+        self.max_bytes = max_bytes; self.max_age = max_age; self.keep = keep
+        self.q = deque()
+        self.queue_max = queue_max
+        self.dropped = 0
+        self.written = 0
+        self._last_ver = None
+        self._wake = threading.Event()
+        self._stop = False
+        self._f = None
+        self._opened = 0.0
+        self._last_fsync = 0.0
+        self._warned = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="samplelog")
+
+    @classmethod
+    def from_env(cls):
+        path = os.getenv("PI5_SAMPLE_LOG")
+        if not path: return None
+        return cls(path).start()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    # ---- örnekleyici tarafı (bloklamaz) ----
+    def push(self, snap):
+        ver = getattr(snap, "version", None)
+        if ver is not None and ver == self._last_ver:
+            return
+        self._last_ver = ver
+        if len(self.q) >= self.queue_max:
+            self.dropped += 1             # disk yetişemiyor → en yeni satırı at, say
+            return
+        row = [getattr(snap, "ts", None) or time.time()]   # örneğin alındığı an (kuyruğa girdiği değil)
+        for f in FIELDS[1:]:
+            row.append(getattr(snap, f, None))
+        self.q.append(row)
+
+    # ---- yazıcı tarafı ----
+    def _format(self, rows):
+        out = io.StringIO()
+        if self.fmt == "jsonl":
+            for r in rows:
+                out.write(json.dumps(dict(zip(FIELDS, r)), separators=(",", ":")))
+                out.write("\n")
+        else:
+            for r in rows:
+                out.write(",".join("" if v is None else (f"{v:.3f}" if isinstance(v, float) else str(v)) for v in r))
+                out.write("\n")
+        return out.getvalue()
+
+    def _open(self):
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._f = open(self.path, "a", buffering=1 << 16)
+        self._opened = time.time()
+        if new and self.fmt == "csv":
+            self._f.write(",".join(FIELDS) + "\n")
+
+    def _rotate(self):
+        self._close()
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+        rotated, n = f"{self.path}.{stamp}", 0
+        while os.path.exists(rotated) or os.path.exists(rotated + ".gz"):
+            n += 1; rotated = f"{self.path}.{stamp}.{n}"     # aynı milisaniyede ikinci döndürme
+        try:
+            os.replace(self.path, rotated)
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+        except Exception as e:
+            logging.warning("samplelog döndürme: %s", e)
+        # eski arşivleri buda
+        d = os.path.dirname(os.path.abspath(self.path)); base = os.path.basename(self.path) + "."
+        olds = sorted((x for x in os.listdir(d) if x.startswith(base) and x.endswith(".gz")),
+                      key=lambda x: os.path.getmtime(os.path.join(d, x)))   # ".N" ekli adlar ada göre sıralanmaz
+        for x in olds[:-self.keep] if self.keep else olds:
+            try: os.remove(os.path.join(d, x))
+            except Exception: pass
+        self._open()
+
+    def _close(self):
+        if self._f:
+            try:
+                self._f.flush(); os.fsync(self._f.fileno())
+            except Exception:
+                pass
+            self._f.close()
+            self._f = None
+
+    def _drain(self):
+        rows = []
+        while self.q:
+            rows.append(self.q.popleft())
+        if not rows: return
+        try:
+            if self._f is None: self._open()
+            self._f.write(self._format(rows))
+            self._f.flush()
+        except Exception:
+            self.dropped += len(rows)
+            raise
+        self.written += len(rows)
+        now = time.time()
+        if now - self._last_fsync >= self.fsync_every:
+            os.fsync(self._f.fileno()); self._last_fsync = now
+        if self._f.tell() >= self.max_bytes or now - self._opened >= self.max_age:
+            self._rotate()
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.flush_every)
+            self._wake.clear()
+            try:
+                self._drain()
+            except Exception as e:
+                logging.warning("samplelog yazılamadı: %s", e)
+                self._close()
+            if self.dropped and time.time() - self._warned > 60:
+                self._warned = time.time()
+                logging.warning("samplelog: %d satır düşürüldü (disk yavaş)", self.dropped)
+        try:
+            self._drain()
+        except Exception as e:
+            logging.warning("samplelog son yığın yazılamadı (%d satır): %s", len(self.q), e)
+        finally:
+            self._close()
+
+    def stats(self):
+        return {"written": self.written, "queued": len(self.q), "dropped": self.dropped}
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
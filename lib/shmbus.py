@@ -0,0 +1,243 @@
+# lib/shmbus.py
+# Paylaşımlı bellek metrik veriyolu: tek örnekleyici süreç (sysmon-bus.py) son
+# snapshot'ı ve kayan geçmişi multiprocessing.shared_memory segmentine yazar;
+# pano, fan kontrolcüsü, exporter'lar okuyucu olarak bağlanır.
+# Tutarlılık seqlock ile: yazar seq'i tek sayıya çeker → yazar → çift sayıya çeker;
+# okuyucu seq'i önce/sonra okur, eşit ve çiftse kopyası tutarlıdır.
+# Tek yazar: BusWriter /dev/shm/<ad>.lock üzerinde flock alır; yaşayan yazar varken ikincisi
+# başlamaz (segmenti silip okuyucuları koparmasın). Yazar yeniden başlarsa segment yenilenir;
+# okuyucu saniyede bir segmentin inode'unu denetleyip yenisine bağlanır.
+#
+# Yerleşim:
+#   başlık  : magic, layout, seq, ts, hist_len, hist_n, extra_len
+#   skalerler: len(SCALARS) x float64
+#   geçmiş  : len(HISTS) x hist_len x float64 (eskiden yeniye)
+#   ekstra  : JSON (sözlük/liste alanları), en fazla EXTRA_MAX bayt
+
+import os, json, math, fcntl, struct, time, threading
+from array import array
+from types import MappingProxyType
+from multiprocessing import shared_memory
+
+from lib.snapshot import snapshot_class
+
+BUS_NAME = "pi5_sysmon"
+MAGIC = b"P5MB"
+LAYOUT = 1
+HIST_LEN = 90
+EXTRA_MAX = 16384
+
+SCALARS = ("cpu", "ram", "disk", "temp", "mem_total", "mem_used", "disk_total", "disk_used",
+           "up", "dn", "fan_rpm", "fan_pct", "disk_rd", "disk_wr", "intr_s", "ctxt_s",
+           "freq_mhz", "throttled")
+HISTS = ("hcpu", "hram", "htmp", "hup", "hdn", "hfreq", "hpsi")
+EXTRAS = ("cores", "mem", "nic_rates", "psi", "freqs", "throttle_flags", "throttle_ever", "ov")
+
+HDR = struct.Struct("<4sIQdIII")
+SEQ_OFF = 8
+SCAL = struct.Struct("<%dd" % len(SCALARS))
+HIST = struct.Struct("<%dd" % (len(HISTS) * HIST_LEN))
+OFF_SCAL = HDR.size
+OFF_HIST = OFF_SCAL + SCAL.size
+OFF_EXTRA = OFF_HIST + HIST.size
+SIZE = OFF_EXTRA + EXTRA_MAX
+STALE_S = 10.0
+SHM_DIR = "/dev/shm"
+
+BusSnapshot = snapshot_class("BusSnapshot", SCALARS + HISTS + EXTRAS + ("ts",))
+
+def _jsonable(o):
+    if isinstance(o, MappingProxyType): return dict(o)
+    return list(o)
+
+def _ino(name):
+    try: return os.stat(os.path.join(SHM_DIR, name)).st_ino
+    except OSError: return None
+
+class BusBusy(RuntimeError):
+    """Aynı adla yaşayan bir yazar var."""
+
+class BusWriter:
+    """Tek yazar. publish(snap) her yayında seq += 2."""
+    def __init__(self, name=BUS_NAME):
+        # kilit süreç ölünce kendiliğinden bırakılır; alınamıyorsa yazar yaşıyor
+        self.lock = os.open(os.path.join(SHM_DIR, name + ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self.lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(self.lock)
+            raise BusBusy(f"{name}: başka bir yazar çalışıyor")
+        try:
+            old = shared_memory.SharedMemory(name=name)
+            old.close(); old.unlink()   # önceki çalıştırmadan kalan segment
+        except FileNotFoundError:
+            pass
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=SIZE)
+        self.buf = self.shm.buf
+        self.seq = 0
+        HDR.pack_into(self.buf, 0, MAGIC, LAYOUT, 0, 0.0, HIST_LEN, 0, 0)
+        self._hist = array("d", [math.nan]) * (len(HISTS) * HIST_LEN)
+        self.dropped_extra = 0
+
+    def publish(self, snap):
+        scal = []
+        for f in SCALARS:
+            v = getattr(snap, f, None)
+            scal.append(math.nan if v is None else float(v))
+        hist = self._hist
+        n = 0
+        for i, f in enumerate(HISTS):
+            src = getattr(snap, f, None) or ()
+            tail = list(src)[-HIST_LEN:]
+            n = max(n, len(tail))
+            base = i * HIST_LEN
+            pad = HIST_LEN - len(tail)
+            for j in range(pad): hist[base + j] = math.nan
+            hist[base + pad: base + HIST_LEN] = array("d", tail)
+        extra = json.dumps({f: getattr(snap, f, None) for f in EXTRAS},
+                           default=_jsonable, separators=(",", ":")).encode()
+        if len(extra) > EXTRA_MAX:
+            self.dropped_extra += 1
+            extra = b"{}"
+
+        buf = self.buf
+        self.seq += 1                                   # tek → yazım sürüyor
+        struct.pack_into("<Q", buf, SEQ_OFF, self.seq)
+        HDR.pack_into(buf, 0, MAGIC, LAYOUT, self.seq, getattr(snap, "ts", None) or time.time(), HIST_LEN, n, len(extra))
+        SCAL.pack_into(buf, OFF_SCAL, *scal)
+        buf[OFF_HIST:OFF_EXTRA] = hist.tobytes()
+        buf[OFF_EXTRA:OFF_EXTRA + len(extra)] = extra
+        self.seq += 1                                   # çift → tutarlı
+        struct.pack_into("<Q", buf, SEQ_OFF, self.seq)
+
+    def close(self):
+        try:
+            self.buf = None
+            self.shm.close(); self.shm.unlink()
+        except Exception:
+            pass
+        try: os.close(self.lock)
+        except Exception: pass
+
+class BusReader:
+    """
+    Okuyucu. .snap özelliği son tutarlı BusSnapshot'ı döndürür; seq değişmediyse
+    önbellekteki nesne döner (maliyet: tek 8 baytlık okuma). Saniyede bir segment
+    yenilendi mi (yazar yeniden başladı) bakılır, yenilendiyse ona bağlanılır.
+    """
+    def __init__(self, shm, name=BUS_NAME):
+        self.shm = shm
+        self.buf = shm.buf
+        self.name = name
+        self.ino = _ino(name)
+        self._checked = time.monotonic()
+        self._lock = threading.Lock()    # yeniden bağlanma okuyan thread'lerle yarışmasın
+        self._seq = -1
+        self._snap = None
+        self.retries = 0
+        self.reattached = 0
+
+    @classmethod
+    def attach(cls, name=BUS_NAME):
+        """Segment yoksa None (yazar çalışmıyor)."""
+        shm = cls._open(name)
+        return None if shm is None else cls(shm, name)
+
+    @staticmethod
+    def _open(name):
+        try:
+            try:
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                shm = shared_memory.SharedMemory(name=name)
+                # <3.13: resource_tracker okuyucu çıkarken segmenti silmesin
+                try:
+                    from multiprocessing import resource_tracker
+                    resource_tracker.unregister(shm._name, "shared_memory")
+                except Exception:
+                    pass
+        except FileNotFoundError:
+            return None
+        if bytes(shm.buf[:4]) != MAGIC or struct.unpack_from("<I", shm.buf, 4)[0] != LAYOUT:
+            shm.close()
+            return None
+        return shm
+
+    def _check(self):
+        """Segment değiştiyse (inode farklı) yenisine bağlan. Kilit altında çağrılır."""
+        now = time.monotonic()
+        if now - self._checked < 1.0:
+            return
+        self._checked = now
+        ino = _ino(self.name)
+        if ino is None or ino == self.ino:
+            return
+        shm = self._open(self.name)
+        if shm is None:
+            return
+        old, self.shm, self.buf = self.shm, shm, shm.buf
+        self.ino = ino
+        self._seq = -1
+        self.reattached += 1
+        try: old.close()
+        except Exception: pass
+
+    def seq(self):
+        return struct.unpack_from("<Q", self.buf, SEQ_OFF)[0]
+
+    def read(self, tries=50):
+        for _ in range(tries):
+            s1 = self.seq()
+            if s1 & 1:
+                self.retries += 1; time.sleep(0)
+                continue
+            raw = bytes(self.buf[:SIZE])                # tek memcpy
+            if self.seq() != s1:
+                self.retries += 1
+                continue
+            return s1, raw
+        return None, None
+
+    @property
+    def snap(self):
+        with self._lock:
+            self._check()
+            return self._decode()
+
+    def _decode(self):
+        if self.seq() == self._seq and self._snap is not None:
+            return self._snap
+        seq, raw = self.read()
+        if raw is None:
+            return self._snap
+        _, _, _, ts, hist_len, hist_n, extra_len = HDR.unpack_from(raw, 0)
+        scal = SCAL.unpack_from(raw, OFF_SCAL)
+        vals = {f: (None if math.isnan(v) else v) for f, v in zip(SCALARS, scal)}
+        vals["throttled"] = None if vals["throttled"] is None else int(vals["throttled"])
+        hist = array("d"); hist.frombytes(raw[OFF_HIST:OFF_EXTRA])
+        for i, f in enumerate(HISTS):
+            base = i * hist_len
+            vals[f] = hist[base + hist_len - hist_n: base + hist_len]
+        try:
+            extra = json.loads(raw[OFF_EXTRA:OFF_EXTRA + extra_len] or b"{}")
+        except Exception:
+            extra = {}
+        for f in EXTRAS:
+            vals[f] = extra.get(f)
+        vals["ts"] = ts
+        self._snap = BusSnapshot.build(None, seq // 2, **vals)
+        self._seq = seq
+        return self._snap
+
+    def age(self):
+        """Son yayından bu yana geçen süre (sn); yazar öldüyse (ve yenisi yoksa) büyür."""
+        with self._lock:
+            self._check()
+            return time.time() - struct.unpack_from("<d", self.buf, 16)[0]
+
+    def close(self):
+        try:
+            self.buf = None
+            self.shm.close()
+        except Exception:
+            pass
@@ -0,0 +1,65 @@
+# lib/snapshot.py
+# Örnekleyici → çizici arası kilitsiz veri geçişi:
+# örnekleyici her tick'te donmuş (__slots__, salt okunur) bir görüntü kurar,
+# tek referans atamasıyla yayınlar. Çizici tutarlı bir kopya görür; kilit ya da
+# list(series) gibi savunmacı kopyaya gerek kalmaz. version değişmediyse veri de değişmemiştir.
+
+from array import array
+from collections import deque
+from types import MappingProxyType
+
+class FrozenSnapshot:
+    __slots__ = ()
+    FIELDS = ()
+
+    def __setattr__(self, k, v):
+        raise AttributeError(f"{type(self).__name__} salt okunur ({k})")
+
+    def __delattr__(self, k):
+        raise AttributeError(f"{type(self).__name__} salt okunur ({k})")
+
+    def get(self, k, default=None):
+        return getattr(self, k, default)
+
+    def __reduce__(self):
+        # süreçler arası (lib/renderproc.py): sınıf adı + alanlarla yeniden kurulur
+        vals = {f: _thaw(getattr(self, f, None)) for f in self.FIELDS}
+        return (_rebuild, (type(self).__name__, self.FIELDS, self.version, vals))
+
+    @classmethod
+    def build(cls, src, version, **extra):
+        """src nesnesinin FIELDS alanlarından donmuş görüntü üret."""
+        snap = object.__new__(cls)
+        put = object.__setattr__
+        for f in cls.FIELDS:
+            put(snap, f, _freeze(extra[f] if f in extra else getattr(src, f, None)))
+        put(snap, "version", version)
+        return snap
+
+def _freeze(v):
+    if isinstance(v, deque):
+        try: return array("d", v)
+        except TypeError: return tuple(v)
+    if isinstance(v, (list, array)):
+        return tuple(v)
+    if isinstance(v, dict):
+        return MappingProxyType({k: _freeze(x) for k, x in v.items()})
+    return v
+
+def _thaw(v):
+    if isinstance(v, MappingProxyType):
+        return {k: _thaw(x) for k, x in v.items()}
+    return v
+
+_CLASSES = {}
+
+def _rebuild(name, fields, version, vals):
+    cls = _CLASSES.get((name, fields))
+    if cls is None:
+        cls = _CLASSES[(name, fields)] = snapshot_class(name, fields)
+    return cls.build(None, version, **vals)
+
+def snapshot_class(name, fields):
+    """Alan listesinden __slots__'lu donmuş görüntü sınıfı üret."""
+    fields = tuple(fields)
+    return type(name, (FrozenSnapshot,), {"__slots__": fields + ("version",), "FIELDS": fields})
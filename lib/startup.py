@@ -0,0 +1,88 @@
+# lib/startup.py
+# Hızlı açılış: servis yeniden başlayınca panel saniyelerce karanlık kalıyordu (tüm importlar,
+# font yüklemeleri, ısınma örneklemeleri ilk kareden önce). Yol: sürücü + PIL → LCD Init →
+# splash (hedef: exec'ten ≤ PI5_SPLASH_MS, varsayılan 300 ms) → kalan kurulum → ilk kare.
+# Süreler sürecin exec anından ölçülür (/proc/self/stat), yorumlayıcı açılışı dahil.
+#
+#   STARTUP.mark("lcd")                     # önceki işaretten bu yana geçen süre "lcd"ye yazılır
+#   splash(disp, C["BG"], C["FG"], "Pi 5 Monitor")
+#   logging.info(STARTUP.report())          # "startup: imports 180ms · lcd 95ms · splash 20ms (@295ms) ..."
+#   psutil = lazy_import("psutil")          # ilk öznitelik erişiminde; yoksa bool(psutil) False
+
+import os, time, importlib
+
+def since_exec():
+    """Süreç başlangıcından (exec) bu yana geçen süre, sn; okunamazsa None."""
+    try:
+        with open("/proc/self/stat") as f:
+            start = int(f.read().rsplit(")", 1)[1].split()[19])    # alan 22: starttime (tick)
+        with open("/proc/uptime") as f:
+            up = float(f.read().split()[0])
+        return max(0.0, up - start / os.sysconf("SC_CLK_TCK"))
+    except Exception:
+        return None
+
+class Timeline:
+    def __init__(self):
+        t = since_exec()
+        self.t0 = time.monotonic() - (t or 0.0)    # exec anı (okunamazsa bu modülün importu)
+        self.last = self.t0
+        self.marks = []                            # (ad, süre, exec'ten beri)
+        self.target = int(os.getenv("PI5_SPLASH_MS", "300")) / 1000.0
+
+    def mark(self, name):
+        now = time.monotonic()
+        self.marks.append((name, now - self.last, now - self.t0))
+        self.last = now
+
+    def at(self, name):
+        for n, _, t in self.marks:
+            if n == name: return t
+        return None
+
+    def report(self):
+        parts = [f"{n} {dt * 1000:.0f}ms" + (f" (@{t * 1000:.0f}ms)" if n in ("splash", "first_frame") else "")
+                 for n, dt, t in self.marks]
+        from lib import fonts
+        s = "startup: " + " · ".join(parts) + f" · fonts {fonts.loaded}"
+        t = self.at("splash")
+        if t is not None and t > self.target:
+            s += f" — splash hedefi {self.target * 1000:.0f}ms aşıldı"
+        return s
+
+STARTUP = Timeline()
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._mod = False
+
+    def _load(self):
+        if self._mod is False:
+            try: self._mod = importlib.import_module(self._name)
+            except Exception: self._mod = None
+        return self._mod
+
+    def __bool__(self):
+        return self._load() is not None
+
+    def __getattr__(self, k):
+        m = self._load()
+        if m is None:
+            raise AttributeError(f"{self._name} yok ({k})")
+        return getattr(m, k)
+
+def lazy_import(name):
+    return LazyModule(name)
+
+def splash(disp, bg, fg, title, sub="başlatılıyor…"):
+    """Tek kare: arka plan + başlık (fontlar tembel, yalnızca iki boyut yüklenir). RGB565 doğrudan."""
+    from PIL import Image, ImageDraw
+    from lib.fonts import font
+    W, H = disp.width, disp.height
+    img = Image.new("RGB", (W, H), bg)
+    d = ImageDraw.Draw(img)
+    d.text((W // 2, H // 2 - 10), title, font=font(22), fill=fg, anchor="mm")
+    d.text((W // 2, H // 2 + 18), sub, font=font(14), fill=fg, anchor="mm")
+    disp.ShowRGB565(disp.rgb565(img))
+    STARTUP.mark("splash")
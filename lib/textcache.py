@@ -0,0 +1,126 @@
+# lib/textcache.py
+# Metin sprite önbelleği: FreeType rasterleştirmesi küçük karelerde çizim süresinin
+# çoğunu yer. Sabit metinler (başlık, etiket, birim) bir kez rasterleştirilip "L" maskesi
+# olarak tutulur; çizim d.bitmap(xy, maske, fill) ile (renk maskeye dahil değil, bir maske
+# her renkte kullanılır). Rakam içeren değerler ("47.3°C") glif başına maskelerden dizilir,
+# böylece her yeni değer yeniden şekillendirilmez ve önbellek değerlerle şişmez. Dizim PIL'in
+# temel yerleşimini izler (1/64 px ilerleme + çift kerning'i, çapa PIXEL yuvarlaması): tamsayı
+# konumda d.text ile aynı pikseller. Bellek sınırı: LRU, toplam maske baytı üzerinden
+# (sprite'lar ve glifler ayrı bütçe).
+#
+#   d = CachedDraw(img)          # ImageDraw.Draw(img) yerine; d.text(...) çağrıları aynen kalır
+#   text(d, (120, 108), f"{t:.1f}°C", F18, C["FG"], anchor="mm")   # ya da doğrudan
+
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+
+class TextCache:
+    def __init__(self, max_bytes=2 << 20, max_glyph_bytes=256 << 10):
+        self.max_bytes = max_bytes
+        self.max_glyph_bytes = max_glyph_bytes
+        self.bytes = self.glyph_bytes = 0
+        self.sprites = OrderedDict()   # (text, fontkey, anchor) → (mask, dx, dy)
+        self.glyphs = OrderedDict()    # (ch, fontkey) → (mask, dx, dy, ilerleme 1/64 px)
+        self.kerns = {}                # (a, b, fontkey) → çift kerning'i, 1/64 px
+        self.vmetrics = {}             # (fontkey, v) → taban çizgisine göre dikey kayma
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def fontkey(font):
+        return (getattr(font, "path", None), getattr(font, "size", None)) if hasattr(font, "path") else id(font)
+
+    @staticmethod
+    def _raster(text, font, anchor):
+        x0, y0, x1, y1 = font.getbbox(text, anchor=anchor)
+        mask = Image.new("L", (max(1, x1 - x0), max(1, y1 - y0)), 0)
+        ImageDraw.Draw(mask).text((-x0, -y0), text, font=font, fill=255, anchor=anchor)
+        return mask, x0, y0
+
+    def sprite(self, text, font, anchor="la"):
+        key = (text, self.fontkey(font), anchor)
+        hit = self.sprites.get(key)
+        if hit is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return hit
+        self.misses += 1
+        hit = self._raster(text, font, anchor)
+        self.sprites[key] = hit
+        self.bytes += hit[0].width * hit[0].height
+        while self.bytes > self.max_bytes and len(self.sprites) > 1:
+            _, (m, _, _) = self.sprites.popitem(last=False)
+            self.bytes -= m.width * m.height
+        return hit
+
+    def glyph(self, ch, font):
+        key = (ch, self.fontkey(font))
+        g = self.glyphs.get(key)
+        if g is not None:
+            self.glyphs.move_to_end(key)
+            return g
+        mask, dx, dy = self._raster(ch, font, "ls")     # taban çizgisi başlangıcına göre
+        g = self.glyphs[key] = (mask, dx, dy, round(font.getlength(ch) * 64))
+        self.glyph_bytes += mask.width * mask.height
+        while self.glyph_bytes > self.max_glyph_bytes and len(self.glyphs) > 1:
+            _, (m, _, _, _) = self.glyphs.popitem(last=False)
+            self.glyph_bytes -= m.width * m.height
+        return g
+
+    def _kern(self, a, b, font, ga, gb):
+        key = (a, b, self.fontkey(font))
+        k = self.kerns.get(key)
+        if k is None:
+            if len(self.kerns) >= 4096: self.kerns.clear()
+            k = self.kerns[key] = round(font.getlength(a + b) * 64) - ga[3] - gb[3]
+        return k
+
+    def _vshift(self, font, v):
+        """'ls' → 'l'+v dikey kayması (a/m/s/d için metinden bağımsız)."""
+        key = (self.fontkey(font), v)
+        s = self.vmetrics.get(key)
+        if s is None:
+            s = self.vmetrics[key] = font.getbbox("0", anchor="l" + v)[1] - font.getbbox("0", anchor="ls")[1]
+        return s
+
+    def draw(self, d, xy, text, font, fill, anchor=None):
+        if not hasattr(font, "getbbox") or not hasattr(font, "path"):
+            ImageDraw.ImageDraw.text(d, xy, text, fill=fill, font=font, anchor=anchor)   # bitmap yazı tipi
+            return
+        anchor = anchor or "la"
+        x, y = int(xy[0]), int(xy[1])
+        if _is_value(text) and anchor[1] in "amsd":
+            gs = [self.glyph(ch, font) for ch in text]
+            pens, pen = [], 0                           # 1/64 px, PIL temel yerleşimi gibi
+            for i, g in enumerate(gs):
+                pens.append(pen)
+                pen += g[3]
+                if i + 1 < len(gs): pen += self._kern(text[i], text[i + 1], font, g, gs[i + 1])
+            shift = pen // 2 if anchor[0] == "m" else pen if anchor[0] == "r" else 0
+            x -= (shift + 32) >> 6
+            base = y + self._vshift(font, anchor[1])
+            for (mask, dx, dy, _), p in zip(gs, pens):
+                if mask.width > 1 or mask.height > 1:
+                    d.bitmap((x + ((p + 32) >> 6) + dx, base + dy), mask, fill=fill)
+            return
+        mask, dx, dy = self.sprite(text, font, anchor)
+        d.bitmap((x + dx, y + dy), mask, fill=fill)
+
+    def stats(self):
+        return {"sprites": len(self.sprites), "glyphs": len(self.glyphs), "bytes": self.bytes + self.glyph_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+def _is_value(s):
+    return any(c.isdigit() for c in s) and "\n" not in s
+
+TEXT = TextCache()
+
+def text(d, xy, s, font, fill, anchor=None):
+    """d.text(xy, s, font=font, fill=fill, anchor=anchor) yerine; önbellekli."""
+    TEXT.draw(d, xy, s, font, fill, anchor)
+
+class CachedDraw(ImageDraw.ImageDraw):
+    """ImageDraw; basit d.text çağrıları (font + fill, tek satır, ek seçenek yok) önbellekten çizilir."""
+    def text(self, xy, text, fill=None, font=None, anchor=None, *args, **kw):
+        if args or kw or font is None or fill is None or not isinstance(text, str) or "\n" in text:
+            return super().text(xy, text, fill, font, anchor, *args, **kw)
+        TEXT.draw(self, xy, text, font, fill, anchor)
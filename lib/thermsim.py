@@ -0,0 +1,169 @@
+# lib/thermsim.py
+# Çevrimdışı termal model + fan politikası karşılaştırması (Pi gerekmez).
+#
+# Model (tek düğümlü, birinci dereceden):
+#   mass * dT/dt = P(load, T) - (k_passive + k_fan * airflow(duty)) * (T - ambient)
+#   P = p_idle + (p_max - p_idle) * load/100 ; T >= throttle_at iken güç throttle_cut oranında kısılır
+#   airflow: duty < stall_duty → 0 (fan dönmüyor), üstünde sqrt ile doyan hava akışı
+#   fan_lag: fan devrinin görev oranını izleme zaman sabiti (sn)
+# Varsayılanlar kabaca kutu içinde Pi 5 + resmi soğutucu: boşta ~50°C (fansız), tam yükte tam
+# fanla ~80°C; fansız ya da geç/düşük oranlı kontrolde sürekli yük throttle'a (85°C) ulaşır.
+#
+# Kontrolcüler: (temp, now) → % ; interval saniyede bir çağrılır.
+# Skor: peak, above (throttle üstü sn), duty_avg (%), duty_int (%·sn), writes (sysfs yazımı).
+# Tahmin fanı erken döndürür, yani her zaman daha çok görev oranı harcar; adil karşılaştırma
+# aynı harcamadaki erken eğridir ("curve-4°C": noktalar 4°C sola). Varsayılan tesiste bursts
+# izinde curve+predict bu eğriden ~1 puan fazla oranla ~0.8°C düşük tepe verir (bedeli ~%30
+# fazla yazım); random izde tepe eşit, oran biraz düşük; sürekli yükte fark yok (tepeyi fan
+# kapasitesi belirler).
+
+import csv, json, math, random, bisect
+from collections import deque
+
+from lib.fanctl import DEFAULT_CONF, FanController, Predictive
+
+class Plant:
+    def __init__(self, ambient=25.0, mass=15.0, p_idle=2.5, p_max=12.0, k_passive=0.1,
+                 k_fan=0.12, stall_duty=20.0, fan_lag=2.0, throttle_at=85.0, throttle_cut=0.6,
+                 t0=None):
+        self.ambient = ambient; self.mass = mass
+        self.p_idle = p_idle; self.p_max = p_max
+        self.k_passive = k_passive; self.k_fan = k_fan
+        self.stall_duty = stall_duty; self.fan_lag = fan_lag
+        self.throttle_at = throttle_at; self.throttle_cut = throttle_cut
+        self.temp = ambient + p_idle / k_passive if t0 is None else t0
+        self.airflow = 0.0
+
+    def step(self, load, duty, dt):
+        want = 0.0 if duty < self.stall_duty else math.sqrt(duty / 100.0)
+        self.airflow += (want - self.airflow) * min(1.0, dt / self.fan_lag) if self.fan_lag > 0 else want - self.airflow
+        p = self.p_idle + (self.p_max - self.p_idle) * max(0.0, min(100.0, load)) / 100.0
+        if self.temp >= self.throttle_at:
+            p *= self.throttle_cut
+        k = self.k_passive + self.k_fan * self.airflow
+        self.temp += (p - k * (self.temp - self.ambient)) * dt / self.mass
+        return self.temp
+
+# ---------- yük izleri: [(t_sn, cpu%), ...] ----------
+def trace_constant(load, seconds=600):
+    return [(0.0, load), (float(seconds), load)]
+
+def trace_bursts(seconds=900, period=120, duty=0.35, hi=100.0, lo=5.0):
+    out = []; t = 0.0
+    while t < seconds:
+        out.append((t, hi)); out.append((t + period*duty, lo)); t += period
+    out.append((float(seconds), lo))
+    return out
+
+def trace_random(seconds=900, step=5.0, seed=1):
+    rnd = random.Random(seed); v = 20.0; out = []; t = 0.0
+    while t <= seconds:
+        v = max(0.0, min(100.0, v + rnd.gauss(0, 15)))
+        out.append((t, v)); t += step
+    return out
+
+def trace_from_log(path):
+    """samplelog (CSV ya da JSON-lines) kaydından (t, cpu) izi."""
+    rows = []
+    with open(path) as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                try: r = json.loads(line)
+                except Exception: continue
+                if r.get("cpu") is not None: rows.append((float(r["ts"]), float(r["cpu"])))
+        else:
+            for r in csv.DictReader(f):
+                if r.get("cpu"): rows.append((float(r["ts"]), float(r["cpu"])))
+    if not rows: return []
+    t0 = rows[0][0]
+    return [(t - t0, v) for t, v in rows]
+
+TRACES = {"idle": lambda: trace_constant(5), "sustained": lambda: trace_constant(100),
+          "bursts": trace_bursts, "random": trace_random}
+
+def load_at(trace, t, times=None):
+    """Basamak (sample-and-hold) enterpolasyon; times verilirse bisect ile."""
+    times = times or [x for x, _ in trace]
+    return trace[max(0, bisect.bisect_right(times, t) - 1)][1]
+
+# ---------- kontrolcüler ----------
+class SimFan:
+    """FanIO yerine: ham değer değiştiğinde yazım sayar (always=True → her çağrı yazım)."""
+    def __init__(self, always=False):
+        self.percent = 0.0; self.writes = 0; self.always = always; self._raw = None
+    def set_percent(self, pct):
+        raw = int(255 * max(0.0, min(100.0, pct)) / 100.0)
+        if self.always or raw != self._raw: self.writes += 1
+        self._raw = raw; self.percent = raw * 100.0 / 255.0
+        return True
+
+class Legacy:
+    """Eski fan-control.py: 33/36°C eşikleri, 0/128/255, 5 sn'de bir koşulsuz yazım."""
+    name = "legacy-thresholds"; interval = 5.0; always = True
+    def __init__(self, lo=33.0, hi=36.0): self.lo, self.hi = lo, hi
+    def __call__(self, temp, now):
+        return 0.0 if temp < self.lo else (128/2.55 if temp < self.hi else 100.0)
+
+class Hysteresis:
+    """test.py yerel auto: eşikte manual_pct, eşik-hyst altında kapalı."""
+    name = "dashboard-hyst"; interval = 0.5; always = False
+    def __init__(self, thr=65.0, hyst=3.0, pct=60.0):
+        self.thr, self.hyst, self.pct = thr, hyst, pct; self.out = 0.0
+    def __call__(self, temp, now):
+        if temp >= self.thr and self.out < self.pct: self.out = self.pct
+        elif temp <= self.thr - self.hyst and self.out > 0: self.out = 0.0
+        return self.out
+
+class Managed:
+    """lib/fanctl.FanController (eğri/PID + çıkış katmanı)."""
+    interval = 1.0; always = False
+    def __init__(self, conf=None, name=None):
+        self.ctl = FanController.from_conf(conf)
+        self.name = name or ("pid" if (conf or {}).get("mode") == "pid" else "curve")
+        self.htmp = deque(maxlen=90); self.hcpu = deque(maxlen=90)
+        if isinstance(self.ctl.policy, Predictive):
+            self.ctl.policy.feed(self.htmp, self.hcpu, tick=self.interval)
+    def observe(self, temp, load):
+        """Örnekleyici geçmişinin karşılığı (Predictive için)."""
+        self.htmp.append(temp); self.hcpu.append(load)
+    def __call__(self, temp, now):
+        return self.ctl.compute(temp, now)
+
+def default_controllers():
+    early = [[t - 4, d] for t, d in DEFAULT_CONF["points"]]     # curve+predict ile eşit harcama
+    return [Legacy(), Hysteresis(), Managed(), Managed({"points": early}, name="curve-4°C"),
+            Managed({"mode": "pid"}),
+            Managed({"predict": True}, name="curve+predict")]
+
+def simulate(ctrl, trace, plant=None, dt=0.1, noise=0.0, seed=0):
+    """Bir kontrolcüyü bir iz üzerinde koştur; skor sözlüğü döndür."""
+    plant = plant or Plant()
+    fan = SimFan(always=getattr(ctrl, "always", False))
+    rnd = random.Random(seed)
+    end = trace[-1][0]
+    times = [x for x, _ in trace]
+    t = 0.0; next_ctl = 0.0; duty = 0.0
+    peak = plant.temp; above = 0.0; duty_int = 0.0
+    while t <= end:
+        if t >= next_ctl:
+            meas = plant.temp + (rnd.gauss(0, noise) if noise else 0.0)
+            if hasattr(ctrl, "observe"): ctrl.observe(meas, load_at(trace, t, times))
+            fan.set_percent(ctrl(meas, t))
+            duty = fan.percent
+            next_ctl += ctrl.interval
+        temp = plant.step(load_at(trace, t, times), duty, dt)
+        peak = max(peak, temp)
+        if temp >= plant.throttle_at: above += dt
+        duty_int += duty * dt
+        t += dt
+    return {"controller": ctrl.name, "peak": peak, "above": above,
+            "duty_avg": duty_int / max(end, dt), "duty_int": duty_int, "writes": fan.writes}
+
+def benchmark(controllers=None, traces=None, plant_kw=None, **kw):
+    """{iz_adı: [skor, ...]} — her kontrolcü için taze bir Plant."""
+    traces = traces or {k: f() for k, f in TRACES.items()}
+    out = {}
+    for tname, tr in traces.items():
+        ctrls = controllers() if callable(controllers) else (controllers or default_controllers())
+        out[tname] = [simulate(c, tr, Plant(**(plant_kw or {})), **kw) for c in ctrls]
+    return out
@@ -0,0 +1,30 @@
+# lib/transition.py
+# Kaydırma geçişi: iki sayfa geçişin başında bir kez çizilip RGB565'e çevrilir ve yan yana
+# (ya da üst üste) tek bir şeritte tutulur; her ara kare şeritten bir pencere dilimidir.
+# Kare başına yeniden çizim, Image.new + iki paste ve RGB→565 dönüşümü yok; geçiş SPI hızında.
+#
+#   sw = Swipe(disp.rgb565(cur), disp.rgb565(nxt), "L")
+#   disp.ShowRGB565(sw.frame(ease_out_cubic(t)))       # t: 0 → 1
+#
+# Yön anlamı eski paste tabanlı döngüyle aynı: "L" → yeni sayfa soldan girer, "U" → üstten.
+# Donanım kaydırması (ST7789 VSCRDEF/VSCSAD) kullanılmıyor: yalnızca dikey ve panel belleğinde
+# görünmeyen 40 satır var; 280 satırlık sayfanın ekran dışına hazırlanmasına yetmiyor.
+
+import numpy as np
+
+class Swipe:
+    def __init__(self, cur, nxt, direction):
+        self.h, self.w = cur.shape[:2]
+        self.axis = 1 if direction in ("L", "R") else 0
+        self.back = direction in ("L", "U")      # yeni sayfa sol/üst taraftan
+        pair = (nxt, cur) if self.back else (cur, nxt)
+        self.strip = np.concatenate(pair, axis=self.axis)
+
+    def frame(self, t):
+        """t ∈ [0, 1] ilerleme → (h, w, 2) kare (şerit görünümü; dikeyde kopyasız)."""
+        n = self.w if self.axis else self.h
+        off = int(n * t)
+        start = n - off if self.back else off
+        if self.axis:
+            return self.strip[:, start:start + self.w]
+        return self.strip[start:start + self.h]
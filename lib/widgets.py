@@ -0,0 +1,288 @@
+# lib/widgets.py
+# Kalıcı (retained) widget ağacı: her widget kutusunu, bağlı metriğini ve ekranda görünür
+# kuantumunu bilir (halka %1, bar 1 piksel, metin biçimlenmiş dize). Değeri kuantumdan fazla
+# değişmeyen widget yeniden çizilmez. Statik kısımlar (halka/bar izi, sabit etiketler, kartlar)
+# iskelete (lib/layers.py) bir kez çizilir; kirli widget'ın kutusu iskeletten geri yüklenip
+# yalnızca o widget çizilir (kutusu kesişen widget'lar da, üst üste binen metin bozulmasın).
+#
+#   t = Tree([Ring("temp", (120,108), 64, lambda m: m.temp, width=14), ...], chrome=cards)
+#   base = LAYERS.get("thermal", C, (W, H), lambda s, C, W, H: t.chrome(s, C))
+#   img, damage = t.render(m, C, base)      # damage: hasarlı dikdörtgenler
+#   box = union(damage)                      # sürücü yalnızca bu pencereyi gönderir
+#   w = t.hit(x, y)                          # dokunma: en üstteki dokunulabilir widget
+#
+# Kutular (x0, y0, x1, y1), x1/y1 hariç (crop/paste ile aynı).
+# Renk: tema anahtarı ("FG"), RGB demeti ya da fn(v, C).
+
+from PIL import Image, ImageDraw
+
+from lib import chart
+from lib.textcache import CachedDraw
+
+_M = ImageDraw.Draw(Image.new("L", (1, 1)))
+
+def _col(C, f, v=None):
+    if callable(f): return f(v, C)
+    return C[f] if isinstance(f, str) else f
+
+def _clamp(v, lo, hi):
+    try: v = float(v)
+    except Exception: return lo
+    return lo if v != v else max(lo, min(hi, v))
+
+def union(boxes):
+    """Kutuların birleşimi (boşsa None)."""
+    boxes = [b for b in boxes if b]
+    if not boxes: return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+def _meets(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+class Widget:
+    tap = False                  # Tree.hit ile bulunabilir mi
+
+    def __init__(self, name, box=None, bind=None):
+        self.name = name
+        self.box = box
+        self.bind = bind         # fn(m) → değer; None → statik (yalnızca iskelette)
+
+    @property
+    def static(self):
+        return self.bind is None
+
+    def value(self, m):
+        return self.bind(m)
+
+    def key(self, v, C):
+        """Görünür durumu belirleyen anahtar; değişmedikçe yeniden çizim yok."""
+        return v
+
+    def bbox(self, v):
+        return self.box
+
+    def chrome(self, s, C):
+        """İskelete çizilen kısım (iz, çerçeve; statik widget'ın tamamı)."""
+
+    def paint(self, d, C, v):
+        """Değere bağlı kısım; yalnızca bbox(v) içine çizer."""
+
+class Label(Widget):
+    def __init__(self, name, xy, font, fill="FG", bind=None, text="", anchor="la"):
+        super().__init__(name, None, bind)
+        self.xy, self.font, self.fill, self.text, self.anchor = xy, font, fill, text, anchor
+
+    def value(self, m):
+        v = self.bind(m)
+        return v if isinstance(v, tuple) else (v, self.fill)   # (metin, renk) de dönebilir
+
+    def key(self, v, C):
+        return (v[0], _col(C, v[1]))
+
+    def bbox(self, v):
+        if not v[0]: return None
+        x0, y0, x1, y1 = _M.textbbox(self.xy, v[0], font=self.font, anchor=self.anchor)
+        return (int(x0), int(y0), int(x1) + 1, int(y1) + 1)
+
+    def chrome(self, s, C):
+        if self.static: self.paint(s, C, (self.text, self.fill))
+
+    def paint(self, d, C, v):
+        if v[0]: d.text(self.xy, v[0], font=self.font, fill=_col(C, v[1]), anchor=self.anchor)
+
+class Ring(Widget):
+    """Yay göstergesi (135°→405°); bind → yüzde, quantum %1."""
+    def __init__(self, name, center, r, bind, width=12, color="ACC1", track="BARBG", quantum=1.0):
+        cx, cy = center
+        super().__init__(name, (cx - r, cy - r, cx + r + 1, cy + r + 1), bind)
+        self.arc = (cx - r, cy - r, cx + r, cy + r)
+        self.width, self.color, self.track, self.quantum = width, color, track, quantum
+
+    def value(self, m):
+        return _clamp(self.bind(m), 0, 100)
+
+    def key(self, v, C):
+        return (int(v / self.quantum), _col(C, self.color, v))
+
+    def chrome(self, s, C):
+        s.arc(self.arc, 135, 405, width=self.width, fill=_col(C, self.track))
+
+    def paint(self, d, C, v):
+        d.arc(self.arc, 135, 135 + int(270 * v / 100.0), width=self.width, fill=_col(C, self.color, v))
+
+class Bar(Widget):
+    """Yatay bar; kuantum 1 piksel. radius=None → yuvarlak uç (h//2)."""
+    def __init__(self, name, xywh, bind, color="ACC1", track="BARBG", radius=0):
+        x, y, w, h = xywh
+        super().__init__(name, (x, y, x + w + 1, y + h + 1), bind)
+        self.xywh, self.color, self.track = xywh, color, track
+        self.radius = h // 2 if radius is None else radius
+
+    def value(self, m):
+        return _clamp(self.bind(m), 0, 100)
+
+    def key(self, v, C):
+        return (int(self.xywh[2] * v / 100.0), _col(C, self.color, v))
+
+    def _rect(self, d, w, fill):
+        x, y, _, h = self.xywh
+        if self.radius: d.rounded_rectangle([x, y, x + w, y + h], radius=self.radius, fill=fill)
+        else: d.rectangle([x, y, x + w, y + h], fill=fill)
+
+    def chrome(self, s, C):
+        self._rect(s, self.xywh[2], _col(C, self.track))
+
+    def paint(self, d, C, v):
+        self._rect(d, int(self.xywh[2] * v / 100.0), _col(C, self.color, v))
+
+class Sparkline(Widget):
+    """Seri çizgisi (lib/chart.py). Varsayılan: min-max ölçekli, kutuya yayılmış; anahtar piksel
+    noktaları (görünmeyen oynama çizim yapmaz). step verilirse artımlı kayan grafik (ScrollChart)."""
+    def __init__(self, name, xywh, bind, color="ACC1", grid="GRID", width=3, step=None, lo=None, hi=None):
+        x, y, w, h = xywh
+        p = width // 2 + 1
+        super().__init__(name, (x - p, y - p, x + w + p, y + h + p), bind)
+        self.xywh, self.color, self.grid, self.width = xywh, color, grid, width
+        self.scroll = chart.ScrollChart(xywh, step, width, lo, hi) if step else None
+
+    def value(self, m):
+        if self.scroll is not None:
+            return self.scroll.update(self.bind(m))
+        return chart.points(self.bind(m), *self.xywh)
+
+    def key(self, v, C):
+        k = v if self.scroll is not None or v is None else v.tobytes()
+        return (k, _col(C, self.color))
+
+    def chrome(self, s, C):
+        x, y, w, h = self.xywh
+        s.rectangle((x, y, x + w, y + h), outline=_col(C, self.grid), width=1)
+
+    def paint(self, d, C, v):
+        fill = _col(C, self.color)
+        if self.scroll is not None:
+            d.bitmap(self.scroll.origin, self.scroll.ink, fill=fill)
+        elif v is None:
+            x, y, w, h = self.xywh
+            d.line((x, y + h // 2, x + w, y + h // 2), fill=fill, width=self.width)
+        else:
+            chart.polyline(d, v, fill, self.width)
+
+class Button(Widget):
+    """Düğme; bind → etkin mi (dolgu active/fill). bind yoksa statik; tap=False → yalnızca gösterge."""
+    def __init__(self, name, box, text, font, fill="SURFACE", fg=(0, 0, 0), bind=None,
+                 active="LIME", radius=12, tap=True):
+        x0, y0, x1, y1 = box
+        super().__init__(name, (x0, y0, x1 + 1, y1 + 1), bind)
+        self.tap = tap
+        self.rect, self.text, self.font = box, text, font
+        self.fill, self.fg, self.active, self.radius = fill, fg, active, radius
+
+    def value(self, m):
+        return bool(self.bind(m))
+
+    def key(self, v, C):
+        return _col(C, self.active if v else self.fill)
+
+    def chrome(self, s, C):
+        if self.static: self.paint(s, C, False)
+
+    def paint(self, d, C, v):
+        x0, y0, x1, y1 = self.rect
+        d.rounded_rectangle(self.rect, radius=self.radius, fill=_col(C, self.active if v else self.fill))
+        d.text(((x0 + x1) // 2, (y0 + y1) // 2), self.text, font=self.font, fill=_col(C, self.fg), anchor="mm")
+
+    def contains(self, x, y):
+        x0, y0, x1, y1 = self.rect
+        return x0 <= x <= x1 and y0 <= y <= y1
+
+class ColorSwatch(Button):
+    """Renk kutusu; .rgb dokunmada kullanılır."""
+    def __init__(self, name, box, rgb, radius=6):
+        super().__init__(name, box, "", None, fill=rgb, radius=radius)
+        self.rgb = rgb
+
+    def paint(self, d, C, v):
+        d.rounded_rectangle(self.rect, radius=self.radius, fill=self.rgb)
+
+class Area(Widget):
+    """Sabit kutulu serbest çizim (süreç listesi gibi); bind → anahtar, draw(d, C, v)."""
+    def __init__(self, name, box, bind, draw):
+        super().__init__(name, box, bind)
+        self.draw = draw
+
+    def paint(self, d, C, v):
+        self.draw(d, C, v)
+
+class Tree:
+    def __init__(self, widgets=(), chrome=None, size=None):
+        self.widgets = list(widgets)
+        self._chrome = chrome        # fn(s, C): kartlar, başlıklar (widget olmayan iskelet)
+        self.size = size
+        self.layout = ()
+        self.base = self.img = None
+        self.drawn = {}              # index → (anahtar, bbox)
+        self.repaints = 0
+
+    def add(self, w):
+        self.widgets.append(w)
+        return w
+
+    def __getitem__(self, name):
+        for w in self.widgets:
+            if w.name == name: return w
+        raise KeyError(name)
+
+    def chrome(self, s, C):
+        if self._chrome is not None: self._chrome(s, C)
+        for w in self.widgets: w.chrome(s, C)
+
+    def hit(self, x, y):
+        for w in reversed(self.widgets):
+            if w.tap and w.contains(x, y): return w
+        return None
+
+    def invalidate(self):
+        self.base = None
+
+    def render(self, m, C, base):
+        """Kalıcı kareyi güncelle → (img, hasar listesi). İskelet değişince (tema/boyut) tam kare.
+        img bir sonraki render'a kadar geçerli; üzerine çizilecekse kopyalanmalı."""
+        full = base is not self.base
+        if full:
+            self.base, self.img = base, base.copy()
+            self.drawn.clear()
+        vals, todo, areas = {}, {}, []
+        for i, w in enumerate(self.widgets):
+            if w.static: continue
+            v = w.value(m)
+            vals[i] = (v, w.key(v, C))
+            old = self.drawn.get(i)
+            if old is None or old[0] != vals[i][1]:
+                todo[i] = w.bbox(v)
+                areas.append(union([old and old[1], todo[i]]))
+        if not todo:
+            return self.img, []
+        # geri yüklenen alana değen widget'lar da yeniden çizilir
+        grown = True
+        while grown:
+            grown = False
+            for i, (k, bb) in self.drawn.items():
+                if i not in todo and bb and any(a and _meets(bb, a) for a in areas):
+                    todo[i] = self.widgets[i].bbox(vals[i][0])
+                    areas.append(union([bb, todo[i]])); grown = True
+        areas = [self._clip(a) for a in areas if a]
+        areas = [a for a in areas if a[0] < a[2] and a[1] < a[3]]
+        if not full:
+            for a in areas: self.img.paste(base.crop(a), a[:2])
+        d = CachedDraw(self.img)
+        for i in sorted(todo):
+            self.widgets[i].paint(d, C, vals[i][0])
+            self.drawn[i] = (vals[i][1], todo[i])
+        self.repaints += len(todo)
+        return self.img, [(0, 0) + self.img.size] if full else areas
+
+    def _clip(self, a):
+        W, H = self.img.size
+        return (max(0, a[0]), max(0, a[1]), min(W, a[2]), min(H, a[3]))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Tek örnekleyici süreç: Metrics → paylaşımlı bellek veriyolu (lib/shmbus.py).
+# Pano (test.py), fan-control.py ve exporter'lar okuyucu olarak bağlanır;
+# sensörler kaç okuyucu olursa olsun tick başına bir kez okunur.
+#
+#   python3 sysmon-bus.py            (PI5_METRICS_PORT verilirse /metrics de açılır,
+#                                     PI5_SAMPLE_LOG verilirse her örnek dosyaya yazılır,
+#                                     uyarılar PI5_ALERT_SOCK Unix soketine bildirilir)
+
+import signal, threading, logging
+
+from lib.metrics import Metrics
+from lib.fanio import FanIO
+from lib.shmbus import BusWriter, BusBusy
+from lib.adaptive import sleep_until_due
+from lib.exporter import MetricsExporter
+from lib.samplelog import SampleLog
+from lib.alerts import AlertEngine, unix_webhook
+
+logging.basicConfig(level=logging.INFO)
+
+def main():
+    try:
+        bus = BusWriter()
+    except BusBusy as e:
+        logging.error("sysmon-bus: %s", e)   # yaşayan yazarın segmentini silme
+        return 1
+    m = Metrics(fan=FanIO())          # pages yok → bütün kaynaklar "görünür"
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    exporter = MetricsExporter.from_env(lambda: m.snap)
+    if exporter: exporter.start()
+    slog = SampleLog.from_env()     # PI5_SAMPLE_LOG
+    alerts = AlertEngine.from_env({"webhook": unix_webhook()})   # PI5_ALERT_RULES, PI5_ALERT_SOCK
+
+    logging.info("sysmon-bus: yayında (%s)", bus.shm.name)
+    try:
+        while not stop.is_set():
+            m.update()
+            bus.publish(m.snap)
+            if slog: slog.push(m.snap)
+            alerts.on_snapshot(m.snap)
+            sleep_until_due(m.sched, stop=stop)
+    finally:
+        bus.close()
+        if slog: slog.close()
+        logging.info("sysmon-bus: kapandı")
+
+if __name__ == "__main__":
+    raise SystemExit(main())
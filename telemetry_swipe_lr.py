@@ -8,11 +8,20 @@
 
 import os, sys, time, math, threading, socket, subprocess
 from collections import deque
-from PIL import Image, ImageDraw, ImageFont
-import psutil
 
 # --------- LCD SÜRÜCÜ ---------
+from lib.startup import STARTUP, lazy_import, splash
+from lib.fonts import font
 from lib.LCD_1inch69 import LCD_1inch69
+from lib.procfs import ProcSampler
+from lib.adaptive import AdaptiveSchedule, sleep_until_due
+from lib.snapshot import snapshot_class
+from lib.exporter import MetricsExporter
+from lib.layers import LAYERS, depends, inputs
+from lib.prefetch import Prefetcher
+from lib.renderproc import RenderWorker, RenderError
+from lib.transition import Swipe
+from lib.widgets import Tree, Label, Ring, Bar, Sparkline, Area, union
 
 # --------- TOUCH ----------
 try:
@@ -36,18 +45,11 @@ LIGHT = dict(
     GRID=(210,216,224), BARBG=(210,216,224), MUTED=(90,95,105)
 )
 
+psutil = lazy_import("psutil")   # ilk kullanımda (açılışı geciktirmesin)
+
 # --------- FONT ----------
-def load_font(sz):
-    for p in (
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSansCondensed.ttf",
-        "/usr/share/fonts/truetype/freefont/FreeSans.ttf"
-    ):
-        if os.path.exists(p):
-            return ImageFont.truetype(p, sz)
-    return ImageFont.load_default()
-
-F10, F12, F14, F16, F18, F22 = (load_font(s) for s in (10,12,14,16,18,22))
+# tembel (lib/fonts.py): dosya ilk çizimde okunur
+F10, F12, F14, F16, F18, F22 = (font(s) for s in (10,12,14,16,18,22))
 
 # --------- YARDIMCILAR ----------
 def clamp(v, lo, hi):
@@ -63,20 +65,10 @@ def pick_color(p, C):
     p = clamp(p,0,100)
     return C["OK"] if p < 70 else (C["WARN"] if p < 85 else C["BAD"])
 
-def bar(d, x,y,w,h,pct,C):
-    pct = clamp(pct,0,100)
-    d.rectangle([x,y,x+w,y+h], fill=C["BARBG"])
-    d.rectangle([x,y,x+int(w*pct/100.0),y+h], fill=pick_color(pct,C))
-
-def ring(d, cx, cy, r, pct, C, width=12):
-    pct = clamp(pct,0,100)/100.0
-    box=[cx-r, cy-r, cx+r, cy+r]
-    d.arc(box, 135, 405, width=width, fill=C["BARBG"])
-    d.arc(box, 135, 135+int(270*pct), width=width, fill=pick_color(pct*100, C))
-
-def header(d, C, W, title):
-    d.text((12,8), title, font=F22, fill=C["FG"])
-    d.text((W-12,8), time.strftime("%H:%M"), font=F16, fill=C["ACC1"], anchor="ra")
+# başlık: sabit başlık iskelette, saat dakikada bir değişen etiket
+def header(W, title):
+    return [Label("title", (12,8), F22, "FG", text=title),
+            Label("clock", (W-12,8), F16, "ACC1", bind=lambda m: time.strftime("%H:%M"), anchor="ra")]
 
 def vcgencmd(*args, default=""):
     try:
@@ -123,30 +115,72 @@ def ip_primary():
     except Exception: return "0.0.0.0"
 
 # --------- METRİKLER ----------
+# Çizicinin gördüğü donmuş görüntü (Metrics.snap)
+Snapshot = snapshot_class("Snapshot", (
+    "cpu", "ram", "temp", "disk_root", "net_up", "net_dn", "fan_rpm", "fan_pct",
+    "cores", "mem", "mem_total", "mem_used", "hcpu", "hram", "htmp",
+))
+
 class Metrics:
     def __init__(self, hist_len=120):
         self.cpu=0.0; self.ram=0.0; self.temp=0.0
         self.disk_root=0.0
         self.net_up=0.0; self.net_dn=0.0
         self.fan_rpm=0; self.fan_pct=0.0
+        self.cores=[]
+        self.mem_total=0; self.mem_used=0
 
         self.hcpu=deque(maxlen=hist_len)
         self.hram=deque(maxlen=hist_len)
         self.htmp=deque(maxlen=hist_len)
 
-    def update(self):
-        self.cpu = clamp(psutil.cpu_percent(interval=None),0,100)
-        self.ram = clamp(psutil.virtual_memory().percent,0,100)
-        self.temp = clamp(cpu_temp(),0,120)
-        self.disk_root = clamp(psutil.disk_usage("/").percent,0,100)
-
-        rpm,pct = fan_read()
-        if rpm is not None: self.fan_rpm = int(rpm)
-        if pct is not None: self.fan_pct = clamp(pct,0,100)
-
-        self.hcpu.append(self.cpu)
-        self.hram.append(self.ram)
-        self.htmp.append(self.temp)
+        # /proc tek geçiş okuyucu
+        self.proc=ProcSampler()
+        self.mem=self.proc.mem
+
+        # uyarlanır örnekleme (sayfa no = satır*3 + sütun)
+        self.hist_len=hist_len
+        self.sched=AdaptiveSchedule(base=0.5)
+        self.sched.add("core", tol=(2.0,0.5), max_interval=4.0, pages=(1,2))
+        self.sched.add("temp", tol=(0.5,), max_interval=5.0, pages=(0,))
+        self.sched.add("fan",  tol=(50.0,2.0), max_interval=8.0, pages=(0,))
+        self.sched.add("disk", tol=(0.2,), max_interval=30.0, pages=(3,))
+        self.snap=Snapshot.build(self, 0)
+
+    def _core(self):
+        if self.proc.ok:
+            p = self.proc.sample()
+            self.cpu = clamp(p.cpu,0,100)
+            self.cores = p.cores
+            self.ram = clamp(p.mem_percent(),0,100)
+            self.mem_total = self.mem["MemTotal"]; self.mem_used = p.mem_used()
+        else:
+            self.cpu = clamp(psutil.cpu_percent(interval=None),0,100)
+            vm = psutil.virtual_memory()
+            self.ram = clamp(vm.percent,0,100)
+            self.mem_total = vm.total; self.mem_used = vm.total - vm.available
+
+    def update(self, page=None):
+        now=time.monotonic(); S=self.sched
+        if S.due("core",now):
+            self._core(); S.done("core",(self.cpu,self.ram),now,page)
+        if S.due("temp",now):
+            self.temp = clamp(cpu_temp(),0,120); S.done("temp",(self.temp,),now,page)
+        if S.due("disk",now):
+            self.disk_root = clamp(psutil.disk_usage("/").percent,0,100); S.done("disk",(self.disk_root,),now,page)
+        if S.due("fan",now):
+            rpm,pct = fan_read()
+            if rpm is not None: self.fan_rpm = int(rpm)
+            if pct is not None: self.fan_pct = clamp(pct,0,100)
+            S.done("fan",(self.fan_rpm,self.fan_pct),now,page)
+
+        # geçmiş nominal çözünürlükte (atlanan tick'ler son değerle)
+        for _ in range(min(S.history_ticks(now), self.hist_len)):
+            self.hcpu.append(self.cpu)
+            self.hram.append(self.ram)
+            self.htmp.append(self.temp)
+        # tek referans ataması ile yayınla
+        self.snap=Snapshot.build(self, self.snap.version+1)
 
 # --------- DOKUNMATİK ----------
 class Touch:
@@ -189,57 +223,89 @@ class Touch:
             return "D" if dy>0 else "U"
 
 # --------- SAYFALAR ----------
-def page_thermal(img,d,m,C,W,H):
-    header(d,C,W,"THERMAL")
-    t_pct = clamp((m.temp-30)*(100/60),0,100)
-    ring(d, 120, 108, 64, t_pct, C, width=14)
-    d.text((120,108), f"{m.temp:.1f}°C", font=F18, fill=C["FG"], anchor="mm")
-    ring(d, 120, 196, 28, m.fan_pct if m.fan_pct else 0, C, width=10)
-    txt = "FAN " + (f"{m.fan_pct:.0f}%" if m.fan_pct else "N/A")
-    if m.fan_rpm: txt += f"  {m.fan_rpm} RPM"
-    d.text((120,196), txt, font=F12, fill=C["FG"], anchor="mm")
-
-def page_ram(img,d,m,C,W,H):
-    header(d,C,W,"RAM")
-    ring(d, 120, 110, 66, m.ram, C, width=14)
-    vm = psutil.virtual_memory()
-    used = (vm.total - vm.available)/1024/1024
-    d.text((120,110), f"{m.ram:.0f}%", font=F18, fill=C["FG"], anchor="mm")
-    d.text((120,136), f"{used:.0f}/{vm.total/1024/1024:.0f} MB", font=F12, fill=C["ACC1"], anchor="mm")
-
-def page_cpu(img,d,m,C,W,H):
-    header(d,C,W,"CPU")
-    ring(d, 120, 96, 56, m.cpu, C, width=12)
-    d.text((120,96), f"{m.cpu:.0f}%", font=F18, fill=C["FG"], anchor="mm")
-    la1,la5,la15 = os.getloadavg()
-    d.text((12,140), f"Load {la1:.2f} {la5:.2f} {la15:.2f}", font=F12, fill=C["FG"])
-    d.text((12,160), f"Freq {cpu_freq_mhz()} MHz", font=F12, fill=C["FG"])
-
-def page_disk(img,d,m,C,W,H):
-    header(d,C,W,"DISK")
-    d.text((12,44), f"/ usage {m.disk_root:.0f}%", font=F16, fill=C["FG"])
-    bar(d, 12,62, W-24,12, m.disk_root, C)
-
-def page_net(img,d,m,C,W,H):
-    header(d,C,W,"NETWORK")
-    ip = ip_primary()
-    d.text((12,44), f"IP: {ip}", font=F16, fill=C["FG"])
-
-def page_proc(img,d,m,C,W,H):
-    header(d,C,W,"PROCESSES")
-    procs=[]
-    for p in psutil.process_iter(attrs=["pid","name","cpu_percent","memory_percent"]):
-        try: procs.append(p.info)
-        except Exception: pass
-    procs.sort(key=lambda x:x.get("cpu_percent",0.0), reverse=True)
-    y=44
-    for row in procs[:6]:
-        name=str(row.get("name",""))[:14]
-        cpu=clamp(row.get("cpu_percent",0.0),0,100)
-        mem=clamp(row.get("memory_percent",0.0),0,100)
-        d.text((12,y), name, font=F12, fill=C["FG"])
-        d.text((W-12,y), f"{cpu:.0f}% {mem:.0f}%", font=F12, fill=C["ACC1"], anchor="ra")
+# page_x(W, H, m) → Tree (lib/widgets.py): widget'lar değer değişmedikçe yeniden çizilmez
+# @depends: okunan snapshot alanları + saat adımı (başlık saati → 60 sn); değişmedikçe kare atlanır
+@depends("temp", "fan_pct", "fan_rpm", "htmp", clock=60)
+def page_thermal(W,H,m):
+    def fan(m):
+        txt = "FAN " + (f"{m.fan_pct:.0f}%" if m.fan_pct else "N/A")
+        return txt + (f"  {m.fan_rpm} RPM" if m.fan_rpm else "")
+    return Tree(header(W,"THERMAL") + [
+        Ring("temp", (120,108), 64, lambda m: (m.temp-30)*(100/60), width=14, color=pick_color),
+        Label("temp_v", (120,108), F18, bind=lambda m: f"{m.temp:.1f}°C", anchor="mm"),
+        Ring("fan", (120,196), 28, lambda m: m.fan_pct or 0, width=10, color=pick_color),
+        Label("fan_v", (120,196), F12, bind=fan, anchor="mm"),
+        # son ~1 dk sıcaklık (kayan grafik: her örnekte yalnızca yeni parça çizilir)
+        Sparkline("htmp", (12,238, W-24,30), lambda m: m.htmp, color="ACC2", step=2),
+    ])
+
+@depends("ram", "mem_used", "mem_total", "mem", clock=60)
+def page_ram(W,H,m):
+    t = Tree(header(W,"RAM") + [
+        Ring("ram", (120,110), 66, lambda m: m.ram, width=14, color=pick_color),
+        Label("ram_v", (120,110), F18, bind=lambda m: f"{m.ram:.0f}%", anchor="mm"),
+        Label("ram_mb", (120,136), F12, "ACC1", anchor="mm",
+              bind=lambda m: f"{m.mem_used/1024/1024:.0f}/{m.mem_total/1024/1024:.0f} MB"),
+    ])
+    # bellek dökümü (meminfo)
+    y=196
+    for lbl,key in (("Cached","Cached"),("Buffers","Buffers"),("Shmem","Shmem"),("Swap free","SwapFree")):
+        t.add(Label(lbl, (12,y), F12, "MUTED", text=lbl))
+        t.add(Label(key, (W-12,y), F12, anchor="ra", bind=lambda m, k=key: f"{m.mem.get(k,0)/1024/1024:.0f} MB"))
         y+=16
+    return t
+
+@depends("cpu", "cores", clock=2)       # load / vcgencmd frekansı
+def page_cpu(W,H,m):
+    def load(m):
+        la1,la5,la15 = os.getloadavg()
+        return f"Load {la1:.2f} {la5:.2f} {la15:.2f}"
+    t = Tree(header(W,"CPU") + [
+        Ring("cpu", (120,96), 56, lambda m: m.cpu, width=12, color=pick_color),
+        Label("cpu_v", (120,96), F18, bind=lambda m: f"{m.cpu:.0f}%", anchor="mm"),
+        Label("load", (12,140), F12, bind=load),
+        Label("freq", (12,160), F12, bind=lambda m: f"Freq {cpu_freq_mhz()} MHz"),
+    ])
+    # çekirdek başına kullanım (çekirdek sayısı iskeleti belirler)
+    y=184
+    for i in range(len(m.cores[:8])):
+        t.add(Label(f"cpu{i}", (12,y), F10, "MUTED", text=f"cpu{i}"))
+        t.add(Bar(f"core{i}", (48,y+2, W-60,8), lambda m, i=i: m.cores[i] if i < len(m.cores) else 0, color=pick_color))
+        y+=14
+    t.layout = (len(m.cores[:8]),)
+    return t
+
+@depends("disk_root", clock=60)
+def page_disk(W,H,m):
+    return Tree(header(W,"DISK") + [
+        Label("usage", (12,44), F16, bind=lambda m: f"/ usage {m.disk_root:.0f}%"),
+        Bar("disk", (12,62, W-24,12), lambda m: m.disk_root, color=pick_color),
+    ])
+
+@depends(clock=60)
+def page_net(W,H,m):
+    return Tree(header(W,"NETWORK") + [
+        Label("ip", (12,44), F16, bind=lambda m: f"IP: {ip_primary()}"),
+    ])
+
+@depends(clock=2)                      # süreç listesi
+def page_proc(W,H,m):
+    def top(m):
+        procs=[]
+        for p in psutil.process_iter(attrs=["pid","name","cpu_percent","memory_percent"]):
+            try: procs.append(p.info)
+            except Exception: pass
+        procs.sort(key=lambda x:x.get("cpu_percent",0.0), reverse=True)
+        return tuple((str(r.get("name",""))[:14],
+                      f"{clamp(r.get('cpu_percent',0.0),0,100):.0f}% {clamp(r.get('memory_percent',0.0),0,100):.0f}%")
+                     for r in procs[:6])
+    def draw(d, C, rows):
+        y=44
+        for name, val in rows:
+            d.text((12,y), name, font=F12, fill=C["FG"])
+            d.text((W-12,y), val, font=F12, fill=C["ACC1"], anchor="ra")
+            y+=16
+    return Tree(header(W,"PROCESSES") + [Area("procs", (0,40, W,44+6*16+4), top, draw)])
 
 PAGES = [
     [page_thermal, page_ram, page_cpu],
@@ -251,7 +317,10 @@ def ease_out_cubic(t): return 1 - (1 - t) ** 3
 
 class App:
     def __init__(self):
+        STARTUP.mark("imports")
         self.disp=LCD_1inch69(); self.disp.Init()
+        STARTUP.mark("lcd")
+        splash(self.disp, DARK["BG"], DARK["FG"], "Pi 5 Telemetry")
         try: self.disp.bl_DutyCycle(100)
         except Exception: pass
         self.W,self.H=self.disp.width,self.disp.height
@@ -263,38 +332,129 @@ class App:
         self.row=0; self.col=0
         self.t_row=0; self.t_col=0
         self.anim=1.0; self.move_dir="X"
+        self.swipe=None # geçiş şeridi (lib/transition.py)
+        self.prefetch=Prefetcher(self._frame565, self._key)
+        self.trees={}   # (satır, sütun) → Tree
+        self.shown=None # ekrandaki karenin girdi anahtarı (loop)
+        self.full=True  # çizim süreci modu: ekran bilinmiyor → sonraki iş tam kare
+
+        # opsiyonel çizim süreci (PI5_RENDER_WORKER=1); fork, thread'ler başlamadan
+        self.worker=RenderWorker.from_env(self._render_job, (self.W,self.H))
 
+        self.wake=threading.Event()
         threading.Thread(target=self._metrics_loop, daemon=True).start()
 
+        # opsiyonel /metrics (PI5_METRICS_PORT)
+        self.exporter=MetricsExporter.from_env(lambda: self.metrics.snap)
+        if self.exporter: self.exporter.start()
+        STARTUP.mark("setup")
+
+    def _page(self):
+        return self.row*len(PAGES[0]) + self.col
+
     def _metrics_loop(self):
         while True:
-            self.metrics.update()
-            time.sleep(0.5)
+            self.metrics.update(page=self._page())
+            self.wake.clear()
+            sleep_until_due(self.metrics.sched, stop=self.wake)
 
-    def _render(self, r, c):
-        img=Image.new("RGB",(self.W,self.H), self.C["BG"])
-        d=ImageDraw.Draw(img)
+    def _chrome(self, s):
         for gy in range(0,self.H,28):
-            d.line((0,gy,self.W,gy), fill=self.C["GRID"])
-        d.text((self.W-16,8), "◑", font=F12, fill=self.C["MUTED"], anchor="ra")
-        PAGES[r][c](img,d,self.metrics,self.C,self.W,self.H)
-        return img
+            s.line((0,gy,self.W,gy), fill=self.C["GRID"])
+        s.text((self.W-16,8), "◑", font=F12, fill=self.C["MUTED"], anchor="ra")
+
+    def _tree(self, r, c, snap):
+        page=PAGES[r][c]; t=self.trees.get((r,c))
+        if t is None or (page is page_cpu and t.layout != (len(snap.cores[:8]),)):
+            t=self.trees[(r,c)]=page(self.W,self.H,snap)
+        return t
+
+    def _render(self, r, c, snap=None):
+        """(img, hasar): img sayfanın kalıcı karesi (yalnızca okunur), hasar değişen kutular."""
+        if snap is None: snap=self.metrics.snap
+        t=self._tree(r,c,snap)
+        def chrome(s, C, W, H):
+            self._chrome(s); t.chrome(s, C)
+        base=LAYERS.get((r,c), self.C, (self.W,self.H), chrome, layout=t.layout)
+        return t.render(snap, self.C, base)
 
     def _toggle_theme(self):
         self.theme_dark=not self.theme_dark
         self.C = DARK if self.theme_dark else LIGHT
 
-    def _switch(self, move):
+    def _target(self, move):
         R, Cn = len(PAGES), len(PAGES[0])
         r, c = self.row, self.col
         if move=="L": c=(c-1)%Cn
         elif move=="R": c=(c+1)%Cn
         elif move=="U": r=(r-1)%R
         elif move=="D": r=(r+1)%R
-        else: return
-        self.t_row,self.t_col=r,c
+        else: return None
+        return r,c
+
+    def _switch(self, move):
+        rc=self._target(move)
+        if rc is None: return
+        self.t_row,self.t_col=rc
         self.move_dir=move
-        self.anim=0.0
+        self.anim=0.0; self.swipe=None
+
+    # ---- komşu sayfa ön çizimi (lib/prefetch.py) ----
+    def _key(self, rc):
+        """Sayfanın girdi anahtarı: tema + @depends alanları/saat adımı."""
+        return (rc, id(self.C)) + inputs(PAGES[rc[0]][rc[1]], self.metrics.snap)
+
+    def _frame565(self, rc):
+        """Sayfanın tam RGB565 karesi (geçiş, ön çizim); çizim süreci varsa orada çizilir."""
+        if self.worker:
+            try:
+                return self.worker.call(("frame", rc, self.theme_dark, self.metrics.snap))[0]
+            except RenderError:
+                self._drop_worker()
+        img,_=self._render(*rc)
+        return self.disp.rgb565(img)
+
+    def _neighbours(self):
+        here=(self.row,self.col)
+        return list(dict.fromkeys(rc for rc in map(self._target, "LRUD") if rc != here))
+
+    # ---- çizim süreci (lib/renderproc.py) ----
+    def _render_job(self, job):
+        """Çizim sürecinde çalışır: iş → (img, gönderilecek kutu)."""
+        kind, rc, dark, snap = job
+        self.C = DARK if dark else LIGHT
+        img,damage=self._render(*rc, snap=snap)
+        return img, ((0,0,self.W,self.H) if kind=="frame" else union(damage))
+
+    def _worker_tick(self, key):
+        """Biten kareyi gönder; girdiler değiştiyse sonrakini iste (aktarımla paralel çizilir).
+        Çizici boştaysa False (ön çizim sırası)."""
+        w=self.worker
+        try:
+            done=w.poll()
+            if not w.busy and key != self.shown:
+                w.submit(("frame" if self.full else "page", (self.row,self.col), self.theme_dark, self.metrics.snap))
+                self.shown=key; self.full=False
+        except RenderError:
+            self._drop_worker()
+            return False
+        if done is not None:
+            pix,box=done
+            if box: self.disp.ShowRGB565(pix, box)
+            self._started()
+        return done is not None or w.busy
+
+    def _drop_worker(self):
+        """Çizici öldü/hata verdi: süreç içi çizime dön (yerel ağaçlar ekranı bilmiyor → tam kare)."""
+        self.worker.close(); self.worker=None
+        for t in self.trees.values(): t.invalidate()
+        self.shown=None
+
+    def _started(self):
+        """İlk kare: açılış süre dökümünü bir kez yaz (lib/startup.py)."""
+        if STARTUP.at("first_frame") is None:
+            STARTUP.mark("first_frame")
+            print(STARTUP.report(), file=sys.stderr, flush=True)
 
     def _handle_touch(self):
         g = self.touch.read_gesture(self.W,self.H)
@@ -330,27 +490,41 @@ class App:
             if self.touch.available: self._handle_touch()
 
             if self.anim<1.0:
+                if self.swipe is None:
+                    # iki sayfa geçiş başında bir kez çizilir (hedef çoğunlukla ön çizimden hazır);
+                    # ara kareler RGB565 şeridinden dilim
+                    cur=self._frame565((self.row,self.col))
+                    nxt=self.prefetch.get((self.t_row,self.t_col))
+                    if nxt is None: nxt=self._frame565((self.t_row,self.t_col))
+                    self.swipe=Swipe(cur, nxt, self.move_dir)
                 self.anim=min(1.0, self.anim+0.12)
-                t=ease_out_cubic(self.anim)
-                cur=self._render(self.row,self.col)
-                nxt=self._render(self.t_row,self.t_col)
-                frame=Image.new("RGB",(self.W,self.H), self.C["BG"])
-                if self.move_dir in ("L","R"):
-                    dirn = -1 if self.move_dir=="L" else 1
-                    off=int((-dirn*self.W)*t)
-                    frame.paste(cur,(off,0)); frame.paste(nxt,(off+dirn*self.W,0))
-                else:
-                    dirn = -1 if self.move_dir=="U" else 1
-                    off=int((-dirn*self.H)*t)
-                    frame.paste(cur,(0,off)); frame.paste(nxt,(0,off+dirn*self.H))
-                self.disp.ShowImage(frame)
+                self.disp.ShowRGB565(self.swipe.frame(ease_out_cubic(self.anim)))
+                self.shown=None; self.full=True
                 if self.anim>=1.0:
                     self.row,self.col=self.t_row,self.t_col
+                    self.swipe=None
+                    self.metrics.sched.kick(pages=(self._page(),)); self.wake.set()
             else:
-                self.disp.ShowImage(self._render(self.row,self.col))
+                # girdiler (bildirilen alanlar, saat adımı, tema) değişmediyse çizim/aktarım yok
+                key=self._key((self.row,self.col))
+                if self.worker and self._worker_tick(key):
+                    continue
+                if key == self.shown:
+                    # boş kare: komşulardan bayat olanı çiz
+                    self.prefetch.want(self._neighbours()); self.prefetch.step()
+                    continue
+                self.shown=key
+                img,damage=self._render(self.row,self.col)
+                box=union(damage)
+                if box == (0,0,self.W,self.H): self.disp.ShowImage(img)
+                elif box: self.disp.ShowImage_Rect(img, box)
+                self._started()
 
 if __name__=="__main__":
+    app=App()
     try:
-        App().loop()
+        app.loop()
     except KeyboardInterrupt:
         pass
+    finally:
+        if app.worker: app.worker.close()
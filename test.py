@@ -6,12 +6,28 @@
 # Temperature: Fan AUTO eşiği, durum, RPM, iki satırlı büyük butonlar (AUTO | ON/OFF) ve (− | +)
 # RGB: WS2812 bulunursa 12 renk düğmesi (rpi_ws281x ile), bulunmazsa hiç gösterilmez.
 
-import os, sys, time, math, threading, subprocess, logging
-from collections import deque
-from PIL import Image, ImageDraw, ImageFont
+import os, sys, time, math, threading, logging
+from collections import namedtuple
 
 sys.path.append("..")
+from lib.startup import STARTUP, lazy_import, splash
+from lib.fonts import font, PATHS
 from lib import LCD_1inch69, Touch_1inch69
+from lib.overhead import OV
+from lib.adaptive import sleep_until_due
+from lib.metrics import Metrics
+from lib.fanio import FanIO
+from lib.exporter import MetricsExporter
+from lib.samplelog import SampleLog
+from lib.fanipc import FanClient
+from lib.fanctl import StallDetector
+from lib.alerts import AlertEngine, backlight_flash, rgb_color, unix_webhook
+from lib.textcache import CachedDraw
+from lib.layers import LAYERS, NULL, depends, inputs
+from lib import chart
+from lib.prefetch import Prefetcher
+from lib.framebudget import FB, FrameSocket, draw_overlay
+from lib.widgets import Tree, Label, Ring, Button, ColorSwatch, union
 
 # ---------- RPi & Touch ----------
 RST, DC, BL = 27, 25, 18
@@ -49,18 +65,9 @@ LIGHT = dict(
     SURFACE=(255,255,255), SURFACE2=(248,249,251)
 )
 
-def load_font(sz):
-    for p in ("../Font/Font01.ttf",
-              "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-              "/usr/share/fonts/truetype/dejavu/DejaVuSansCondensed.ttf",
-              "/usr/share/fonts/truetype/freefont/FreeSans.ttf"):
-        if os.path.exists(p):
-            try: return ImageFont.truetype(p, sz)
-            except Exception: pass
-    from PIL import ImageFont as IF
-    return IF.load_default()
-
-F12,F14,F16,F18,F20,F22,F24,F26,F28,F30,F32,F36 = (load_font(s) for s in (12,14,16,18,20,22,24,26,28,30,32,36))
+# tembel (lib/fonts.py): dosya ilk çizimde okunur
+FONT_PATHS = ("../Font/Font01.ttf",) + PATHS
+F12,F14,F16,F18,F20,F22,F24,F26,F28,F30,F32,F36 = (font(s, FONT_PATHS) for s in (12,14,16,18,20,22,24,26,28,30,32,36))
 
 def clamp(v, lo, hi):
     try:
@@ -82,194 +89,45 @@ def chip(d, x, y, text, bg, fg, font=F18, pad=8, h=28):
     d.text((x+pad, y + (h-font.size)//2 - 1), text, font=font, fill=fg)
     return w, h
 
-def ring(d, cx, cy, r, pct, track, color, width=14):
+# s verilirse iz/çerçeve statik katmana (lib/layers.py), değer d'ye çizilir
+def ring(d, cx, cy, r, pct, track, color, width=14, s=None):
     pct = clamp(pct,0,100)/100.0
-    d.arc((cx-r, cy-r, cx+r, cy+r), start=135, end=405, width=width, fill=track)
+    (s or d).arc((cx-r, cy-r, cx+r, cy+r), start=135, end=405, width=width, fill=track)
     d.arc((cx-r, cy-r, cx+r, cy+r), start=135, end=135+int(270*pct), width=width, fill=color)
 
-def bar(d, x,y,w,h,pct,color,track):
+def bar(d, x,y,w,h,pct,color,track, s=None):
     pct = clamp(pct,0,100)
-    d.rounded_rectangle([x,y,x+w,y+h], radius=h//2, fill=track)
+    (s or d).rounded_rectangle([x,y,x+w,y+h], radius=h//2, fill=track)
     d.rounded_rectangle([x,y,x+int(w*pct/100.0),y+h], radius=h//2, fill=color)
 
-def sparkline(d, x,y,w,h,series,color,grid_col):
-    d.rectangle((x,y,x+w,y+h), outline=grid_col, width=1)
-    vals=[]
-    for v in list(series):
-        try:
-            vv=float(v)
-            if math.isfinite(vv): vals.append(vv)
-        except: pass
-    if len(vals) < 2:
-        py = y + h//2
-        d.line((x,py,x+w,py), fill=color, width=3)
-        return
-    mn, mx = min(vals), max(vals)
-    rng = max(1e-6, mx-mn)
-    prev=None
-    for i,v in enumerate(vals):
-        t=(v-mn)/rng
-        px = x + int(i*(w-1)/max(1,len(vals)-1))
-        py = y + h - 1 - int(t*(h-2))
-        if prev: d.line((prev[0],prev[1],px,py), fill=color, width=3)
-        prev=(px,py)
+def core_bars(d, x,y,w,h,cores,color,track, s=None):
+    # çekirdek başına dikey mini bar
+    n = len(cores)
+    if not n: return
+    gap = 3
+    bw = max(2, (w - (n-1)*gap)//n)
+    for i,c in enumerate(cores):
+        bx = x + i*(bw+gap)
+        (s or d).rectangle((bx, y, bx+bw, y+h), fill=track)
+        top = y + h - int(h*clamp(c,0,100)/100.0)
+        d.rectangle((bx, top, bx+bw, y+h), fill=color)
+
+def alert_banner(img, text, C):
+    """Aktif uyarı şeridi (üstte); metin AlertEngine tarafından hazırlanır."""
+    d = CachedDraw(img)
+    d.rectangle((0, 0, img.width, 30), fill=C["BAD"])
+    d.text((10, 15 - F18.size//2 - 1), text, font=F18, fill=(255,255,255))
+    return img
+
+def sparkline(d, x,y,w,h,series,color,grid_col, s=None):
+    (s or d).rectangle((x,y,x+w,y+h), outline=grid_col, width=1)
+    # series: snapshot'taki array('d'); NumPy ile ölçeklenip tek polyline çağrısı (lib/chart.py)
+    chart.sparkline(d, x, y, w, h, series, color)
 
 # ---------- Metrikler ----------
-try:
-    import psutil
-except Exception:
-    psutil = None
-
-class Metrics:
-    def __init__(self, hist_len=90):
-        self.cpu=self.ram=self.disk=self.temp=0.0
-        self.mem_total=0; self.mem_used=0
-        self.disk_total=0; self.disk_used=0
-        self.up=self.dn=0.0
-        self.hcpu=deque(maxlen=hist_len)
-        self.hram=deque(maxlen=hist_len)
-        self.htmp=deque(maxlen=hist_len)
-        self.hup=deque(maxlen=hist_len)
-        self.hdn=deque(maxlen=hist_len)
-        self.last_net = psutil.net_io_counters() if psutil else None
-
-    def _temp(self):
-        try:
-            out = subprocess.check_output(["vcgencmd","measure_temp"]).decode()
-            return float(out.split("=")[1].split("'")[0])
-        except Exception:
-            try:
-                return int(open("/sys/class/thermal/thermal_zone0/temp").read())/1000.0
-            except Exception:
-                return 0.0
+psutil = lazy_import("psutil")   # ilk kullanımda (açılışı geciktirmesin); yoksa bool(psutil) False
 
-    def _mem_totals(self):
-        if psutil:
-            vm = psutil.virtual_memory()
-            self.mem_total = int(vm.total)
-            self.mem_used  = int(vm.total - vm.available)
-            self.ram       = clamp(vm.percent, 0, 100)
-        else:
-            try:
-                meminfo = {}
-                with open("/proc/meminfo") as f:
-                    for line in f:
-                        k,v,*_ = line.split()
-                        meminfo[k.rstrip(":")] = int(v)*1024
-                total = meminfo.get("MemTotal",0)
-                free  = meminfo.get("MemAvailable",0)
-                used  = max(0,total-free)
-                self.mem_total = total; self.mem_used = used
-                self.ram = 100.0*used/max(1,total)
-            except Exception:
-                pass
-
-    def _disk_totals(self):
-        try:
-            if psutil:
-                u = psutil.disk_usage("/")
-                self.disk       = clamp(u.percent, 0, 100)
-                self.disk_total = int(u.total); self.disk_used = int(u.used)
-            else:
-                st = os.statvfs("/")
-                total = st.f_blocks*st.f_frsize
-                free  = st.f_bavail*st.f_frsize
-                used  = total-free
-                self.disk_total = int(total); self.disk_used = int(used)
-                self.disk = 100.0*used/max(1,total)
-        except Exception:
-            pass
-
-    def update(self):
-        if psutil:
-            try: self.cpu = clamp(psutil.cpu_percent(interval=None), 0, 100)
-            except Exception: pass
-        else:
-            try: self.cpu = clamp(os.getloadavg()[0]*25.0, 0, 100)
-            except Exception: pass
-        self._mem_totals()
-        self._disk_totals()
-        self.temp = clamp(self._temp(), 0, 120)
-        if psutil:
-            try:
-                now = psutil.net_io_counters()
-                if self.last_net:
-                    self.up = max(0.0, (now.bytes_sent - self.last_net.bytes_sent)/1024.0)
-                    self.dn = max(0.0, (now.bytes_recv - self.last_net.bytes_recv)/1024.0)
-                self.last_net = now
-            except Exception:
-                pass
-        self.hcpu.append(self.cpu); self.hram.append(self.ram); self.htmp.append(self.temp)
-        self.hup.append(self.up);   self.hdn.append(self.dn)
-
-# ---------- Fan IO ----------
-class FanIO:
-    def __init__(self):
-        self.pwm_path = None
-        self.pwm_enable = None
-        self.fan_input = None   # RPM
-        self.cool_cur = None
-        self.cool_max = None
-        self.percent = 0.0
-        self.state = 0
-        self._discover()
-
-    def _ls(self, root):
-        try: return [os.path.join(root, x) for x in os.listdir(root)]
-        except Exception: return []
-
-    def _discover(self):
-        for hw in self._ls("/sys/class/hwmon"):
-            for node in self._ls(hw):
-                for f in self._ls(node):
-                    base = os.path.basename(f)
-                    if base.startswith("fan") and base.endswith("_input"):
-                        self.fan_input = f
-                p = os.path.join(node, "pwm1")
-                if os.path.exists(p):
-                    self.pwm_path = p
-                    e = os.path.join(node, "pwm1_enable")
-                    if os.path.exists(e): self.pwm_enable = e
-        for cd in self._ls("/sys/class/thermal"):
-            if not os.path.basename(cd).startswith("cooling_device"):
-                continue
-            cur = os.path.join(cd, "cur_state"); mx = os.path.join(cd, "max_state")
-            if os.path.exists(cur) and os.path.exists(mx):
-                self.cool_cur, self.cool_max = cur, mx
-
-    def read_rpm(self):
-        try:
-            if self.fan_input:
-                v = int(open(self.fan_input).read().strip() or "0")
-                return max(0, v)
-        except Exception:
-            pass
-        return 0
-
-    def set_percent(self, pct):
-        pct = float(clamp(pct, 0, 100))
-        ok = False
-        try:
-            if self.pwm_path:
-                if self.pwm_enable:
-                    open(self.pwm_enable, "w").write("1\n")
-                val = int(255 * pct/100.0)
-                open(self.pwm_path, "w").write(str(val) + "\n")
-                ok = True
-            elif self.cool_cur and self.cool_max:
-                mx = int(open(self.cool_max).read().strip() or "0")
-                target = int(mx if pct > 0 else 0)
-                open(self.cool_cur, "w").write(str(target) + "\n")
-                ok = True
-        except Exception:
-            ok = False
-        if ok:
-            self.percent = pct
-            self.state = 1 if pct > 0 else 0
-        return ok
-
-    def toggle(self):
-        return self.set_percent(0 if self.state else 100)
+# Metrics / FanIO: lib/metrics.py, lib/fanio.py (sysmon-bus.py ile ortak)
 
 # ---------- RGB Controller (opsiyonel) ----------
 class RGBController:
@@ -306,96 +164,122 @@ class RGBController:
             return False
 
 # ---------- SYSTEM (scrollable canvas) ----------
-def render_system_canvas(W, H, m, C):
-    y = 0
-    content_h_min = H + 1
-    img = Image.new("RGB", (W, max(content_h_min, 1100)), C["BG"])
-    d = ImageDraw.Draw(img)
+def system_height(W, H, m, C, nics):
+    """Yerleşimden: çizmeyen geçiş (s=d=NULL) kartların bittiği y'yi döndürür."""
+    return max(H + 1, draw_system(NULL, NULL, W, m, C, nics))
 
+@depends("cpu", "cores", "hcpu", "ram", "mem_used", "mem_total", "disk", "disk_used", "disk_total",
+         "disk_rd", "disk_wr", "up", "dn", "nic_rates", "intr_s", "ctxt_s", clock=2)   # süreçler, load
+def render_system_canvas(W, H, m, C):
+    nics = list(m.nic_rates.items())[:4]
+    h = system_height(W, H, m, C, nics)
+    img = LAYERS.compose("system", C, (W, h), lambda s, d: draw_system(s, d, W, m, C, nics),
+                         layout=(len(nics), len(m.cores[:8])))
+    return img, h
+
+def draw_system(s, d, W, m, C, nics):
+    """s: statik iskelet (kartlar, başlıklar, izler), d: değerler. Döner: canvas yüksekliği."""
     # App bar
-    rounded_fill(d, (8,6, W-8, 78), radius=14, fill=C["SURFACE"])
-    d.text((18, 20), "System", font=F32, fill=C["FG"])
+    rounded_fill(s, (8,6, W-8, 78), radius=14, fill=C["SURFACE"])
+    s.text((18, 20), "System", font=F32, fill=C["FG"])
     hhmm = time.strftime("%H:%M"); day = time.strftime("%a %d %b")
     d.text((W-12, 16), hhmm, font=F30, fill=C["TEAL"], anchor="ra")
     d.text((W-98, 48), day,  font=F16, fill=(200,205,210))
     y = 90
 
     # CPU
-    rounded_fill(d, (8,y, W-8, y+128), radius=14, fill=C["SURFACE2"])
-    chip(d, 16, y+10, "CPU", C["VIOLET"], (255,255,255))
-    ring(d, 58, y+70, 30, m.cpu, track=C["BARBG"], color=C["VIOLET"], width=14)
+    rounded_fill(s, (8,y, W-8, y+128), radius=14, fill=C["SURFACE2"])
+    chip(s, 16, y+10, "CPU", C["VIOLET"], (255,255,255))
+    ring(d, 58, y+70, 30, m.cpu, track=C["BARBG"], color=C["VIOLET"], width=14, s=s)
     d.text((100, y+36), f"{m.cpu:0.0f}%", font=F30, fill=C["FG"])
-    sparkline(d, 100, y+70, W-100-16, 46, m.hcpu, C["VIOLET"], C["GRID"])
+    core_bars(d, 172, y+38, W-172-16, 26, m.cores[:8], C["VIOLET"], C["BARBG"], s=s)
+    sparkline(d, 100, y+70, W-100-16, 46, m.hcpu, C["VIOLET"], C["GRID"], s=s)
     y += 140
 
     # RAM
-    rounded_fill(d, (8,y, W-8, y+116), radius=14, fill=C["SURFACE2"])
-    chip(d, 16, y+10, "RAM", C["TEAL"], (0,0,0))
+    rounded_fill(s, (8,y, W-8, y+116), radius=14, fill=C["SURFACE2"])
+    chip(s, 16, y+10, "RAM", C["TEAL"], (0,0,0))
     used_gb  = bytes_gb(m.mem_used); total_gb = bytes_gb(m.mem_total)
     d.text((16, y+42), f"{m.ram:0.0f}%", font=F30, fill=C["FG"])
     d.text((16, y+72), f"{used_gb:.1f} / {total_gb:.1f} GB", font=F18, fill=(200,205,210))
-    bar(d, 16, y+92, W-16-16, 14, m.ram, color=C["TEAL"], track=C["BARBG"])
+    bar(d, 16, y+92, W-16-16, 14, m.ram, color=C["TEAL"], track=C["BARBG"], s=s)
     y += 128
 
     # Storage
-    rounded_fill(d, (8,y, W-8, y+118), radius=14, fill=C["SURFACE2"])
-    chip(d, 16, y+10, "Storage", C["AMBER"], (0,0,0))
+    rounded_fill(s, (8,y, W-8, y+118), radius=14, fill=C["SURFACE2"])
+    chip(s, 16, y+10, "Storage", C["AMBER"], (0,0,0))
     du = (bytes_gb(m.disk_used), bytes_gb(m.disk_total))
     d.text((16, y+42), f"{m.disk:0.0f}%", font=F30, fill=C["FG"])
     d.text((16, y+72), f"{du[0]:.1f} / {du[1]:.1f} GB", font=F18, fill=(200,205,210))
-    bar(d, 16, y+92, W-16-16, 14, m.disk, color=C["LIME"], track=C["BARBG"])
+    bar(d, 16, y+92, W-16-16, 14, m.disk, color=C["LIME"], track=C["BARBG"], s=s)
     y += 130
 
-    # Network
-    rounded_fill(d, (8,y, W-8, y+100), radius=14, fill=C["SURFACE2"])
-    chip(d, 16, y+10, "Network", C["TEAL"], (0,0,0))
+    # Network (toplam + arayüz başına)
+    net_h = 100 + 22*len(nics)
+    rounded_fill(s, (8,y, W-8, y+net_h), radius=14, fill=C["SURFACE2"])
+    chip(s, 16, y+10, "Network", C["TEAL"], (0,0,0))
     d.text((16, y+48), f"Up {m.up:0.0f} KB/s", font=F22, fill=C["TEAL"])
     d.text((16, y+74), f"Down {m.dn:0.0f} KB/s", font=F22, fill=C["ORANGE"])
+    ny = y+102
+    for name,(rx,tx) in nics:
+        d.text((16, ny), name[:8], font=F16, fill=(200,205,210))
+        d.text((W-18, ny), f"↓{rx:0.0f} ↑{tx:0.0f} KB/s", font=F16, fill=C["FG"], anchor="ra")
+        ny += 22
+    y += net_h + 12
+
+    # Disk I/O + kesme/bağlam değişimi hızları
+    rounded_fill(s, (8,y, W-8, y+100), radius=14, fill=C["SURFACE2"])
+    chip(s, 16, y+10, "I/O", C["AMBER"], (0,0,0))
+    d.text((16, y+46), f"R {m.disk_rd:0.0f}  W {m.disk_wr:0.0f} KB/s", font=F20, fill=C["FG"])
+    d.text((16, y+72), f"IRQ {m.intr_s:0.0f}/s  CS {m.ctxt_s:0.0f}/s", font=F18, fill=(200,205,210))
     y += 112
 
     # System Info
-    rounded_fill(d, (8,y, W-8, y+160), radius=14, fill=C["SURFACE2"])
-    chip(d, 16, y+10, "System Info", C["LIME"], (0,0,0))
-    try: boot = psutil.boot_time() if psutil else time.time()-1; upt = time.time()-boot
-    except Exception: upt = 0
-    dds, rr = divmod(int(upt), 86400); hhs, rr = divmod(rr, 3600); mms,_ = divmod(rr, 60)
-    try: ip = subprocess.check_output(["hostname","-I"]).decode().strip().split()[0]
-    except Exception: ip = "0.0.0.0"
-    try:
-        arm = subprocess.check_output(["vcgencmd","measure_clock","arm"]).decode().split("=")[1]
-        arm = int(arm)/1_000_000
-    except Exception:
-        try: cf = psutil.cpu_freq(); arm = cf.current if cf else 0
-        except Exception: arm = 0
-    try: la1,la5,la15 = os.getloadavg()
-    except Exception: la1=la5=la15=0.0
+    rounded_fill(s, (8,y, W-8, y+160), radius=14, fill=C["SURFACE2"])
+    chip(s, 16, y+10, "System Info", C["LIME"], (0,0,0))
     label_x, value_x = 16, 120
     line_y, line_h  = y+46, 28
-    def row(lbl, val):
-        nonlocal line_y
-        d.text((label_x, line_y), lbl, font=F20, fill=(200,205,210))
-        d.text((value_x, line_y), val, font=F20, fill=C["FG"])
+    for lbl in ("Uptime", "IP", "CPU Hz", "Load"):
+        s.text((label_x, line_y), lbl, font=F20, fill=(200,205,210))
         line_y += line_h
-    row("Uptime", f"{dds}g {hhs}s {mms}d")
-    row("IP",     ip)
-    row("CPU Hz", f"{arm:0.0f} MHz")
-    row("Load",   f"{la1:.2f} {la5:.2f} {la15:.2f}")
+    if d is not NULL:
+        try: boot = psutil.boot_time() if psutil else time.time()-1; upt = time.time()-boot
+        except Exception: upt = 0
+        dds, rr = divmod(int(upt), 86400); hhs, rr = divmod(rr, 3600); mms,_ = divmod(rr, 60)
+        try: ip = OV.sh("hostname","-I").decode().strip().split()[0]
+        except Exception: ip = "0.0.0.0"
+        try:
+            arm = OV.sh("vcgencmd","measure_clock","arm").decode().split("=")[1]
+            arm = int(arm)/1_000_000
+        except Exception:
+            try: cf = psutil.cpu_freq(); arm = cf.current if cf else 0
+            except Exception: arm = 0
+        try: la1,la5,la15 = os.getloadavg()
+        except Exception: la1=la5=la15=0.0
+        line_y = y+46
+        for val in (f"{dds}g {hhs}s {mms}d", ip, f"{arm:0.0f} MHz", f"{la1:.2f} {la5:.2f} {la15:.2f}"):
+            d.text((value_x, line_y), val, font=F20, fill=C["FG"])
+            line_y += line_h
     y += 172
 
     # Top Processes
-    rounded_fill(d, (8,y, W-8, y+174), radius=14, fill=C["SURFACE2"])
-    chip(d, 16, y+10, "Top Processes", C["VIOLET"], (255,255,255))
+    rounded_fill(s, (8,y, W-8, y+174), radius=14, fill=C["SURFACE2"])
+    chip(s, 16, y+10, "Top Processes", C["VIOLET"], (255,255,255))
     yy = y+50
+    bottom = y + 186 + 10
+    if d is NULL:
+        return bottom
     try:
         procs=[]
         if psutil:
-            for p in psutil.process_iter(attrs=["pid","name","cpu_percent","memory_percent"]):
-                try:
-                    info = p.info
-                    _ = p.cpu_percent(interval=0.0)
-                    procs.append(info)
-                except Exception:
-                    pass
+            with OV.measure("process_iter"):
+                for p in psutil.process_iter(attrs=["pid","name","cpu_percent","memory_percent"]):
+                    try:
+                        info = p.info
+                        _ = p.cpu_percent(interval=0.0)
+                        procs.append(info)
+                    except Exception:
+                        pass
             if any((x.get("cpu_percent",0.0) or 0) > 0 for x in procs):
                 procs.sort(key=lambda x: x.get("cpu_percent",0.0), reverse=True)
             else:
@@ -411,123 +295,109 @@ def render_system_canvas(W, H, m, C):
             d.text((16,yy), "psutil yok", font=F20, fill=C["FG"])
     except Exception:
         pass
-    y += 186
-
-    content_h = max(y+10, content_h_min)
-    if content_h > img.height:
-        new_img = Image.new("RGB", (W, content_h), C["BG"])
-        new_img.paste(img, (0,0))
-        img = new_img
-
-    return img, content_h
+    return bottom
 
 # ---------- Temperature (scrollable canvas; iki satır büyük buton; opsiyonel renk paleti) ----------
-def render_temperature_canvas(W, H, m, C, fan: 'FanIO', auto_mode, auto_thr, manual_pct, rgb: 'RGBController'):
-    """
-    Döner: img, content_h, rects (canvas koordinatları)
-    rects: {"AUTO":..., "TOGGLE":..., "MINUS":..., "PLUS":..., "COLOR_0"...}
-    """
-    y = 0
-    img = Image.new("RGB", (W, max(H+1, 900)), C["BG"])
-    d = ImageDraw.Draw(img)
-
-    # Başlık
-    rounded_fill(d, (8,6, W-8, 56), radius=14, fill=C["SURFACE"])
-    d.text((16, 16), "Temperature", font=F28, fill=C["FG"])
-    y = 70
-
-    # Büyük halka ve değer
-    rounded_fill(d, (8,y, W-8, y+200), radius=14, fill=C["SURFACE2"])
-    t_pct = clamp((m.temp-30)*(100.0/60.0),0,100)
-    ring(d, 120, y+100, 78, t_pct, track=C["BARBG"], color=C["ORANGE"], width=16)
-    d.text((120, y+100), f"{m.temp:0.1f}°C", font=F30, fill=C["FG"], anchor="mm")
-    y += 212
-
-    # Auto eşik bilgisi
-    rounded_fill(d, (8,y, W-8, y+74), radius=14, fill=C["SURFACE2"])
-    chip(d, 16, y+10, "Auto", C["LIME"] if auto_mode else C["ORANGE"], (0,0,0))
-    d.text((16, y+44), f"Auto on at: {auto_thr:.0f}°C   (hyst 3°C)   Manual: {int(manual_pct)}%", font=F18, fill=(200,205,210))
-    y += 86
-
-    # Fan durumu ve RPM
-    rounded_fill(d, (8,y, W-8, y+78), radius=14, fill=C["SURFACE2"])
-    rpm = fan.read_rpm()
-    status = "ON" if fan.state else "OFF"
-    pct_show = int(round(fan.percent))
-    info = f"Fan: {status}   {pct_show}%"
-    if rpm > 0: info += f"   {rpm} RPM"
-    d.text((16, y+26), info, font=F22, fill=C["FG"])
-    y += 90
-
-    rects = {}
-
-    # --- Satır 1: AUTO | ON/OFF (yarım-yan yarım, yüksek)
+# Kalıcı widget ağacı (lib/widgets.py): yalnızca değişen widget yeniden çizilir,
+# dokunma Tree.hit ile (buton adı: AUTO, TOGGLE, MINUS, PLUS; renkler ColorSwatch.rgb)
+TempModel = namedtuple("TempModel", "snap fv")   # fv: App._fan_view()
+
+PALETTE = [
+    (255, 0, 0), (255, 80, 0), (255, 160, 0),
+    (255, 255, 0), (160, 255, 0), (0, 255, 0),
+    (0, 255, 160), (0, 255, 255), (0, 160, 255),
+    (0, 80, 255), (0, 0, 255), (160, 0, 255)
+]
+
+def temperature_tree(W, H, has_rgb):
+    def cards(s, C):
+        rounded_fill(s, (8,6, W-8, 56), radius=14, fill=C["SURFACE"])
+        for y0, y1 in ((70, 270), (282, 338), (350, 424), (436, 514)):
+            rounded_fill(s, (8,y0, W-8, y1), radius=14, fill=C["SURFACE2"])
+
+    def freq(t):
+        m = t.snap
+        return f"{m.freq_mhz} MHz   PSI {m.psi.get('cpu',{}).get('some',(0,))[0]:.1f}%"
+
+    def throttle(t):
+        m = t.snap
+        flags = " ".join(m.throttle_flags) if m.throttle_flags else ("OK" if m.throttled is not None else "N/A")
+        return f"Throttle: {flags}", "BAD" if m.throttle_flags else (200,205,210)
+
+    def fan(t):
+        fv = t.fv
+        info = f"Fan: {'ON' if fv['on'] else 'OFF'}   {int(round(fv['pct']))}%"
+        return info + (f"   {t.snap.fan_rpm} RPM" if t.snap.fan_rpm > 0 else "")
+
+    w_auto = int(NULL.textlength("Auto", font=F18)) + 16
+    tree = Tree([
+        Label("title", (16, 16), F28, text="Temperature"),
+        # büyük halka ve değer
+        Ring("temp", (120, 170), 78, lambda t: (t.snap.temp-30)*(100.0/60.0), width=16, color="ORANGE"),
+        Label("temp_v", (120, 170), F30, bind=lambda t: f"{t.snap.temp:0.1f}°C", anchor="mm"),
+        # frekans + kısılma bayrakları (fan durumu ile yan yana okunsun)
+        Label("freq", (16, 290), F18, bind=freq),
+        Label("throttle", (16, 312), F18, bind=throttle),
+        # auto eşik bilgisi
+        Button("auto_chip", (16, 360, 16+w_auto, 388), "Auto", F18, fill="ORANGE", active="LIME",
+               bind=lambda t: t.fv["auto"], radius=10, tap=False),
+        Label("note", (16, 394), F18, (200,205,210), bind=lambda t: t.fv["note"]),
+        # fan durumu ve RPM
+        Label("fan", (16, 462), F22, bind=fan),
+    ], chrome=cards)
+
+    # Satır 1: AUTO | ON/OFF ; Satır 2: − | +  (yarım-yan yarım, yüksek)
     gap = 6
     left = 8; right = W - 8
     row_w = right - left
     bw = (row_w - gap) // 2
-    bh = 44  # yüksekliği artırıldı
-    x = left; y1 = y
-    rounded_fill(d, (x, y1, x+bw, y1+bh), radius=12, fill=C["LIME"] if auto_mode else C["SURFACE"])
-    d.text((x+bw//2, y1+bh//2), "AUTO", font=F22, fill=(0,0,0), anchor="mm")
-    rects["AUTO"] = (x, y1, x+bw, y1+bh)
-    x2 = x + bw + gap
-    rounded_fill(d, (x2, y1, x2+bw, y1+bh), radius=12, fill=C["AMBER"])
-    d.text((x2+bw//2, y1+bh//2), "ON/OFF", font=F22, fill=(0,0,0), anchor="mm")
-    rects["TOGGLE"] = (x2, y1, x2+bw, y1+bh)
-    y = y1 + bh + 10
-
-    # --- Satır 2: − | + (yarım-yan yarım, yüksek)
-    bh2 = 46
-    x = left; y2 = y
-    rounded_fill(d, (x, y2, x+bw, y2+bh2), radius=12, fill=C["SURFACE"])
-    d.text((x+bw//2, y2+bh2//2), "−", font=F28, fill=(0,0,0), anchor="mm")
-    rects["MINUS"] = (x, y2, x+bw, y2+bh2)
-    x2 = x + bw + gap
-    rounded_fill(d, (x2, y2, x2+bw, y2+bh2), radius=12, fill=C["SURFACE"])
-    d.text((x2+bw//2, y2+bh2//2), "+", font=F28, fill=(0,0,0), anchor="mm")
-    rects["PLUS"] = (x2, y2, x2+bw, y2+bh2)
+    x2 = left + bw + gap
+    y1 = 526; bh = 44
+    tree.add(Button("AUTO", (left, y1, left+bw, y1+bh), "AUTO", F22, bind=lambda t: t.fv["auto"]))
+    tree.add(Button("TOGGLE", (x2, y1, x2+bw, y1+bh), "ON/OFF", F22, fill="AMBER"))
+    y2 = y1 + bh + 10; bh2 = 46
+    tree.add(Button("MINUS", (left, y2, left+bw, y2+bh2), "−", F28))
+    tree.add(Button("PLUS", (x2, y2, x2+bw, y2+bh2), "+", F28))
     y = y2 + bh2 + 14
 
-    # --- RGB Palet (sadece rgb.available True ise göster)
-    if getattr(rgb, "available", False):
-        # 12 sabit renk
-        palette = [
-            (255, 0, 0), (255, 80, 0), (255, 160, 0),
-            (255, 255, 0), (160, 255, 0), (0, 255, 0),
-            (0, 255, 160), (0, 255, 255), (0, 160, 255),
-            (0, 80, 255), (0, 0, 255), (160, 0, 255)
-        ]
+    # RGB palet (sadece rgb.available True ise)
+    if has_rgb:
         cols = 6
         sw = (row_w - (cols-1)*gap) // cols
         sh = 24
-        for i, (r,g,b) in enumerate(palette):
+        for i, rgb in enumerate(PALETTE):
             cx = left + (i % cols) * (sw + gap)
             cy = y + (i // cols) * (sh + gap)
-            rounded_fill(d, (cx, cy, cx+sw, cy+sh), radius=6, fill=(r,g,b))
-            rects[f"COLOR_{i}"] = (cx, cy, cx+sw, cy+sh)
+            tree.add(ColorSwatch(f"COLOR_{i}", (cx, cy, cx+sw, cy+sh), rgb))
         y += (2 * (sh + gap)) + 6
 
-    content_h = max(y+10, H+1)
-    if content_h > img.height:
-        new_img = Image.new("RGB", (W, content_h), C["BG"])
-        new_img.paste(img, (0,0))
-        img = new_img
+    tree.size = (W, max(H + 1, y + 10))
+    tree.layout = (has_rgb,)
+    return tree
 
-    return img, content_h, rects
+@depends("temp", "fan_rpm", "freq_mhz", "psi", "throttle_flags", "throttled")   # + fan görünümü (App._inputs)
+def render_temperature_canvas(tree, m, C, fv):
+    """Döner: img (kalıcı canvas, yalnızca okunur), hasar kutuları (canvas koordinatları)."""
+    base = LAYERS.get("temperature", C, tree.size, lambda s, C, W, H: tree.chrome(s, C), tree.layout)
+    return tree.render(TempModel(m, fv), C, base)
 
 # ---------- Basit sayfalar ----------
-def page_disk_net(d, m, C, W, H):
-    d.text((12,10), "DISK & NET", font=F28, fill=C["FG"])
+# page_x(s, d, m, C, W, H): s statik iskelet (LAYERS'ta önbellekli), d değerler
+# @depends: okunan snapshot alanları (+ saat adımı); değişmedikçe run() kareyi atlar
+@depends("disk", "up", "dn")
+def page_disk_net(s, d, m, C, W, H):
+    s.text((12,10), "DISK & NET", font=F28, fill=C["FG"])
     d.text((12,56), f"DISK {m.disk:0.0f}%", font=F24, fill=C["FG"])
-    d.rounded_rectangle([12,84,W-12,104], radius=10, fill=C["SURFACE2"])
-    bar(d, 14,86, W-28, 14, m.disk, color=C["LIME"], track=C["BARBG"])
+    s.rounded_rectangle([12,84,W-12,104], radius=10, fill=C["SURFACE2"])
+    bar(d, 14,86, W-28, 14, m.disk, color=C["LIME"], track=C["BARBG"], s=s)
     d.text((12,130), f"UP {m.up:0.0f} KB/s", font=F22, fill=C["TEAL"])
     d.text((12,160), f"DN {m.dn:0.0f} KB/s", font=F22, fill=C["ORANGE"])
 
-def page_storage(d, m, C, W, H):
-    d.text((12,10), "STORAGE", font=F28, fill=C["FG"])
+@depends("disk", clock=10)   # bölümler psutil ile canlı okunur
+def page_storage(s, d, m, C, W, H):
+    s.text((12,10), "STORAGE", font=F28, fill=C["FG"])
     y=56
+    if d is NULL: return       # bölüm listesi dinamik
     try:
         import psutil as ps
         for p in ps.disk_partitions():
@@ -545,6 +415,58 @@ def page_storage(d, m, C, W, H):
         d.rounded_rectangle([120,y+4,W-12,y+20], radius=8, fill=C["SURFACE2"])
         bar(d, 122, y+6, W-134, 12, m.disk, color=C["ORANGE"], track=C["BARBG"])
 
+@depends("throttled", "throttle_flags", "throttle_ever", "freqs", "psi", "temp")
+def page_pressure(s, d, m, C, W, H):
+    s.text((12,10), "THROTTLE", font=F28, fill=C["FG"])
+    # firmware bayrakları
+    x, y = 12, 50
+    if m.throttled is None:
+        chip(d, x, y, "FW N/A", C["SURFACE2"], C["FG"], font=F16, h=24)
+    elif not m.throttle_flags:
+        w,_ = chip(d, x, y, "OK", C["OK"], (0,0,0), font=F16, h=24)
+        if m.throttle_ever:
+            d.text((x+w+8, y+4), "once: " + " ".join(m.throttle_ever), font=F16, fill=C["WARN"])
+    else:
+        for f in m.throttle_flags:
+            w,_ = chip(d, x, y, f, C["BAD"], (255,255,255), font=F16, h=24); x += w+6
+    y = 84
+    # cpufreq (ilk policy; Pi 5'te tek policy var)
+    for pol, cur, lo, hi in m.freqs[:1]:
+        d.text((12,y), f"{cur} MHz", font=F22, fill=C["FG"])
+        d.text((W-12,y+4), f"{lo}-{hi}", font=F16, fill=(150,150,150), anchor="ra")
+        bar(d, 12, y+28, W-24, 10, 100.0*(cur-lo)/max(1,hi-lo), color=C["VIOLET"], track=C["BARBG"])
+        y += 48
+    # PSI some/full avg10
+    for kind, label in (("cpu","CPU"), ("memory","MEM"), ("io","IO")):
+        v = m.psi.get(kind, {})
+        some = v.get("some", (0.0,))[0]; full = v.get("full", (0.0,))[0]
+        d.text((12,y), f"{label} stall", font=F18, fill=C["FG"])
+        d.text((W-12,y), f"{some:.1f}% / {full:.1f}%", font=F18, fill=C["TEAL"], anchor="ra")
+        bar(d, 12, y+24, W-24, 8, some, color=C["ORANGE"], track=C["BARBG"])
+        y += 40
+    d.text((12,y), f"{m.temp:0.1f}°C", font=F18, fill=C["FG"])
+
+@depends("ov")
+def page_debug(s, d, m, C, W, H):
+    # gizli sayfa: sol üst dokunuşla aç/kapa
+    ov = m.ov or {}
+    s.text((12,10), "OVERHEAD", font=F28, fill=C["FG"])
+    d.text((12,50), f"total {ov.get('total',0):.1f}% core", font=F20, fill=C["TEAL"])
+    d.text((12,76), f"r/w sysc {ov.get('syscalls_min',0):.0f}/m  fork {ov.get('forks_min',0):.0f}/m", font=F16, fill=C["FG"])
+    d.text((12,98), f"RSS {ov.get('rss',0)/1048576:.1f} MB  {ov.get('rss_per_h',0)/1024:+.0f} KB/h", font=F16, fill=C["FG"])
+    y = 126
+    for name, pct in sorted(ov.get("cpu", {}).items(), key=lambda kv: -kv[1])[:7]:
+        d.text((12,y), name[:16], font=F16, fill=(200,205,210))
+        d.text((W-12,y), f"{pct:.2f}%", font=F16, fill=C["FG"], anchor="ra")
+        bar(d, 12, y+20, W-24, 4, min(100.0, pct*10), color=C["ORANGE"], track=C["BARBG"])
+        y += 28
+
+NPAGES = 5  # 0 System, 1 Disk&Net, 2 Storage, 3 Temperature, 4 Throttle
+PAGE_DEBUG = 5  # kaydırma halkasında yok
+SIMPLE_PAGES = {1: page_disk_net, 2: page_storage, 4: page_pressure, PAGE_DEBUG: page_debug}
+# örnekleme kaynağı → gösterildiği sayfalar (temp yok: fan auto kullanıyor → hep görünür)
+SOURCE_PAGES = {"core": (0,1,PAGE_DEBUG), "disk": (0,1,2), "pressure": (3,4), "fan": (3,)}
+
 # ---------- Touch Callback ----------
 def Int_Callback(btn):
     global Flag, Mode, touch
@@ -564,17 +486,37 @@ def Int_Callback(btn):
 # ---------- App ----------
 class App:
     def __init__(self):
+        STARTUP.mark("imports")
         self.disp = LCD_1inch69.LCD_1inch69(rst=RST, dc=DC, bl=BL, tp_int=TP_INT, tp_rst=TP_RST, bl_freq=100)
         self.disp.Init()
-        self.disp.clear()
+        STARTUP.mark("lcd")
+        splash(self.disp, DARK["BG"], DARK["FG"], "Pi 5 Monitor")   # panel karanlık kalmasın
         try: self.disp.bl_DutyCycle(90)
         except Exception: pass
         self.W, self.H = self.disp.width, self.disp.height  # 240x280
 
         self.dark = True
         self.C = DARK
-        self.m = Metrics()
-        for _ in range(3): self.m.update(); time.sleep(0.1)
+        self.fan = FanIO()
+        # fan-control.py çalışıyorsa fanın sahibi odur: butonlar soketten komut gönderir,
+        # yerel otomatik mod devre dışı kalır (pwm1'e iki süreç yazmasın)
+        self.fanc = FanClient.connect()
+        self._fanc_retry = time.time()
+        self._fanc_lock = threading.Lock()     # metrik ve çizim thread'leri aynı anda yeniden bağlanmasın
+        if self.fanc is not None:
+            logging.info("fan: fan-control.py sahibi, soket istemcisi")
+        # sysmon-bus.py çalışıyorsa onun snapshot'ını oku (sensörler bir kez okunur),
+        # yoksa kendi örnekleyicimizi çalıştır
+        from lib.shmbus import BusReader   # multiprocessing; splash'tan sonra
+        self.bus = BusReader.attach()
+        if self.bus is not None and self.bus.age() > 10.0:
+            self.bus.close(); self.bus = None   # yazar ölmüş, segment bayat
+        if self.bus is not None:
+            self.m = self.bus
+            logging.info("metrics: sysmon-bus okuyucusu")
+        else:
+            self.m = Metrics(fan=self.fan, pages=SOURCE_PAGES)
+            self.m.update()   # sayaçları hazırla; hızlar ilk döngü tick'inde dolar (ısınma beklemesi yok)
 
         global touch
         touch = Touch_1inch69.Touch_1inch69()
@@ -582,8 +524,9 @@ class App:
         touch.Set_Mode(2)
         touch.GPIO_TP_INT.when_pressed = Int_Callback
 
-        # sayfalar: 0 System (scroll), 1 Disk&Net, 2 Storage, 3 Temperature (scroll)
+        # sayfalar: 0 System (scroll), 1 Disk&Net, 2 Storage, 3 Temperature (scroll), 4 Throttle
         self.cur = 0
+        self.prev_cur = 0
 
         # System scroll
         self.sys_canvas = None
@@ -593,13 +536,16 @@ class App:
 
         # Temperature scroll
         self.temp_canvas = None
-        self.temp_h = self.H
         self.temp_scroll_y = 0
         self.temp_scroll_step = 56
-        self.temp_rects = {}
+        self.temp_damage = []      # son gösterimden beri hasarlı canvas kutuları
+        self._shown = None         # ekrandaki görünüm (_show)
 
-        # Fan
-        self.fan = FanIO()
+        # kare bütçesi bindirmesi (uzun bas ile aç/kapa; lib/framebudget.py)
+        self.overlay = False
+        self.overlay_box = None
+
+        # Fan (FanIO yukarıda, Metrics ile paylaşılıyor)
         self.auto_mode = True
         self.auto_thr = 65.0
         self.hyst = 3.0
@@ -608,33 +554,141 @@ class App:
         # RGB
         self.rgb = RGBController()
 
+        # Temperature widget ağacı (palet yalnızca RGB varsa)
+        self.temp_tree = temperature_tree(self.W, self.H, bool(getattr(self.rgb, "available", False)))
+        self.temp_h = self.temp_tree.size[1]
+
+        # komşu sayfaların ön çizimi (kaydırmada ilk kare gecikmesiz)
+        self.prefetch = Prefetcher(self._prefetch_render, self._page_key, cancel=self._prefetch_cancel)
+        self.prefetch.want(self._neighbours())
+
         self.running = True
+        self.wake = threading.Event()
+        # opsiyonel örnek kaydı (PI5_SAMPLE_LOG); bus modunda kaydı sysmon-bus.py tutar
+        self.slog = SampleLog.from_env() if self.bus is None else None
+        # uyarılar: snapshot version başına bir kez değerlendirilir; çizici yalnızca .banner okur
+        acts = {"backlight": backlight_flash(self.disp), "rgb": rgb_color(self.rgb)}
+        if self.bus is None: acts["webhook"] = unix_webhook()   # bus modunda webhook'u sysmon-bus.py atar
+        self.alerts = AlertEngine.from_env(acts)
+        # yerel modda takometre denetimi (sahip varsa onun "fault" alanı kullanılır)
+        self.stall = StallDetector() if self.fan.fan_input else None
         threading.Thread(target=self._metrics_loop, daemon=True).start()
 
+        # opsiyonel Prometheus /metrics (PI5_METRICS_PORT) — son snapshot'tan, ek örnekleme yok
+        self.exporter = MetricsExporter.from_env(lambda: self.m.snap)
+        if self.exporter: self.exporter.start()
+        # opsiyonel kare bütçesi soketi (PI5_FRAME_SOCK)
+        self.framesock = FrameSocket.from_env(FB.stats)
+        if self.framesock: self.framesock.start()
+        STARTUP.mark("setup")
+
     # ---- metrics loop + fan auto ----
     def _metrics_loop(self):
         while self.running:
-            self.m.update()
-            if self.auto_mode:
+            # okuyucu yeniden başlayan yazarın segmentine kendisi bağlanır (lib/shmbus.py);
+            # yayın uzun süre gelmiyorsa yazar yok → yerel örnekleyiciye geç
+            if self.bus is not None and self.bus.age() > 30.0:
+                logging.warning("metrics: sysmon-bus yayını kesildi, yerel örnekleyiciye geçiliyor")
+                self.bus.close(); self.bus = None
+                m = Metrics(fan=self.fan, pages=SOURCE_PAGES)
+                m.update()
+                self.m = m
+                self.slog = SampleLog.from_env()
+            t = time.perf_counter()
+            if self.bus is None:
+                with OV.measure("metrics_loop"):
+                    self.m.update(page=self.cur)
+                snap = self.m.snap
+                if self.slog: self.slog.push(snap)
+            else:
+                snap = self.m.snap          # bus okuması (seqlock + çözme)
+            FB.record("sample", time.perf_counter() - t)
+            with OV.measure("alerts"):
+                self.alerts.on_snapshot(snap)
+            fault = self._check_fan_fault()
+            temp = snap.temp or 0.0
+            if fault == "stall" and self._fan_owner() is None:
+                self.fan.set_percent(100.0)    # yerel güvenli mod (sahip varsa bunu o yapar)
+            elif self.auto_mode and self._fan_owner() is None:
                 try:
-                    if self.m.temp >= self.auto_thr and self.fan.percent < self.manual_pct:
-                        self.fan.set_percent(self.manual_pct)
-                    elif self.m.temp <= self.auto_thr - self.hyst and self.fan.percent > 0:
-                        self.fan.set_percent(0)
+                    with OV.measure("fan_auto"):
+                        if temp >= self.auto_thr and self.fan.percent < self.manual_pct:
+                            self.fan.set_percent(self.manual_pct)
+                        elif temp <= self.auto_thr - self.hyst and self.fan.percent > 0:
+                            self.fan.set_percent(0)
                 except Exception:
                     pass
-            time.sleep(0.5)
+            # sabit aralık yerine: en erken vadesi gelen kaynağa kadar uyu
+            self.wake.clear()
+            if self.bus is None:
+                sleep_until_due(self.m.sched, stop=self.wake)
+            else:
+                self.wake.wait(0.5)
+
+    def _fan_owner(self):
+        """Canlı FanClient ya da None (yerel FanIO); kopan bağlantı 10 sn'de bir yeniden denenir."""
+        fc = self.fanc
+        if fc is not None and fc.alive:
+            return fc
+        with self._fanc_lock:
+            if self.fanc is not None and not self.fanc.alive:
+                logging.warning("fan: fan-control.py bağlantısı koptu, yerel kontrole dönülüyor")
+                self.fanc.close(); self.fanc = None
+            if self.fanc is None and time.time() - self._fanc_retry > 10.0:
+                self._fanc_retry = time.time()
+                self.fanc = FanClient.connect()
+            return self.fanc
+
+    def _check_fan_fault(self):
+        fc = self._fan_owner()
+        if fc is not None:
+            fault = fc.state.get("fault", "ok")
+            rpm = fc.state.get("rpm", 0)
+        elif self.stall is not None:
+            rpm = self.fan.read_rpm()          # snapshot'taki değer fan kaynağının aralığı kadar eski olabilir
+            fault = self.stall.update(self.fan.percent, rpm, time.monotonic())
+        else:
+            return "ok"
+        acts = ("banner", "backlight", "rgb:255,0,0")
+        self.alerts.external("fan_stall", fault == "stall", f"FAN STALL {rpm} RPM", acts)
+        self.alerts.external("fan_degraded", fault == "degraded", f"FAN WEAK {rpm} RPM", ("banner",))
+        return fault
+
+    def _fan_view(self):
+        fc = self._fan_owner()
+        if fc is not None:
+            st = fc.state
+            rt = st.get("rpm_target")
+            tgt = f"{rt} RPM" if rt is not None else f"{st.get('target', 0):.0f}%"
+            return {"auto": fc.auto, "pct": fc.duty, "on": fc.duty > 0,
+                    "note": f"fan-control  target {tgt}   manual {fc.manual:.0f}%"}
+        return {"auto": self.auto_mode, "pct": self.fan.percent, "on": bool(self.fan.state),
+                "note": f"Auto on at: {self.auto_thr:.0f}°C   (hyst {self.hyst:.0f}°C)   Manual: {int(self.manual_pct)}%"}
+
+    def _page_changed(self):
+        self.prefetch.want(self._neighbours())
+        # yeni sayfanın kaynaklarını hemen tazele
+        if self.bus is None:
+            self.m.sched.kick(pages=(self.cur,))
+        self.wake.set()
 
     # ---- render helpers ----
-    def _render_system(self):
-        self.sys_canvas, self.sys_h = render_system_canvas(self.W, self.H, self.m, self.C)
+    def _render_system(self, canvas=None):
+        """canvas: ön çizimden hazır canvas (yoksa çizilir)."""
+        if canvas is None:
+            with OV.measure("render:system"):
+                canvas, _ = render_system_canvas(self.W, self.H, self.m.snap, self.C)
+        self.sys_canvas, self.sys_h = canvas, canvas.height
         max_off = max(0, self.sys_h - self.H)
         self.sys_scroll_y = max(0, min(self.sys_scroll_y, max_off))
 
-    def _render_temperature(self):
-        img, h, rects = render_temperature_canvas(self.W, self.H, self.m, self.C,
-                                                  self.fan, self.auto_mode, self.auto_thr, self.manual_pct, self.rgb)
-        self.temp_canvas, self.temp_h, self.temp_rects = img, h, rects
+    def _render_temperature(self, canvas=None):
+        """canvas: ön çizimden hazır canvas (ağacın kalıcı karesi; sayfa değişiminde tam kare gider)."""
+        if canvas is None:
+            with OV.measure("render:temperature"):
+                canvas, damage = render_temperature_canvas(self.temp_tree, self.m.snap, self.C, self._fan_view())
+            self.temp_damage += damage   # gösterilene kadar birikir (_show)
+        self.temp_canvas = canvas
         max_off = max(0, self.temp_h - self.H)
         self.temp_scroll_y = max(0, min(self.temp_scroll_y, max_off))
 
@@ -644,28 +698,54 @@ class App:
             max_off = max(0, self.sys_h - self.H)
             self.sys_scroll_y = max(0, min(self.sys_scroll_y, max_off))
             return self.sys_canvas.crop((0, self.sys_scroll_y, self.W, self.sys_scroll_y + self.H))
-        elif self.cur == 1:
-            img = Image.new("RGB", (self.W, self.H), self.C["BG"])
-            d = ImageDraw.Draw(img)
-            page_disk_net(d, self.m, self.C, self.W, self.H)
-            return img
-        elif self.cur == 2:
-            img = Image.new("RGB", (self.W, self.H), self.C["BG"])
-            d = ImageDraw.Draw(img)
-            page_storage(d, self.m, self.C, self.W, self.H)
-            return img
+        elif self.cur in SIMPLE_PAGES:
+            img = self.prefetch.get(self.cur)
+            return img.copy() if img is not None else self._render_simple(self.cur)
         elif self.cur == 3:
             if self.temp_canvas is None: self._render_temperature()
             max_off = max(0, self.temp_h - self.H)
             self.temp_scroll_y = max(0, min(self.temp_scroll_y, max_off))
             return self.temp_canvas.crop((0, self.temp_scroll_y, self.W, self.temp_scroll_y + self.H))
 
-    # ---- taps ----
-    def _tap_in_rect(self, x, y, rect):
-        if not rect: return False
-        x1,y1,x2,y2 = rect
-        return (x1 <= x <= x2) and (y1 <= y <= y2)
+    def _render_simple(self, p):
+        fn = SIMPLE_PAGES[p]
+        snap = self.m.snap
+        with OV.measure("render:" + fn.__name__[5:]):
+            return LAYERS.compose(fn.__name__, self.C, (self.W, self.H),
+                                  lambda s, d: fn(s, d, snap, self.C, self.W, self.H))
+
+    def _page_name(self, p):
+        return {0: "system", 3: "temperature"}.get(p) or SIMPLE_PAGES[p].__name__[5:]
+
+    def _frame(self):
+        with FB.stage("render:" + self._page_name(self.cur)):
+            img = self._render_page()
+            banner = self.alerts.banner
+            if banner: img = alert_banner(img, banner, self.C)
+        if self.overlay:
+            with FB.stage("overlay"):
+                self.overlay_box = draw_overlay(img, FB.stats(), self.C)
+        return img
+
+    def _show(self, img):
+        """Kareyi gönder. Temperature aynı kaydırma/tema/şeritle ekrandaysa yalnızca hasar penceresi
+        (bindirme açıksa onun kutusu da). Dönüşüm ve SPI aktarımı kare bütçesinde ayrı aşamalar."""
+        view = (self.cur, self.temp_scroll_y, id(self.C), self.alerts.banner, self.overlay)
+        box = (0, 0, self.W, self.H)
+        if self.cur == 3 and view == self._shown:
+            b = union(self.temp_damage)
+            box = b and (b[0], max(0, b[1] - self.temp_scroll_y), b[2], min(self.H, b[3] - self.temp_scroll_y))
+            if box and box[1] >= box[3]: box = None     # hasar görünür alanın dışında
+            if self.overlay: box = union([box, self.overlay_box])
+        self.temp_damage = []
+        self._shown = view
+        if box:
+            with FB.stage("convert"):
+                pix = self.disp.rgb565(img if box == (0, 0, self.W, self.H) else img.crop(box))
+            with FB.stage("spi"):
+                self.disp.ShowRGB565(pix, box)
 
+    # ---- taps ----
     def _handle_single_tap_actions(self):
         global last_tap_time_ms, last_button_time_ms
         t = now_ms()
@@ -674,6 +754,13 @@ class App:
 
         changed = False
 
+        # Gizli overhead sayfası: sol üst
+        if x < 52 and y < 40 and (t - last_tap_time_ms) > TAP_COOLDOWN_MS:
+            last_tap_time_ms = t
+            self.cur, self.prev_cur = (self.prev_cur, self.cur) if self.cur == PAGE_DEBUG else (PAGE_DEBUG, self.cur)
+            self._page_changed()
+            return True
+
         # Tema: sadece sağ üst
         if x > self.W-52 and y < 40 and (t - last_tap_time_ms) > TAP_COOLDOWN_MS:
             last_tap_time_ms = t
@@ -683,19 +770,35 @@ class App:
             self.temp_canvas = None
             changed = True
 
-        # Temperature: butonlar
-        if self.cur == 3 and (t - last_button_time_ms) > TAP_COOLDOWN_MS and self.temp_rects:
-            cy = y + self.temp_scroll_y  # ekran y -> canvas y
-            br = self.temp_rects
+        # Temperature: butonlar (widget ağacından hit-test; ekran y -> canvas y)
+        w = self.temp_tree.hit(x, y + self.temp_scroll_y) if self.cur == 3 else None
+        if w is not None and (t - last_button_time_ms) > TAP_COOLDOWN_MS:
+            last_button_time_ms = t
+            fc = self._fan_owner()
+
+            if isinstance(w, ColorSwatch):
+                self.rgb.set_color(*w.rgb)
+                # görsel değişmediği için yeniden oluşturma gerekmiyor
+
+            elif fc is not None:
+                # komut sahibe gider; gerçek durum abonelikten döner
+                if w.name == "AUTO":
+                    fc.set_mode("manual" if fc.auto else "auto")
+                elif w.name == "TOGGLE":
+                    fc.toggle()
+                else:
+                    base = fc.duty if fc.auto else fc.manual
+                    step = 5.0 if w.name == "PLUS" else -5.0
+                    fc.set_duty(clamp(base + step, 0, 100))
+                self.temp_canvas = None
+                changed = True
 
-            if self._tap_in_rect(x, cy, br.get("AUTO")):
-                last_button_time_ms = t
+            elif w.name == "AUTO":
                 self.auto_mode = not self.auto_mode
                 self.temp_canvas = None
                 changed = True
 
-            elif self._tap_in_rect(x, cy, br.get("TOGGLE")):
-                last_button_time_ms = t
+            elif w.name == "TOGGLE":
                 if self.fan.toggle():
                     self.auto_mode = False
                     if self.fan.state:
@@ -703,39 +806,16 @@ class App:
                     self.temp_canvas = None
                     changed = True
 
-            elif self._tap_in_rect(x, cy, br.get("MINUS")):
-                last_button_time_ms = t
-                self.auto_mode = False
-                self.manual_pct = max(0.0, self.manual_pct - 5.0)
-                self.fan.set_percent(self.manual_pct)
-                self.temp_canvas = None
-                changed = True
-
-            elif self._tap_in_rect(x, cy, br.get("PLUS")):
-                last_button_time_ms = t
+            elif w.name in ("MINUS", "PLUS"):
                 self.auto_mode = False
-                self.manual_pct = min(100.0, self.manual_pct + 5.0)
+                step = 5.0 if w.name == "PLUS" else -5.0
+                self.manual_pct = clamp(self.manual_pct + step, 0.0, 100.0)
                 self.fan.set_percent(self.manual_pct)
                 self.temp_canvas = None
                 changed = True
 
-            else:
-                # RGB renk kutuları
-                if getattr(self.rgb, "available", False):
-                    for i in range(12):
-                        rname = f"COLOR_{i}"
-                        if self._tap_in_rect(x, cy, br.get(rname)):
-                            last_button_time_ms = t
-                            palette = [
-                                (255, 0, 0), (255, 80, 0), (255, 160, 0),
-                                (255, 255, 0), (160, 255, 0), (0, 255, 0),
-                                (0, 255, 160), (0, 255, 255), (0, 160, 255),
-                                (0, 80, 255), (0, 0, 255), (160, 0, 255)
-                            ]
-                            r,g,b = palette[i]
-                            self.rgb.set_color(r,g,b)
-                            # görsel değişmediği için yeniden oluşturma gerekmiyor
-
+        if changed and self.cur == 3:
+            self._page_changed()   # fan okumasını hemen tazele
         return changed
 
     # ---- gestures ----
@@ -780,18 +860,24 @@ class App:
 
         elif g == 0x03:        # LEFT
             if (t - last_gesture_time_ms) >= SWIPE_COOLDOWN_MS:
-                self.cur = (self.cur - 1) % 4
+                self.cur = (self.cur - 1) % NPAGES
                 if self.cur == 0: self.sys_canvas=None; self.sys_scroll_y=0
                 if self.cur == 3: self.temp_canvas=None; self.temp_scroll_y=0
+                self._page_changed()
                 changed = True
 
         elif g == 0x04:        # RIGHT
             if (t - last_gesture_time_ms) >= SWIPE_COOLDOWN_MS:
-                self.cur = (self.cur + 1) % 4
+                self.cur = (self.cur + 1) % NPAGES
                 if self.cur == 0: self.sys_canvas=None; self.sys_scroll_y=0
                 if self.cur == 3: self.temp_canvas=None; self.temp_scroll_y=0
+                self._page_changed()
                 changed = True
 
+        elif g == 0x0C:        # uzun bas: kare bütçesi bindirmesi
+            self.overlay = not self.overlay
+            changed = True
+
         touch.Gestures = 0
         if g in (0x03,0x04) and changed:
             last_gesture_time_ms = t
@@ -802,33 +888,92 @@ class App:
         return changed
 
     # ---- run ----
+    def _page_key(self, p):
+        """Sayfanın girdileri: bildirim (@depends) + tema (+ Temperature'da fan görünümü)."""
+        fn = {0: render_system_canvas, 3: render_temperature_canvas}.get(p) or SIMPLE_PAGES[p]
+        key = (p, id(self.C)) + inputs(fn, self.m.snap)
+        if p == 3:
+            key += tuple(self._fan_view().values())
+        return key
+
+    def _inputs(self):
+        """Ekrandaki karenin girdileri: sayfa anahtarı + şerit, kaydırma."""
+        return self._page_key(self.cur) + (self.alerts.banner, self.sys_scroll_y, self.temp_scroll_y)
+
+    # ---- komşu sayfa ön çizimi (lib/prefetch.py) ----
+    def _neighbours(self):
+        if self.cur == PAGE_DEBUG: return ()
+        return ((self.cur + 1) % NPAGES, (self.cur - 1) % NPAGES)
+
+    def _prefetch_render(self, p):
+        """System/Temperature için tüm canvas, basit sayfalar için kare."""
+        if p == 0:
+            return render_system_canvas(self.W, self.H, self.m.snap, self.C)[0]
+        if p == 3:
+            # ağacın kalıcı karesi sonraki render'da değişir: saklanan kopya
+            return render_temperature_canvas(self.temp_tree, self.m.snap, self.C, self._fan_view())[0].copy()
+        return self._render_simple(p)
+
+    def _prefetch_cancel(self, p):
+        """Atılan Temperature çizimi ağacı ilerletti; sonraki çizim tam kare olsun."""
+        if p == 3:
+            self.temp_tree.invalidate()
+
     def run(self):
-        self._render_system()
-        img = self._render_page()
-        self.disp.ShowImage(img)
+        FB.begin()
+        with FB.stage("inputs"):
+            shown = self._inputs()
+        with FB.stage("render:system"):
+            self._render_system()
+        img = self._frame()
+        self._show(img)
+        FB.end()
         last_draw = time.time()
+        STARTUP.mark("first_frame")
+        logging.info(STARTUP.report())
 
         global Flag
         while True:
             if Flag == 1:
                 Flag = 0
                 if self._handle_gesture():
-                    if self.cur == 0 and self.sys_canvas is None:
-                        self._render_system()
-                    if self.cur == 3 and self.temp_canvas is None:
-                        self._render_temperature()
-                    img = self._render_page()
-                    self.disp.ShowImage(img)
+                    FB.begin()
+                    with FB.stage("inputs"):
+                        shown = self._inputs()
+                    # kaydırmada hedef sayfa çoğunlukla ön çizimden hazır
+                    with FB.stage("render:" + self._page_name(self.cur)):
+                        if self.cur == 0 and self.sys_canvas is None:
+                            self._render_system(self.prefetch.get(0))
+                        if self.cur == 3 and self.temp_canvas is None:
+                            self._render_temperature(self.prefetch.get(3))
+                    img = self._frame()
+                    self._show(img)
+                    FB.end()
                     last_draw = time.time()
             else:
                 if time.time() - last_draw > 0.6:
-                    if self.cur == 0:
-                        self._render_system()
-                    elif self.cur == 3:
-                        self._render_temperature()
-                    img = self._render_page()
-                    self.disp.ShowImage(img)
+                    # girdiler değişmediyse çizim ve aktarım yok (bindirme açıksa her tick güncellenir)
+                    FB.begin()
+                    with FB.stage("inputs"):
+                        key = self._inputs()
+                    if key != shown or self.overlay:
+                        if key != shown:
+                            with FB.stage("render:" + self._page_name(self.cur)):
+                                if self.cur == 0:
+                                    self._render_system()
+                                elif self.cur == 3:
+                                    self._render_temperature()
+                        img = self._frame()
+                        self._show(img)
+                        FB.end()
+                        shown = key
+                    else:
+                        FB.cancel()
                     last_draw = time.time()
+                else:
+                    # boşta: komşu sayfalardan bayat olanı çiz (adım başına en fazla bir sayfa)
+                    with OV.measure("prefetch"):
+                        self.prefetch.step()
             time.sleep(0.01)
 
 # ---------- Main ----------
@@ -6,8 +6,12 @@
 
 import os, sys, time, math, threading, subprocess
 from collections import deque
-from PIL import Image, ImageDraw, ImageFont
-import psutil
+from PIL import Image
+
+from lib.startup import STARTUP, lazy_import, splash
+from lib.fonts import font
+from lib.textcache import CachedDraw
+psutil = lazy_import("psutil")   # ilk kullanımda (splash'tan sonra)
 
 # ---------- ÜRETİCİ SÜRÜCÜ ----------
 from lib.LCD_1inch69 import LCD_1inch69
@@ -35,15 +39,8 @@ LIGHT = dict(
 )
 
 # ---------- Font ----------
-def load_font(sz):
-    for p in ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-              "/usr/share/fonts/truetype/dejavu/DejaVuSansCondensed.ttf",
-              "/usr/share/fonts/truetype/freefont/FreeSans.ttf"):
-        if os.path.exists(p):
-            return ImageFont.truetype(p, sz)
-    return ImageFont.load_default()
-
-F12, F14, F16, F18, F22, F26 = (load_font(s) for s in (12,14,16,18,22,26))
+# tembel (lib/fonts.py): dosya ilk çizimde okunur
+F12, F14, F16, F18, F22, F26 = (font(s) for s in (12,14,16,18,22,26))
 
 # ---------- Yardımcılar ----------
 def clamp(v, lo, hi):
@@ -338,8 +335,11 @@ PAGES = [page_summary, page_disk_net, page_processes, page_system]
 class App:
     def __init__(self):
         # Ekranı başlat
+        STARTUP.mark("imports")
         self.disp = LCD_1inch69()
         self.disp.Init()
+        STARTUP.mark("lcd")
+        splash(self.disp, DARK["BG"], DARK["FG"], "Pi 5 Panel")
         try: self.disp.bl_DutyCycle(100)
         except Exception: pass
         self.W, self.H = self.disp.width, self.disp.height
@@ -348,8 +348,7 @@ class App:
         self.theme_dark = True
         self.C = DARK
         self.metrics = Metrics()
-        for _ in range(4):
-            self.metrics.update(); time.sleep(0.1)
+        self.metrics.update()   # hızlar arka plan döngüsünde dolar (ısınma beklemesi yok)
 
         # Dokunmatik
         self.touch = Touch()
@@ -361,6 +360,7 @@ class App:
 
         self.running = True
         threading.Thread(target=self._metrics_loop, daemon=True).start()
+        STARTUP.mark("setup")
 
     def _metrics_loop(self):
         while self.running:
@@ -369,7 +369,7 @@ class App:
 
     def _render_page(self, idx):
         img = Image.new("RGB", (self.W, self.H), self.C["BG"])
-        d = ImageDraw.Draw(img)
+        d = CachedDraw(img)     # sabit metinler (başlıklar, etiketler) önbellekten
         # grid
         for gy in range(0, self.H, 28):
             d.line((0, gy, self.W, gy), fill=self.C["GRID"])
@@ -420,6 +420,9 @@ class App:
             else:
                 img = self._render_page(self.cur)
                 self.disp.ShowImage(img)
+                if STARTUP.at("first_frame") is None:
+                    STARTUP.mark("first_frame")
+                    print(STARTUP.report(), file=sys.stderr, flush=True)
 
 if __name__ == "__main__":
     try: